@@ -1 +1,13 @@
-from .core import extract_all_schedules
\ No newline at end of file
+# the parser pulls in pandas and the readers, so it is imported on first use rather than with the package.
+# "from ParseSchedules import extract_all_schedules" keeps working
+
+__all__ = ["extract_all_schedules", "iter_schedules", "iter_lessons"]
+
+
+def __getattr__(name):
+    if name in __all__:
+        from . import core
+
+        return getattr(core, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
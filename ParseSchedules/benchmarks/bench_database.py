@@ -0,0 +1,120 @@
+# loads a generated corpus of group files into the lesson database (ParseSchedules.database) and compares
+# its queries to scanning the group files: lessons in a room, lessons of a teacher, and room conflicts,
+# which without the database means comparing every lesson to every other one. Also times a full load
+# and an incremental one after a single group changed:
+# python -m ParseSchedules.benchmarks.bench_database [-g GROUPS] [-t TEACHERS]
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Callable, List
+
+from ParseSchedules.benchmarks.bench_teachers import generate_corpus
+from ParseSchedules.benchmarks.synthetic import synthetic_group_schedule, teacher_pool
+from ParseSchedules.database import ScheduleDatabase, sync_database
+from ParseSchedules.extract_teacher_schedules import day_classes, iter_group_schedules
+from ParseSchedules.utilities import days_eng_lower
+
+
+def scan_lessons(path: str) -> "List[dict]":
+    return [
+        {**lesson, "group": group, "day": day}
+        for group, schedule in iter_group_schedules(path)
+        for day in days_eng_lower
+        for lesson in day_classes(schedule, day)
+    ]
+
+
+def lesson_rooms(lesson: dict) -> "set[str]":
+    return set(lesson["room"].split("|")) if lesson["room"] is not None else set()
+
+
+def scan_conflicts(lessons: "List[dict]") -> int:
+    """
+    Compares every lesson to every other one, the way conflicts are found without an index.
+    """
+    conflicts = 0
+    for i, a in enumerate(lessons):
+        a_rooms = lesson_rooms(a)
+        if not a_rooms:
+            continue
+        for b in lessons[i + 1:]:
+            if (
+                a["day"] == b["day"] and a["index"] == b["index"]
+                and a["group"] != b["group"]
+                and (a["week"] is None or b["week"] is None or a["week"] == b["week"])
+                and (a["name"] != b["name"] or a["teacher"] != b["teacher"])
+            ):
+                # one per shared room
+                conflicts += len(a_rooms & lesson_rooms(b))
+    return conflicts
+
+
+def timed(fn: "Callable[[], object]") -> "tuple[object, float]":
+    started_at = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started_at
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-g", "--groups", type=int, default=200, help="Number of group files. Default is 200")
+    ap.add_argument("-t", "--teachers", type=int, default=150, help="Number of distinct teachers. Default is 150")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "output_json")
+        os.mkdir(source)
+        generate_corpus(source, args.groups, args.teachers)
+        database_path = os.path.join(tmp, "schedules.sqlite")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, full_load = timed(lambda: sync_database(source, database_path))
+
+            # one group changes, e.g. after a document was edited
+            rnd = random.Random(1)
+            with open(os.path.join(source, "ГР-0.json"), "w", encoding="utf-8") as f:
+                json.dump(synthetic_group_schedule(rnd, teacher_pool(args.teachers)), f, ensure_ascii=False, indent=4)
+            _, incremental_load = timed(lambda: sync_database(source, database_path))
+
+        print(f"{args.groups} groups: full load {full_load * 1000:.0f} ms, after one change {incremental_load * 1000:.0f} ms")
+
+        with ScheduleDatabase(database_path) as database:
+            room = database.rooms()[0]
+            teacher = database.teachers()[0]
+
+            lessons, scan_time = timed(lambda: scan_lessons(source))
+            queries = [
+                (
+                    "room lookup",
+                    lambda: len([lesson for lesson in scan_lessons(source) if room in lesson_rooms(lesson)]),
+                    lambda: len(database.lessons(room=room)),
+                ),
+                (
+                    "teacher lookup",
+                    lambda: len([lesson for lesson in scan_lessons(source) if teacher in (lesson["teacher"] or "").split("|")]),
+                    lambda: len(database.lessons(teacher=teacher)),
+                ),
+                (
+                    # the scan is timed on lessons already read, the reading alone takes scan_time
+                    "room conflicts",
+                    lambda: scan_conflicts(lessons),
+                    lambda: len(database.room_conflicts()),
+                ),
+            ]
+
+            print(f"{len(lessons)} lessons, reading the group files takes {scan_time * 1000:.0f} ms")
+            for name, scan, query in queries:
+                expected, scan_elapsed = timed(scan)
+                got, query_elapsed = timed(query)
+                assert expected == got, f"{name}: the scan found {expected}, the database {got}"
+                print(f"{name:>15}: {expected:6} found, scan {scan_elapsed * 1000:9.1f} ms, query {query_elapsed * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# compares the single-pass biweekly labeling and dedupe of all groups (schedules_from_frame) to the
+# per-group, per-day slicing it replaced: checks that both give identical schedules and reports time and
+# peak memory allocated (tracemalloc). Also checks them on tables with rows missing a room, duplicate rows
+# and "---" placeholders, which generated documents don't have:
+# python -m ParseSchedules.benchmarks.bench_dedupe [-n DOCUMENTS] [-g GROUPS] [-r REPEAT]
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+import warnings
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+
+from ParseSchedules.benchmarks.docx_generator import generate_corpus
+from ParseSchedules.core import document_lessons_frame, read_schedule_document, schedules_from_frame
+from ParseSchedules.models import DaySchedule, Lesson, WeeklySchedule
+from ParseSchedules.serialization import dumps
+from ParseSchedules.utilities import days_eng_lower, days_ukr, label_upper_and_lower_duplicates, remove_duplicates
+
+
+def legacy_schedule_from_frame(df: pd.DataFrame) -> WeeklySchedule:
+    """
+    The per-day schedule_from_frame before the single pass.
+    """
+    json_: WeeklySchedule = {}
+    for day, day_df in zip(days_eng_lower, [df[df["День"] == day] for day in days_ukr]):
+        if day_df.empty:
+            json_[day] = []
+            continue
+
+        label_upper_and_lower_duplicates(day_df)
+        day_df.dropna(subset=["name"], inplace=True)
+        day_df = remove_duplicates(day_df)
+        day_df = day_df[day_df["name"].str.startswith("---") != True]
+
+        classes = Lesson.from_records(day_df)
+        for class_ in classes:
+            if not class_.label is None:
+                class_.isBiweekly = True
+                class_.week = int(class_.label)
+
+        json_[day] = DaySchedule(classes)
+    return json_
+
+
+def legacy(long_df: pd.DataFrame, group_column: np.ndarray) -> "List[WeeklySchedule]":
+    return [legacy_schedule_from_frame(group_df) for _, group_df in long_df.groupby(group_column, sort=False)]
+
+
+def single_pass(long_df: pd.DataFrame, group_column: np.ndarray) -> "List[WeeklySchedule]":
+    group_codes, groups = pd.factorize(group_column)
+    return schedules_from_frame(long_df, group_codes.astype(np.intp), len(groups))
+
+
+def with_edge_cases(long_df: pd.DataFrame, seed: int) -> pd.DataFrame:
+    """
+    Copies the frame with some rooms removed, some rows repeating the row above and some "---" placeholders.
+    """
+    rnd = random.Random(seed)
+    df = long_df.copy()
+    rooms = df["room"].to_numpy().copy()
+    names = df["name"].to_numpy().copy()
+    indexes = df["index"].to_numpy().copy()
+
+    for i in range(1, len(df)):
+        r = rnd.random()
+        if r < 0.15:
+            rooms[i] = np.nan
+        elif r < 0.3:
+            # the same lesson twice in a row, e.g. copied to both rows of a pair
+            names[i], rooms[i], indexes[i] = names[i - 1], rooms[i - 1], indexes[i - 1]
+        elif r < 0.33:
+            names[i] = "---"
+
+    df["room"], df["name"], df["index"] = rooms, names, indexes
+    return df
+
+
+def measure(fn: "Callable[[], object]", repeat: int) -> "tuple[float, int]":
+    """
+    Returns:
+        tuple[float, int]: The best time in seconds and the peak memory allocated in bytes.
+    """
+    fn()
+
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started_at)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(timings), peak
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-n", "--documents", type=int, default=5, help="Number of generated documents. Default is 5")
+    ap.add_argument("-g", "--groups", type=int, default=20, help="Number of groups per document. Default is 20")
+    ap.add_argument("-r", "--repeat", type=int, default=5, help="Timed runs, the best one is reported. Default is 5")
+    args = ap.parse_args()
+
+    # the legacy path assigns labels to slices of the table
+    warnings.simplefilter("ignore")
+
+    frames = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in generate_corpus(os.path.join(tmp, "word_schedules"), args.documents, n_groups=args.groups):
+            df, group_names, _ = read_schedule_document(path, "native")
+            frames.append(document_lessons_frame(df, group_names))
+
+    for i, (long_df, group_column) in enumerate(frames):
+        for frame in (long_df, with_edge_cases(long_df, seed=i)):
+            expected = [dumps(schedule) for schedule in legacy(frame.copy(), group_column)]
+            got = [dumps(schedule) for schedule in single_pass(frame, group_column)]
+            assert expected == got, f"single pass differs from per-day slicing on document {i}"
+
+    runs = {
+        "per-day slicing": lambda: [legacy(long_df.copy(), group_column) for long_df, group_column in frames],
+        "single pass": lambda: [single_pass(long_df, group_column) for long_df, group_column in frames],
+    }
+
+    print(f"{args.documents} documents, {args.groups} groups each, {sum(len(df) for df, _ in frames)} rows")
+    results = {name: measure(run, args.repeat) for name, run in runs.items()}
+    for name, (elapsed, peak) in results.items():
+        print(f"{name:>16}: {elapsed * 1000:8.1f} ms, {peak / 1024:8.0f} KiB peak allocated")
+
+    (before, before_peak), (after, after_peak) = results.values()
+    print(f"{'':>16}  {before / after:.1f}x faster, {before_peak / after_peak:.1f}x less memory at peak")
+
+
+if __name__ == "__main__":
+    main()
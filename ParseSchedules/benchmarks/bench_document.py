@@ -0,0 +1,73 @@
+# compares extracting a document group by group (build_schedule) to the melted, unique-cell
+# extraction of the whole document (build_document_schedules) on a wide stream table
+# usage: python -m ParseSchedules.benchmarks.bench_document [-g GROUPS] [-s SHARED] [-r REPEAT]
+
+import argparse
+import random
+import time
+import warnings
+
+import pandas as pd
+
+from ParseSchedules.benchmarks.synthetic import group_names, synthetic_table
+from ParseSchedules.core import build_document_schedules, build_schedule
+from ParseSchedules.serialization import dumps
+
+
+def share_cells(df: pd.DataFrame, groups: "list[str]", shared_ratio: float, seed: int = 0) -> pd.DataFrame:
+    """
+    Copies lesson cells across the whole stream, the way merged cells of a lecture for several groups are read.
+    """
+    rnd = random.Random(seed)
+    df = df.copy()
+    for row in df.index:
+        if rnd.random() < shared_ratio:
+            df.loc[row, groups] = df.loc[row, groups[0]]
+    return df
+
+
+def per_group(df: pd.DataFrame, groups: "list[str]") -> dict:
+    return {group: build_schedule(df, group) for group in groups}
+
+
+def per_document(df: pd.DataFrame, groups: "list[str]") -> dict:
+    return build_document_schedules(df, groups)
+
+
+def run(fn, df: pd.DataFrame, groups: "list[str]", repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        fn(df, groups)
+        best = min(best, time.perf_counter() - started_at)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-g", "--groups", type=int, default=12, help="Number of group columns. Default is 12")
+    ap.add_argument("-s", "--shared", type=float, default=0.5, help="Share of rows that are one lecture for the whole stream. Default is 0.5")
+    ap.add_argument("-r", "--repeat", type=int, default=3, help="Number of runs, the best one is reported. Default is 3")
+    args = ap.parse_args()
+
+    warnings.filterwarnings("ignore")
+
+    groups = group_names(args.groups)
+    df = share_cells(synthetic_table(args.groups), groups, args.shared)
+
+    cells = int(df[groups].notna().sum().sum())
+    unique_cells = int(pd.unique(df[groups].to_numpy().ravel()).size)
+
+    assert dumps(per_group(df, groups)) == dumps(per_document(df, groups)), "outputs differ"
+
+    per_group_time = run(per_group, df, groups, args.repeat)
+    per_document_time = run(per_document, df, groups, args.repeat)
+
+    print(f"{args.groups} groups, {len(df)} rows, {cells} lesson cells, {unique_cells} unique")
+    print(f"group by group: {per_group_time:.3f}s")
+    print(f"whole document: {per_document_time:.3f}s")
+    print(f"speedup:        {per_group_time / per_document_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# exports generated group files (ParseSchedules.export) and runs the planning office's reports (teacher hours
+# per week, room utilization, biweekly balance) on the Parquet dataset and, the way it was done before,
+# by re-reading every group file. Checks both give the same numbers and reports the times. Needs pyarrow:
+# python -m ParseSchedules.benchmarks.bench_export [-g GROUPS] [-r REPEAT]
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from collections import defaultdict
+
+from ParseSchedules.benchmarks.bench_teachers import generate_corpus
+from ParseSchedules.export import (
+    HOURS_PER_PAIR,
+    biweekly_balance,
+    export_lessons,
+    load_lessons,
+    room_utilization,
+    teacher_hours,
+)
+from ParseSchedules.extract_teacher_schedules import iter_group_files
+from ParseSchedules.utilities import days_eng_lower
+
+SEMESTER = "2023-2024-1"
+
+
+def reports_from_files(path_to_student_schedules: str) -> dict:
+    """
+    The same reports as the export module's, computed from the group files.
+    """
+    teacher_slots = set()
+    room_slots = set()
+    weeks = {}
+    max_pair = 0
+
+    for group, path in iter_group_files(path_to_student_schedules):
+        with open(path, "rb") as f:
+            schedule = json.loads(f.read())
+
+        week_counts = [0, 0]
+        for day_number, day in enumerate(days_eng_lower):
+            for lesson in (schedule.get(day) or {}).get("classes", []):
+                slot = (day_number, lesson["index"], lesson["week"])
+                max_pair = max(max_pair, lesson["index"])
+                if lesson["teacher"] is not None:
+                    teacher_slots.update((teacher,) + slot for teacher in lesson["teacher"].split("|"))
+                if lesson["room"] is not None:
+                    room_slots.add((lesson["room"],) + slot)
+                for week in (1, 2):
+                    if lesson["week"] is None or lesson["week"] == week:
+                        week_counts[week - 1] += 1
+        weeks[group] = tuple(week_counts)
+
+    teachers = defaultdict(float)
+    for teacher, _, _, week in teacher_slots:
+        teachers[teacher] += 1.0 if week is None else 0.5
+
+    rooms = defaultdict(float)
+    for room, _, _, week in room_slots:
+        rooms[room] += 1.0 if week is None else 0.5
+
+    n_slots = len(days_eng_lower) * max_pair
+    return {
+        "teacher hours": {teacher: pairs * HOURS_PER_PAIR for teacher, pairs in teachers.items()},
+        "room utilization": {room: round(pairs / n_slots, 9) for room, pairs in rooms.items()},
+        "biweekly balance": weeks,
+    }
+
+
+def reports_from_dataset(path: str) -> dict:
+    table = load_lessons(path, SEMESTER, columns=["group", "day_number", "pair", "room", "teachers", "week"])
+    hours, utilization, balance = teacher_hours(table), room_utilization(table), biweekly_balance(table)
+    return {
+        "teacher hours": dict(zip(hours["teacher"].to_pylist(), hours["hours"].to_pylist())),
+        "room utilization": {
+            room: round(share, 9) for room, share in zip(utilization["room"].to_pylist(), utilization["utilization"].to_pylist())
+        },
+        "biweekly balance": {
+            group: (week_1, week_2)
+            for group, week_1, week_2 in zip(balance["group"].to_pylist(), balance["week_1"].to_pylist(), balance["week_2"].to_pylist())
+        },
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-g", "--groups", type=int, default=2000, help="Number of generated group files. Default is 2000")
+    ap.add_argument("-r", "--repeat", type=int, default=3, help="Timed runs, the best one is reported. Default is 3")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "output_json")
+        dataset = os.path.join(tmp, "lessons_parquet")
+        os.mkdir(source)
+        generate_corpus(source, args.groups, n_teachers=args.groups // 3 + 1)
+
+        started_at = time.perf_counter()
+        n_lessons = export_lessons(source, dataset, SEMESTER)
+        export_time = time.perf_counter() - started_at
+
+        runs = {"group files": lambda: reports_from_files(source), "parquet": lambda: reports_from_dataset(dataset)}
+        outputs = {name: run() for name, run in runs.items()}
+        assert outputs["group files"] == outputs["parquet"], "the reports differ"
+
+        results = {}
+        for name, run in runs.items():
+            timings = []
+            for _ in range(args.repeat):
+                started_at = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - started_at)
+            results[name] = min(timings)
+
+        size = sum(os.path.getsize(os.path.join(root, file)) for root, _, files in os.walk(dataset) for file in files)
+        json_size = sum(os.path.getsize(path) for _, path in iter_group_files(source))
+
+    print(f"{args.groups} groups, {n_lessons} lessons, exported in {export_time * 1000:.0f} ms")
+    print(f"size: {json_size:,} bytes of group files, {size:,} bytes of Parquet")
+    for name, elapsed in results.items():
+        print(f"reports from {name:>11}: {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
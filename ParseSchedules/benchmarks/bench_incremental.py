@@ -0,0 +1,70 @@
+# changes a few group files of a generated corpus and brings teacher schedules up to date
+# incrementally (sync_teacher_schedules) and by rebuilding everything (build_teacher_schedules).
+# Checks that both give identical files and reports the times:
+# python -m ParseSchedules.benchmarks.bench_incremental [-g GROUPS] [-t TEACHERS] [-c CHANGED]
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
+import time
+
+from ParseSchedules.benchmarks.bench_teachers import generate_corpus
+from ParseSchedules.benchmarks.synthetic import synthetic_group_schedule, teacher_pool
+from ParseSchedules.extract_teacher_schedules import build_teacher_schedules, sync_teacher_schedules
+
+
+def read_files(path: str) -> "dict[str, bytes]":
+    files = {}
+    for file in os.listdir(path):
+        with open(os.path.join(path, file), "rb") as f:
+            files[file] = f.read()
+    return files
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-g", "--groups", type=int, default=5000, help="Number of group files. Default is 5000")
+    ap.add_argument("-t", "--teachers", type=int, default=1500, help="Number of distinct teachers. Default is 1500")
+    ap.add_argument("-c", "--changed", type=int, default=1, help="Number of group files to change. Default is 1")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "output_json")
+        incremental = os.path.join(tmp, "incremental")
+        full = os.path.join(tmp, "full")
+        os.mkdir(source)
+        generate_corpus(source, args.groups, args.teachers)
+
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log):
+            sync_teacher_schedules(source, incremental)
+
+        rnd = random.Random(1)
+        teachers = teacher_pool(args.teachers, 0)
+        for i in rnd.sample(range(args.groups), args.changed):
+            with open(os.path.join(source, f"ГР-{i}.json"), "w", encoding="utf-8") as f:
+                json.dump(synthetic_group_schedule(rnd, teachers), f, ensure_ascii=False, indent=4)
+
+        started_at = time.perf_counter()
+        with contextlib.redirect_stdout(log):
+            rewritten = sync_teacher_schedules(source, incremental)
+        incremental_time = time.perf_counter() - started_at
+
+        os.mkdir(full)
+        started_at = time.perf_counter()
+        teachers_count = build_teacher_schedules(source, full)
+        full_time = time.perf_counter() - started_at
+
+        assert read_files(incremental) == read_files(full), "incremental and full rebuild differ"
+
+        print(f"{args.changed} of {args.groups} groups changed, {rewritten} of {teachers_count} teachers rewritten")
+        print(f"incremental: {incremental_time:.2f}s")
+        print(f"       full: {full_time:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# builds lessons out of a DataFrame the old way (to_json -> json.loads -> Lesson(**d) with a __dict__ per lesson)
+# and with the slotted Lesson.from_records. Reports time and memory held by the built lessons
+# usage: python -m ParseSchedules.benchmarks.bench_models [-n LESSONS]
+
+import argparse
+import json
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from ParseSchedules.models import Lesson
+
+
+class DictLesson:
+    """
+    Lesson as it was before __slots__.
+    """
+
+    def __init__(self, index, name, room, qualification, teacher, label, isBiweekly=None, week=None):
+        self.index = index
+        self.name = name
+        self.room = room
+        self.qualification = qualification
+        self.teacher = teacher
+        self.label = label
+        self.isBiweekly = isBiweekly
+        self.week = week
+
+
+def lessons_frame(n_lessons: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    labels = rng.choice([np.nan, 1.0, 2.0], size=n_lessons, p=[0.8, 0.1, 0.1])
+    return pd.DataFrame(
+        {
+            "index": rng.integers(1, 7, size=n_lessons),
+            "name": rng.choice(["Бази даних", "Фізичне виховання", "Системи керування контентом"], size=n_lessons).astype(object),
+            "room": rng.choice(["а.311а", "а.419", "а.306", None], size=n_lessons),
+            "qualification": rng.choice(["доц.", "проф.", "ст. в."], size=n_lessons).astype(object),
+            "teacher": rng.choice(["Піх", "Сабат", "Шепіта"], size=n_lessons).astype(object),
+            "label": labels,
+        }
+    )
+
+
+def via_json(df: pd.DataFrame) -> list:
+    return [DictLesson(**d) for d in json.loads(df.to_json(orient="records", force_ascii=False))]
+
+
+def via_records(df: pd.DataFrame) -> list:
+    return Lesson.from_records(df)
+
+
+def measure(fn, df: pd.DataFrame):
+    tracemalloc.start()
+    started_at = time.perf_counter()
+    lessons = fn(df)
+    elapsed = time.perf_counter() - started_at
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del lessons
+    return elapsed, held, peak
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-n", "--lessons", type=int, default=1_000_000, help="Number of lessons to build. Default is 1000000")
+    args = ap.parse_args()
+
+    df = lessons_frame(args.lessons)
+
+    # both ways must give the same lessons
+    sample = df.head(1000)
+    assert [vars(lesson) for lesson in via_json(sample)] == [lesson.to_dict() for lesson in via_records(sample)]
+
+    for name, fn in [("to_json + __dict__", via_json), ("from_records + __slots__", via_records)]:
+        elapsed, held, peak = measure(fn, df)
+        print(
+            f"{name:>24}: {args.lessons:,} lessons in {elapsed:.2f}s "
+            f"({args.lessons / elapsed:,.0f}/s), held {held / 2**20:.0f} MiB, peak {peak / 2**20:.0f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# checks generated group files for room and teacher conflicts with the occupancy arrays (ParseSchedules.occupancy)
+# and, for comparison, finds room conflicts and free rooms with the SQLite database (ParseSchedules.database).
+# Checks both find the same clashes and free rooms, and reports the times. The group files are read once,
+# the times are for building each structure and querying it:
+# python -m ParseSchedules.benchmarks.bench_occupancy [-g GROUPS] [-q QUERIES]
+
+import argparse
+import json
+import random
+import tempfile
+import time
+
+from ParseSchedules.benchmarks.bench_teachers import generate_corpus
+from ParseSchedules.database import ScheduleDatabase
+from ParseSchedules.extract_teacher_schedules import iter_group_files
+from ParseSchedules.occupancy import ROOMS, OccupancyIndex
+from ParseSchedules.utilities import days_eng_lower
+
+
+def timed(function, *args):
+    started_at = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started_at
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-g", "--groups", type=int, default=2000, help="Number of generated group files. Default is 2000")
+    ap.add_argument("-q", "--queries", type=int, default=200, help="Number of free room queries. Default is 200")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        generate_corpus(tmp, args.groups, n_teachers=args.groups // 3 + 1)
+        schedules = []
+        for group, path in iter_group_files(tmp):
+            with open(path, "rb") as f:
+                schedules.append((group, json.loads(f.read())))
+
+    rnd = random.Random(0)
+    queries = [(rnd.choice(days_eng_lower), rnd.randint(1, 5), rnd.choice([None, 1, 2])) for _ in range(args.queries)]
+
+    index, index_build = timed(OccupancyIndex, schedules)
+    conflicts, index_conflicts = timed(index.conflicts)
+    free, index_free = timed(lambda: [index.free_rooms(*query) for query in queries])
+
+    def load_database():
+        database = ScheduleDatabase(":memory:")
+        with database.connection:
+            for group, schedule in schedules:
+                database.replace_group(group, schedule)
+        return database
+
+    database, database_build = timed(load_database)
+    room_conflicts, database_conflicts = timed(database.room_conflicts)
+    database_free_rooms, database_free = timed(lambda: [database.free_rooms(*query) for query in queries])
+    database.close()
+
+    # the database reports every clashing pair of lessons, the index every clashing slot with all of its lessons
+    clashes = {}
+    for conflict in room_conflicts:
+        key = (conflict["room"], conflict["day"], conflict["index"])
+        clashes.setdefault(key, set()).update(lesson["group"] for lesson in conflict["lessons"])
+    index_clashes = {
+        (conflict["name"], conflict["day"], conflict["index"]): {lesson["group"] for lesson in conflict["lessons"]}
+        for conflict in conflicts
+        if conflict["kind"] == ROOMS
+    }
+    assert index_clashes == clashes, "the index and the database found different room conflicts"
+    assert free == database_free_rooms, "the index and the database found different free rooms"
+
+    n_teacher_conflicts = len(conflicts) - len(index_clashes)
+    print(f"{len(schedules)} groups, {len(index.lessons)} lessons: {len(index_clashes)} room and {n_teacher_conflicts} teacher conflict(s)")
+    print(f"{'':>10} {'build':>10} {'conflicts':>10} {f'{len(queries)} free':>10}")
+    for name, timings in [("occupancy", (index_build, index_conflicts, index_free)), ("sqlite", (database_build, database_conflicts, database_free))]:
+        print(f"{name:>10} " + " ".join(f"{timing * 1000:7.1f} ms" for timing in timings))
+    print("(sqlite finds room conflicts only)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# parses generated documents serially and through the overlapping pipeline (--io-concurrency),
+# with a simulated storage latency added to every file read and write, like on a network share.
+# Checks that both give identical files and reports the times:
+# python -m ParseSchedules.benchmarks.bench_pipeline [-n DOCUMENTS] [-g GROUPS] [--latency MS] [--io-concurrency N]
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from ParseSchedules import core, pipeline, serialization
+from ParseSchedules.benchmarks.docx_generator import generate_corpus
+
+
+def with_latency(fn, latency: float):
+    def slow(source, *args, **kwargs):
+        # readers also get the contents already read by the pipeline, only paths touch the storage
+        if isinstance(source, str):
+            time.sleep(latency)
+        return fn(source, *args, **kwargs)
+
+    return slow
+
+
+@contextlib.contextmanager
+def simulated_latency(latency: float):
+    """
+    Delays every .docx read and every output write by latency seconds, in both the serial path and the pipeline.
+    """
+    patches = [
+        (core.readers, "native"),
+        (serialization, "write_atomically"),
+        (pipeline, "read_bytes"),
+        (pipeline, "write_atomically"),
+    ]
+
+    originals = []
+    for target, name in patches:
+        if isinstance(target, dict):
+            originals.append(target[name])
+            target[name] = with_latency(target[name], latency)
+        else:
+            originals.append(getattr(target, name))
+            setattr(target, name, with_latency(getattr(target, name), latency))
+    try:
+        yield
+    finally:
+        for (target, name), original in zip(patches, originals):
+            if isinstance(target, dict):
+                target[name] = original
+            else:
+                setattr(target, name, original)
+
+
+def read_outputs() -> "dict[str, bytes]":
+    outputs = {}
+    for file in os.listdir("output_json"):
+        with open(os.path.join("output_json", file), "rb") as f:
+            outputs[file] = f.read()
+    return outputs
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-n", "--documents", type=int, default=20, help="Number of generated documents. Default is 20")
+    ap.add_argument("-g", "--groups", type=int, default=8, help="Number of groups per document. Default is 8")
+    ap.add_argument("--latency", type=float, default=20, help="Simulated latency of a file read or write in ms. Default is 20")
+    ap.add_argument("--io-concurrency", type=int, default=8, help="Files read or written at once by the pipeline. Default is 8")
+    ap.add_argument("-j", "--jobs", type=int, default=1, help="Parser processes of the pipeline. Default is 1")
+    args = ap.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            documents = generate_corpus("word_schedules", args.documents, n_groups=args.groups)
+            os.mkdir("output_json")
+
+            runs = {
+                "serial": lambda: core.extract_all_schedules(documents),
+                "pipeline": lambda: core.extract_all_schedules(
+                    documents, jobs=args.jobs, io_concurrency=args.io_concurrency
+                ),
+            }
+
+            results = {}
+            outputs = {}
+            for name, run in runs.items():
+                with simulated_latency(args.latency / 1000), \
+                        contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                    started_at = time.perf_counter()
+                    run()
+                    results[name] = time.perf_counter() - started_at
+                outputs[name] = read_outputs()
+
+            assert outputs["serial"] == outputs["pipeline"], "serial and pipeline outputs differ"
+        finally:
+            os.chdir(cwd)
+
+    print(f"{args.documents} documents, {args.groups} groups each, {args.latency:.0f} ms per file read or write")
+    for name, elapsed in results.items():
+        print(f"{name:>9}: {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# publishes generated group schedules to a local mock CMS (ParseSchedules.mock_cms) with a per-request latency
+# and injected failures: one schedule per request, then batches sent one at a time, then batches in parallel.
+# Checks the mock ends up with exactly the files, that publishing again uploads nothing and that a changed
+# schedule is the only one uploaded. Reports the time, requests, retries and connections of each run:
+# python -m ParseSchedules.benchmarks.bench_publish [-g GROUPS] [--batch-size 20] [-c CONCURRENCY] [--latency MS] [--fail-rate 0.1]
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+
+from ParseSchedules.benchmarks.bench_teachers import generate_corpus
+from ParseSchedules.bundle import GROUPS, iter_schedule_files
+from ParseSchedules.mock_cms import MockCMS, make_mock_server
+from ParseSchedules.publish import publish_schedules
+
+
+def start_mock(args) -> tuple:
+    """
+    Starts a mock CMS in a thread.
+
+    Returns:
+        tuple[MockCMS, ThreadingHTTPServer, str]: The mock, its server and its URL.
+    """
+    cms = MockCMS(max_batch=args.batch_size, latency=args.latency / 1000, fail_rate=args.fail_rate)
+    server = make_mock_server(cms, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return cms, server, f"http://{host}:{port}"
+
+
+def publish(url: str, source: str, state_path: str, batch_size: int, concurrency: int, force: bool = False) -> int:
+    # the publisher's own report would interleave with the table
+    with contextlib.redirect_stdout(io.StringIO()):
+        return publish_schedules(
+            url, {GROUPS: source}, state_path, batch_size, concurrency, retries=10, backoff=0.01, force=force
+        )
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-g", "--groups", type=int, default=200, help="Number of generated group files. Default is 200")
+    ap.add_argument("--batch-size", dest="batch_size", type=int, default=20, help="Entries per batch. Default is 20")
+    ap.add_argument("-c", "--concurrency", type=int, default=4, help="Batches in flight at once. Default is 4")
+    ap.add_argument("--latency", type=float, default=20, help="Milliseconds every request to the mock takes. Default is 20")
+    ap.add_argument("--fail-rate", dest="fail_rate", type=float, default=0.1, help="Share of requests failed with 503. Default is 0.1")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "output_json")
+        os.mkdir(source)
+        generate_corpus(source, args.groups, n_teachers=args.groups // 3 + 1)
+        files = dict(iter_schedule_files(source))
+
+        runs = {
+            "one per request": (1, 1),
+            "batches, serial": (args.batch_size, 1),
+            f"batches, {args.concurrency} at once": (args.batch_size, args.concurrency),
+        }
+
+        print(f"{len(files)} groups, {args.latency:g} ms per request, {args.fail_rate:.0%} of requests failed")
+        for name, (batch_size, concurrency) in runs.items():
+            cms, server, url = start_mock(args)
+            started_at = time.perf_counter()
+            published = publish(url, source, os.path.join(tmp, f"state_{batch_size}_{concurrency}.json"), batch_size, concurrency)
+            elapsed = time.perf_counter() - started_at
+            server.shutdown()
+            server.server_close()
+
+            expected = {f"{GROUPS}/{group}": json.loads(data) for group, data in files.items()}
+            assert {key: entry["content"] for key, entry in cms.entries.items()} == expected, f"{name}: the mock has different schedules"
+            assert published == len(files)
+
+            stats = cms.stats
+            print(
+                f"{name:>22}: {elapsed * 1000:8.1f} ms, {stats['requests']:4} requests "
+                f"({stats['failures']} failed and retried), {stats['connections']} connection(s)"
+            )
+
+        # the state is kept per URL, so this publishes everything once more, to a mock that stays up
+        cms, server, url = start_mock(args)
+        state_path = os.path.join(tmp, "state.json")
+        publish(url, source, state_path, args.batch_size, args.concurrency)
+
+        # publishing again uploads nothing, and after a change only that schedule
+        requests = cms.stats["requests"]
+        assert publish(url, source, state_path, args.batch_size, args.concurrency) == 0
+        assert cms.stats["requests"] == requests, "unchanged schedules were published again"
+
+        changed = sorted(files)[0]
+        path = os.path.join(source, f"{changed}.json")
+        with open(path, "r+", encoding="utf-8") as f:
+            schedule = json.load(f)
+            schedule["changed"] = True
+            f.seek(0)
+            f.truncate()
+            json.dump(schedule, f, ensure_ascii=False)
+
+        assert publish(url, source, state_path, args.batch_size, args.concurrency) == 1, "expected only the changed schedule"
+        with open(path, "rb") as f:
+            assert cms.entries[f"{GROUPS}/{changed}"]["sha256"] == hashlib.sha256(f.read()).hexdigest()
+
+        server.shutdown()
+        server.server_close()
+
+    print("re-publishing: 0 unchanged schedules uploaded, 1 of 1 changed uploaded")
+
+
+if __name__ == "__main__":
+    main()
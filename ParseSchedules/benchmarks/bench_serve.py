@@ -0,0 +1,125 @@
+# load-tests the schedule server (ParseSchedules.serve): concurrent clients on keep-alive connections
+# request random group schedules, some of them revalidating with If-None-Match like a client refreshing
+# a schedule it already has. Reports requests per second and latency percentiles. Starts a server on
+# generated group files, or tests a running one with --url:
+# python -m ParseSchedules.benchmarks.bench_serve [-g GROUPS] [-c CLIENTS] [-n REQUESTS] [--revalidate 0.5] [--url URL]
+
+import argparse
+import gzip
+import http.client
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from typing import List
+from urllib.parse import quote, urlsplit
+
+from ParseSchedules.benchmarks.bench_teachers import generate_corpus
+from ParseSchedules.bundle import GROUPS
+from ParseSchedules.serve import ScheduleStore, make_server
+
+
+def percentile(values: "List[float]", p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def client(host: str, port: int, names: "List[str]", n_requests: int, revalidate: float, seed: int, results: dict):
+    """
+    Sends n_requests requests over one connection, records their latencies and status codes.
+    """
+    rnd = random.Random(seed)
+    connection = http.client.HTTPConnection(host, port)
+    etags = {}
+    latencies = []
+    statuses = []
+
+    for _ in range(n_requests):
+        name = rnd.choice(names)
+        headers = {"Accept-Encoding": "gzip"}
+        if name in etags and rnd.random() < revalidate:
+            headers["If-None-Match"] = etags[name]
+
+        started_at = time.perf_counter()
+        connection.request("GET", f"/{GROUPS}/{quote(name)}", headers=headers)
+        response = connection.getresponse()
+        body = response.read()
+        latencies.append(time.perf_counter() - started_at)
+
+        statuses.append(response.status)
+        if response.status == 200:
+            etags[name] = response.getheader("ETag")
+            # the client would unpack it anyway, and it checks the gzip is valid
+            json.loads(gzip.decompress(body))
+
+    connection.close()
+    results[seed] = (latencies, statuses)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-g", "--groups", type=int, default=500, help="Number of generated group files. Default is 500")
+    ap.add_argument("-c", "--clients", type=int, default=8, help="Concurrent clients. Default is 8")
+    ap.add_argument("-n", "--requests", type=int, default=500, help="Requests per client. Default is 500")
+    ap.add_argument(
+        "--revalidate",
+        type=float,
+        default=0.5,
+        help="Share of requests for an already fetched schedule sent with If-None-Match. Default is 0.5",
+    )
+    ap.add_argument("--url", help="Test a running server, e.g. http://127.0.0.1:8000, instead of starting one")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = None
+        if args.url:
+            url = urlsplit(args.url)
+            host, port = url.hostname, url.port or 80
+        else:
+            source = os.path.join(tmp, "output_json")
+            os.mkdir(source)
+            generate_corpus(source, args.groups, n_teachers=args.groups // 3 + 1)
+
+            server = make_server(ScheduleStore({GROUPS: source}), port=0)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            host, port = server.server_address[:2]
+
+        connection = http.client.HTTPConnection(host, port)
+        connection.request("GET", f"/{GROUPS}")
+        names = json.loads(connection.getresponse().read())
+        connection.close()
+
+        results = {}
+        threads = [
+            threading.Thread(target=client, args=(host, port, names, args.requests, args.revalidate, seed, results))
+            for seed in range(args.clients)
+        ]
+
+        started_at = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started_at
+
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    latencies = [latency for thread_latencies, _ in results.values() for latency in thread_latencies]
+    statuses = [status for _, thread_statuses in results.values() for status in thread_statuses]
+    assert set(statuses) <= {200, 304}, f"unexpected responses: {set(statuses)}"
+
+    print(f"{len(names)} groups, {args.clients} clients x {args.requests} requests, {statuses.count(304)} answered with 304")
+    print(f"{len(latencies) / elapsed:10.0f} req/s")
+    print(
+        f"latency: p50 {percentile(latencies, 0.5) * 1000:.2f} ms, p99 {percentile(latencies, 0.99) * 1000:.2f} ms, "
+        f"mean {statistics.mean(latencies) * 1000:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
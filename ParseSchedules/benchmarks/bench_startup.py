@@ -0,0 +1,91 @@
+# measures how long commands take to start, in fresh interpreters: the wall time and the time spent
+# importing modules as reported by python -X importtime. Fails if --help imports for longer than the budget:
+# python -m ParseSchedules.benchmarks.bench_startup [-r RUNS] [--budget MS]
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+commands = {
+    "parse_schedules --help": ["-m", "ParseSchedules.parse_schedules", "--help"],
+    "import ParseSchedules": ["-c", "import ParseSchedules"],
+    # for comparison: everything parsing needs
+    "import ParseSchedules.core": ["-c", "import ParseSchedules.core"],
+}
+
+
+def import_time(stderr: str) -> float:
+    """
+    Sums up the cumulative time of top level imports in python -X importtime output.
+
+    Returns:
+        float: Seconds.
+    """
+    total_us = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        # "import time: <self us> | <cumulative us> | <module>", the header has words instead of numbers
+        _, cumulative, name = line.split("|")
+        # nested imports are indented under the module that imported them
+        if not name.startswith("  ") and cumulative.strip().isdigit():
+            total_us += int(cumulative)
+    return total_us / 1e6
+
+
+def run(args: "List[str]") -> "Tuple[float, float]":
+    """
+    Runs python with args in a new process.
+
+    Returns:
+        tuple[float, float]: Wall time and import time in seconds.
+    """
+    started_at = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        env={**os.environ, "PYTHONWARNINGS": "ignore"},
+        check=True,
+    )
+    return time.perf_counter() - started_at, import_time(result.stderr)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-r", "--runs", type=int, default=10, help="Runs per command. Default is 10")
+    ap.add_argument(
+        "--budget",
+        type=float,
+        default=50,
+        help="Maximum import time of parse_schedules --help in milliseconds. Default is 50",
+    )
+    args = ap.parse_args()
+
+    results = {}
+    for name, command in commands.items():
+        # the first run fills the OS file cache and writes .pyc files
+        run(command)
+        timings = [run(command) for _ in range(args.runs)]
+        results[name] = (
+            statistics.median(wall for wall, _ in timings),
+            statistics.median(imports for _, imports in timings),
+        )
+
+        wall, imports = results[name]
+        print(f"{name:>28}: {wall * 1000:8.1f} ms wall, {imports * 1000:8.1f} ms importing (median of {args.runs})")
+
+    help_imports = results["parse_schedules --help"][1] * 1000
+    if help_imports > args.budget:
+        print(f"[ERROR] --help spends {help_imports:.1f} ms importing, the budget is {args.budget:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
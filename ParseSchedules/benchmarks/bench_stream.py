@@ -0,0 +1,92 @@
+# feeds the lessons of generated documents to a consumer (here it just counts them) the way an ingestion service
+# had to: extract_all_schedules writes output_json, then every group file is read back; and straight from
+# iter_lessons, which keeps one document in memory at a time. Checks both give the same lessons and reports the
+# time and the peak memory (tracemalloc) for growing numbers of documents:
+# python -m ParseSchedules.benchmarks.bench_stream [-n 5 20] [-g GROUPS]
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from ParseSchedules.benchmarks.docx_generator import generate_corpus
+from ParseSchedules.core import extract_all_schedules, iter_lessons, iter_schedules, schedule_lessons
+from ParseSchedules.serialization import dumps
+from ParseSchedules.utilities import days_eng_lower
+
+
+def iter_lessons_through_files(documents: "list[str]"):
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        groups = extract_all_schedules(documents)
+
+    # a group found in several documents was overwritten, only its last schedule is left
+    for group in dict.fromkeys(groups):
+        with open(os.path.join("output_json", f"{group}.json"), "rb") as f:
+            schedule = json.loads(f.read())
+        for day in days_eng_lower:
+            for lesson in (schedule[day] or {}).get("classes", []):
+                yield group, day, lesson
+
+
+def last_schedules_lessons(documents: "list[str]"):
+    # the last schedule of every group, like the files
+    for group, schedule in dict(iter_schedules(documents)).items():
+        for day, lesson in schedule_lessons(schedule):
+            yield group, day, lesson.to_dict()
+
+
+def count(lessons) -> int:
+    # what the consumer does, without keeping anything
+    return sum(1 for _ in lessons)
+
+
+def measure(fn):
+    # tracemalloc slows python down, the time is taken from a run without it
+    started_at = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started_at
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-n", "--documents", type=int, nargs="+", default=[5, 20], help="Numbers of generated documents")
+    ap.add_argument("-g", "--groups", type=int, default=30, help="Number of groups per document. Default is 30")
+    args = ap.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            all_documents = generate_corpus("word_schedules", max(args.documents), n_groups=args.groups)
+
+            for n_documents in args.documents:
+                documents = all_documents[:n_documents]
+                os.makedirs("output_json", exist_ok=True)
+                for file in os.listdir("output_json"):
+                    os.remove(os.path.join("output_json", file))
+
+                from_files = [dumps({"group": group, "day": day, **lesson}, "compact") for group, day, lesson in iter_lessons_through_files(documents)]
+                streamed = [dumps({"group": group, "day": day, **lesson}, "compact") for group, day, lesson in last_schedules_lessons(documents)]
+                assert sorted(from_files) == sorted(streamed), "the files and the stream have different lessons"
+
+                _, files_time, files_peak = measure(lambda: count(iter_lessons_through_files(documents)))
+                n_lessons, stream_time, stream_peak = measure(lambda: count(iter_lessons(documents)))
+                print(f"{n_documents} documents, {n_documents * args.groups} groups, {n_lessons} lessons")
+                print(f"  write output_json, read it back: {files_time:6.2f} s, peak {files_peak / 2**20:6.1f} MiB")
+                print(f"  iter_lessons:                    {stream_time:6.2f} s, peak {stream_peak / 2**20:6.1f} MiB")
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# parses a generated document with several schedule tables (one per course, each but the first with a title
+# row above its header, followed by a table that isn't a schedule) in one go, and the same tables split by hand
+# into one document each. Checks that both give the same schedules and reports the times:
+# python -m ParseSchedules.benchmarks.bench_tables [-t TABLES] [-g GROUPS] [-r REPEAT] [--reader native|pydocx]
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import warnings
+
+from ParseSchedules.benchmarks.docx_generator import _cell, document_xml, generate_table_xml, write_docx
+from ParseSchedules.core import parse_schedule_document
+from ParseSchedules.serialization import dumps
+
+# e.g. the signatures under the schedule
+NOT_A_SCHEDULE = "<w:tbl><w:tr>" + _cell("Декан факультету") + _cell("підпис") + "</w:tr></w:tbl>"
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-t", "--tables", type=int, default=6, help="Number of schedule tables. Default is 6")
+    ap.add_argument("-g", "--groups", type=int, default=10, help="Number of groups per table. Default is 10")
+    ap.add_argument("-r", "--repeat", type=int, default=3, help="Timed runs, the best one is reported. Default is 3")
+    ap.add_argument("--reader", choices=["native", "pydocx"], default="native", help="Table reader. Default is native")
+    args = ap.parse_args()
+
+    warnings.simplefilter("ignore")
+
+    rnd = random.Random(0)
+    tables = [
+        generate_table_xml(rnd, args.groups, first_group=i * args.groups, title=f"{i + 1} курс" if i > 0 else None)
+        for i in range(args.tables)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        whole = os.path.join(tmp, "faculty.docx")
+        write_docx(whole, document_xml(tables + [NOT_A_SCHEDULE]))
+
+        pieces = []
+        for i, table in enumerate(tables):
+            pieces.append(os.path.join(tmp, f"course_{i + 1}.docx"))
+            write_docx(pieces[-1], document_xml([table]))
+
+        def parse_whole():
+            group_names, _, schedules = parse_schedule_document(whole, args.reader)
+            return {group: schedules[group] for group in group_names}
+
+        def parse_pieces():
+            schedules = {}
+            for piece in pieces:
+                group_names, _, piece_schedules = parse_schedule_document(piece, args.reader)
+                schedules.update((group, piece_schedules[group]) for group in group_names)
+            return schedules
+
+        runs = {"one document": parse_whole, "split documents": parse_pieces}
+
+        outputs = {name: {group: dumps(schedule) for group, schedule in run().items()} for name, run in runs.items()}
+        assert outputs["one document"] == outputs["split documents"], "the document and its pieces give different schedules"
+
+        results = {}
+        for name, run in runs.items():
+            timings = []
+            for _ in range(args.repeat):
+                started_at = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - started_at)
+            results[name] = min(timings)
+
+    print(f"{args.tables} tables, {args.groups} groups each, {len(outputs['one document'])} schedules, {args.reader} reader")
+    for name, elapsed in results.items():
+        print(f"{name:>16}: {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
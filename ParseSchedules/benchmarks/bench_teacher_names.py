@@ -0,0 +1,133 @@
+# canonicalizes generated teacher names (ParseSchedules.teacher_names): realistic surnames with initials, plus
+# the variants the documents have (surname alone or with one initial, typos like "Пих" for "Піх"), whose true
+# teacher is known. Reports precision and recall of the merged pairs, how many canonical names are right, the
+# number of similarities computed against the n^2/2 of comparing every pair, and the time, for growing numbers of names:
+# python -m ParseSchedules.benchmarks.bench_teacher_names [-n 2500 5000 10000 20000] [--threshold 85]
+
+import argparse
+import random
+import time
+from collections import Counter
+from itertools import product
+from typing import List, Tuple
+
+from ParseSchedules.teacher_names import DEFAULT_THRESHOLD, NameCanonicalizer, join_name
+
+_roots = [
+    "Ковал", "Шевч", "Бойк", "Ткач", "Кравч", "Мельн", "Олійн", "Лисенк", "Гнат", "Сабат", "Шепіт", "Савч",
+    "Руд", "Мороз", "Павл", "Марчен", "Бондар", "Клим", "Панас", "Гаврил", "Кузьм", "Остап", "Тарас", "Демч",
+    "Левчен", "Харч", "Яковл", "Петрен", "Гончар", "Кушнір", "Стець", "Федор", "Дорош", "Зінч", "Литвин",
+    "Приход", "Соловй", "Яремч", "Гуменн", "Білоус", "Вовк", "Гриц", "Дяч", "Жук", "Заїч", "Іван", "Їжач",
+    "Кирил", "Лук", "Мазур", "Нестер", "Онищ", "Пилип", "Романч", "Сидор", "Тимош", "Устим", "Фед", "Ющ",
+]
+_suffixes = ["енко", "ук", "юк", "чук", "ак", "ишин", "ів", "ич", "ович", "ський", "як", "ко", "ець", "ан"]
+# more roots for bigger corpora: "Бар", "Вет"...
+_syllables = ["Ба", "Ве", "Го", "Да", "Жи", "За", "Ки", "Ло", "Ма", "Но", "Пе", "Ра", "Со", "Ту", "Фе", "Ха", "Це", "Чу", "Ша"]
+_closings = ["л", "н", "р", "с", "т", "в", "ш", "д", "к", "м"]
+_initials = "АБВГДЄЗІЙКЛМНОПРСТУФХЮЯ"
+
+# letters the documents mix up
+_typos = {"і": "и", "и": "і", "е": "є", "є": "е", "г": "ґ", "ї": "і", "о": "а", "д": "т", "з": "с", "б": "п", "н": "нн", "нн": "н"}
+
+
+def generate_names(n_names: int, seed: int = 0) -> "Tuple[Counter, dict, dict]":
+    """
+    Teachers with two initials, and variants of some of their names.
+
+    Returns:
+        tuple[Counter, dict[str, str], dict[str, str]]: Name -> number of lessons, name -> the teacher it really is
+            (the variants that can't be told apart, e.g. a surname alone that several teachers share, are their own
+            teacher), and variant -> full name of the teacher.
+    """
+    rnd = random.Random(seed)
+    roots = _roots + [a + b.lower() + c for a, b, c in product(_syllables, _syllables, _closings)]
+    # the bigger the corpus, the more surnames: about two teachers per surname, like in real staff lists
+    surnames = rnd.sample([root + suffix for root, suffix in product(roots, _suffixes)], n_names // 3)
+
+    counts: "Counter[str]" = Counter()
+    teachers: "List[Tuple[str, str]]" = []
+    n_teachers = n_names * 3 // 4
+    while len(teachers) < n_teachers:
+        surname, initials = rnd.choice(surnames), "".join(rnd.sample(_initials, 2))
+        name = join_name(surname, initials)
+        if name not in counts:
+            counts[name] = rnd.randint(5, 40)
+            teachers.append((surname, initials))
+
+    by_surname = Counter(surname for surname, _ in teachers)
+    by_first_initial = Counter((surname, initials[0]) for surname, initials in teachers)
+
+    truth = {name: name for name in counts}
+    variants = {}
+    while len(counts) < n_names:
+        surname, initials = rnd.choice(teachers)
+        full_name = join_name(surname, initials)
+
+        kind = rnd.random()
+        if kind < 0.3:
+            variant = surname
+            unambiguous = by_surname[surname] == 1
+        elif kind < 0.5:
+            variant = join_name(surname, initials[0])
+            unambiguous = by_first_initial[(surname, initials[0])] == 1
+        else:
+            typos = [(i, typo) for typo in _typos for i in range(1, len(surname)) if surname.startswith(typo, i)]
+            if not typos:
+                continue
+            i, typo = rnd.choice(typos)
+            variant = join_name(surname[:i] + _typos[typo] + surname[i + len(typo) :], initials)
+            unambiguous = True
+
+        if variant in counts:
+            continue
+        counts[variant] = rnd.randint(1, 3)
+        truth[variant] = full_name if unambiguous else variant
+        variants[variant] = full_name
+
+    return counts, truth, variants
+
+
+def pairs(clusters: "Counter") -> int:
+    return sum(size * (size - 1) // 2 for size in clusters.values())
+
+
+def evaluate(aliases: "dict[str, str]", truth: "dict[str, str]", variants: "dict[str, str]") -> "dict[str, float]":
+    predicted = {name: aliases.get(name, name) for name in truth}
+    true_positives = pairs(Counter((predicted[name], truth[name]) for name in truth))
+    predicted_pairs = pairs(Counter(predicted.values()))
+    true_pairs = pairs(Counter(truth.values()))
+
+    resolvable = [variant for variant in variants if truth[variant] != variant]
+    return {
+        "precision": true_positives / predicted_pairs if predicted_pairs else 1.0,
+        "recall": true_positives / true_pairs if true_pairs else 1.0,
+        "canonical": sum(predicted[variant] == variants[variant] for variant in resolvable) / max(len(resolvable), 1),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-n", "--names", type=int, nargs="+", default=[2500, 5000, 10000, 20000], help="Numbers of names")
+    ap.add_argument("--threshold", type=int, default=DEFAULT_THRESHOLD, help=f"Default is {DEFAULT_THRESHOLD}")
+    args = ap.parse_args()
+
+    print(f"{'names':>7} {'variants':>9} {'precision':>10} {'recall':>7} {'canonical':>10} {'similarities':>12} {'n^2/2':>12} {'cache hits':>11} {'time':>9}")
+    for n_names in args.names:
+        counts, truth, variants = generate_names(n_names)
+        canonicalizer = NameCanonicalizer(args.threshold)
+
+        started_at = time.perf_counter()
+        aliases = canonicalizer.canonicalize(counts)
+        elapsed = time.perf_counter() - started_at
+
+        scores = evaluate(aliases, truth, variants)
+        stats = canonicalizer.stats
+        print(
+            f"{n_names:>7} {len(variants):>9} {scores['precision']:>10.3f} {scores['recall']:>7.3f} {scores['canonical']:>10.3f} "
+            f"{stats['cache_misses']:>12,} {n_names * (n_names - 1) // 2:>12,} {stats['cache_hits']:>11,} {elapsed * 1000:>6.0f} ms"
+        )
+    print("(similarities are computed between distinct surnames sharing a block; rapidfuzz, if installed, computes them faster)")
+
+
+if __name__ == "__main__":
+    main()
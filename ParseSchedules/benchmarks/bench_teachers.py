@@ -0,0 +1,86 @@
+# builds teacher schedules from a generated corpus of group files, streaming (build_teacher_schedules)
+# and the old way, with every group schedule loaded into memory first. Reports time and peak memory
+# usage: python -m ParseSchedules.benchmarks.bench_teachers [-g GROUPS] [-t TEACHERS]
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from ParseSchedules.benchmarks.synthetic import synthetic_group_schedule, teacher_pool
+from ParseSchedules.extract_teacher_schedules import build_teacher_schedules, day_classes, iter_group_schedules
+from ParseSchedules.utilities import construct_empty_schedule, days_eng_lower, merge_classes
+
+
+def generate_corpus(path: str, n_groups: int, n_teachers: int, seed: int = 0):
+    rnd = random.Random(seed)
+    teachers = teacher_pool(n_teachers, seed)
+    for i in range(n_groups):
+        with open(os.path.join(path, f"ГР-{i}.json"), "w", encoding="utf-8") as f:
+            json.dump(synthetic_group_schedule(rnd, teachers), f, ensure_ascii=False, indent=4)
+
+
+def build_in_memory(path_to_student_schedules: str, path_to_teacher_schedules: str) -> int:
+    """
+    The approach extract_teacher_schedules used before: load every group, collect lessons per teacher, merge at the end.
+    """
+    student_schedules = dict(iter_group_schedules(path_to_student_schedules))
+
+    teacher_schedules = {}
+    for group, schedule in student_schedules.items():
+        for day in days_eng_lower:
+            for lesson in day_classes(schedule, day):
+                if lesson["teacher"] is None:
+                    continue
+                for teacher in lesson["teacher"].split("|"):
+                    if teacher not in teacher_schedules:
+                        teacher_schedules[teacher] = construct_empty_schedule()
+                    teacher_schedules[teacher][day]["classes"].append({**lesson, "group": group})
+
+    for teacher, schedule in teacher_schedules.items():
+        for day in schedule.keys():
+            schedule[day]["classes"] = merge_classes(schedule[day]["classes"])
+            schedule[day]["classes"].sort(key=lambda c: c["index"])
+
+        with open(os.path.join(path_to_teacher_schedules, teacher + ".json"), "w", encoding="utf8") as f:
+            f.write(json.dumps(schedule, ensure_ascii=False, indent=4))
+
+    return len(teacher_schedules)
+
+
+def measure(fn, source: str, dest: str):
+    tracemalloc.start()
+    started_at = time.perf_counter()
+    teachers = fn(source, dest)
+    elapsed = time.perf_counter() - started_at
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return teachers, elapsed, peak
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-g", "--groups", type=int, default=5000, help="Number of group files. Default is 5000")
+    ap.add_argument("-t", "--teachers", type=int, default=1500, help="Number of distinct teachers. Default is 1500")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "output_json")
+        os.mkdir(source)
+        generate_corpus(source, args.groups, args.teachers)
+
+        results = {}
+        for name, fn in [("in memory", build_in_memory), ("streaming", build_teacher_schedules)]:
+            dest = os.path.join(tmp, name)
+            os.mkdir(dest)
+            results[name] = measure(fn, source, dest)
+
+        for name, (teachers, elapsed, peak) in results.items():
+            print(f"{name:>9}: {teachers} teachers from {args.groups} groups in {elapsed:.2f}s, peak memory {peak / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# compares the compiled lesson tokenizer to the pandas extractall/replace chain it replaced
+# usage: python -m ParseSchedules.benchmarks.bench_tokenizer [-g GROUPS] [-r REPEAT]
+
+import argparse
+import time
+import warnings
+
+import pandas as pd
+
+from ParseSchedules.benchmarks.synthetic import group_names, synthetic_table
+from ParseSchedules.tokenizer import tokenize_lessons
+from ParseSchedules.utilities import qualifications
+
+
+def pandas_chain(df: pd.DataFrame, target_group: str) -> pd.DataFrame:
+    """
+    The room/qualification/teacher extraction extract_single_schedule did before the tokenizer.
+    """
+    df = df.loc[:, ["День", "Пара", target_group]]
+
+    re_for_room_number = r"\b(\w\. ?\d{1,5}\w{0,5}(/\d)*)\b"
+    df["Аудиторія"] = (
+        df[target_group]
+        .str.extractall(re_for_room_number)
+        .groupby(level=0)[0]
+        .apply(lambda x: "|".join(x))
+    )
+    df[target_group] = df[target_group].str.replace(re_for_room_number, "")
+
+    teacherQualRE = "(" + "|".join(qualifications) + ")"
+    df["qualification"] = (
+        df[target_group]
+        .str.extractall(teacherQualRE)
+        .groupby(level=0)[0]
+        .apply(lambda x: "|".join(x))
+    )
+
+    teacherRe = rf"{teacherQualRE} ([А-ЩЬЮЯҐЄІЇ][а-щьюяґєії]+( [А-ЩЬЮЯҐЄІЇ]\.)*)"
+    df["teacher"] = (
+        df[target_group]
+        .str.extractall(teacherRe)
+        .groupby(level=0)[1]
+        .apply(lambda x: "|".join(x))
+    )
+
+    df[target_group] = df[target_group].str.replace(teacherQualRE, "")
+    df[target_group] = df[target_group].str.replace(
+        "|".join(df["teacher"].dropna()), ""
+    )
+
+    return df
+
+
+def tokenizer(df: pd.DataFrame, target_group: str) -> pd.DataFrame:
+    df = df.loc[:, ["День", "Пара", target_group]]
+    tokens = tokenize_lessons(df[target_group])
+    df["Аудиторія"] = tokens["room"]
+    df["qualification"] = tokens["qualification"]
+    df["teacher"] = tokens["teacher"]
+    df[target_group] = tokens["name"]
+    return df
+
+
+def check_same_tokens(df: pd.DataFrame, groups: "list[str]"):
+    for group in groups:
+        expected = pandas_chain(df, group)
+        actual = tokenizer(df, group)
+        for column in ["Аудиторія", "qualification", "teacher"]:
+            pd.testing.assert_series_equal(actual[column], expected[column], check_dtype=False)
+
+
+def run(fn, df: pd.DataFrame, groups: "list[str]", repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        for group in groups:
+            fn(df, group)
+        best = min(best, time.perf_counter() - started_at)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-g", "--groups", type=int, default=500, help="Number of group columns. Default is 500")
+    ap.add_argument("-r", "--repeat", type=int, default=3, help="Number of runs, the best one is reported. Default is 3")
+    args = ap.parse_args()
+
+    warnings.filterwarnings("ignore", category=FutureWarning)
+
+    df = synthetic_table(args.groups)
+    groups = group_names(args.groups)
+    cells = int(df[groups].notna().sum().sum())
+
+    check_same_tokens(df, groups)
+
+    chain_time = run(pandas_chain, df, groups, args.repeat)
+    tokenizer_time = run(tokenizer, df, groups, args.repeat)
+
+    print(f"{args.groups} groups, {len(df)} rows, {cells} lesson cells")
+    print(f"pandas chain: {chain_time:.3f}s ({cells / chain_time:,.0f} cells/s)")
+    print(f"tokenizer:    {tokenizer_time:.3f}s ({cells / tokenizer_time:,.0f} cells/s)")
+    print(f"speedup:      {chain_time / tokenizer_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
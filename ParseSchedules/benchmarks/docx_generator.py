@@ -0,0 +1,287 @@
+# generates .docx schedule documents that look like the ones the university publishes:
+# merged day and pair cells, lectures spanning several groups, biweekly pairs split into two rows,
+# day names written vertically (so they are read reversed) or misspelled, "ТП-5м.1"-style group names
+# and cells with several teachers.
+# python -m ParseSchedules.benchmarks.docx_generator -o DIR [-n DOCUMENTS] [-g GROUPS] [-d DAYS] [-p PAIRS] [-t TABLES]
+
+import argparse
+import os
+import random
+import zipfile
+from typing import List, Optional
+from xml.sax.saxutils import escape
+
+from ParseSchedules.benchmarks.synthetic import random_lesson_text, teachers
+from ParseSchedules.utilities import days_ukr
+
+W_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    "</Types>"
+)
+
+RELATIONSHIPS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    "</Relationships>"
+)
+
+group_prefixes = ["ІСТ", "ТП", "КН", "ПІ", "ЕК", "МЕ"]
+
+
+def misspell_day(rnd: random.Random, day: str) -> str:
+    """
+    Writes a day name the ways it shows up in real documents.
+    """
+    r = rnd.random()
+    if r < 0.3:
+        # vertical text is read bottom to top: "яцинтя’П"
+        return day[::-1]
+    if r < 0.4:
+        # a plain apostrophe instead of ’
+        return day.replace("’", "'")
+    if r < 0.5:
+        # a doubled letter
+        i = rnd.randrange(1, len(day))
+        return day[:i] + day[i - 1] + day[i:]
+    if r < 0.6:
+        # spaces from manual line breaks
+        return " ".join(day[:3]) + day[3:]
+    return day
+
+
+def generated_group_names(rnd: random.Random, n_groups: int, first: int = 0) -> "List[str]":
+    """
+    Group names like "ІСТ-1", "ТП-21" and master's groups like "ТП-5м.1", numbered from first + 1.
+    """
+    prefix = rnd.choice(group_prefixes)
+    names = []
+    for i in range(first, first + n_groups):
+        if rnd.random() < 0.2:
+            names.append(f"{prefix}-{rnd.randint(5, 6)}м.{i + 1}")
+        else:
+            names.append(f"{prefix}-{i + 1}")
+    return names
+
+
+def generated_lesson_text(rnd: random.Random) -> str:
+    text = random_lesson_text(rnd)
+
+    if rnd.random() < 0.1:
+        # a third teacher, e.g. lab assistants
+        text += ", " + rnd.choice(teachers)
+
+    if rnd.random() < 0.2:
+        # a line break inside the cell
+        text = text.replace(" ", "\n", 1)
+
+    return text
+
+
+def _paragraphs(text: Optional[str]) -> str:
+    if text is None:
+        return "<w:p/>"
+    return "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>'
+        for line in text.split("\n")
+    )
+
+
+def _cell(text: Optional[str], span: int = 1, merge: Optional[str] = None) -> str:
+    properties = ""
+    if span > 1:
+        properties += f'<w:gridSpan w:val="{span}"/>'
+    if merge == "restart":
+        properties += '<w:vMerge w:val="restart"/>'
+    elif merge == "continue":
+        properties += "<w:vMerge/>"
+    return f"<w:tc><w:tcPr>{properties}</w:tcPr>{_paragraphs(text)}</w:tc>"
+
+
+def generate_table_xml(
+    rnd: random.Random,
+    n_groups: int = 6,
+    n_days: int = 5,
+    pairs_per_day: int = 5,
+    biweekly_ratio: float = 0.3,
+    empty_ratio: float = 0.2,
+    lecture_ratio: float = 0.15,
+    first_group: int = 0,
+    title: Optional[str] = None,
+) -> str:
+    """
+    Generates a schedule table (w:tbl). Takes the same arguments as generate_document_xml, plus:
+
+    Args:
+        rnd (random.Random): The random generator.
+        first_group (int): Groups are numbered from first_group + 1.
+        title (str, optional): A title row above the header, merged across the whole table.
+    """
+    groups = generated_group_names(rnd, n_groups, first_group)
+
+    rows = ["<w:tr>" + _cell("День") + _cell("Пара") + "".join(_cell(group) for group in groups) + "</w:tr>"]
+    if title is not None:
+        rows.insert(0, "<w:tr>" + _cell(title, span=2 + n_groups) + "</w:tr>")
+
+    for day in days_ukr[:n_days]:
+        first_row_of_day = True
+        for pair in range(1, pairs_per_day + 1):
+            n_rows = 2 if rnd.random() < biweekly_ratio else 1
+
+            for row in range(n_rows):
+                cells = [
+                    _cell(misspell_day(rnd, day), merge="restart") if first_row_of_day else _cell(None, merge="continue"),
+                    _cell(str(pair), merge=("restart" if row == 0 else "continue") if n_rows > 1 else None),
+                ]
+                first_row_of_day = False
+
+                i = 0
+                while i < n_groups:
+                    r = rnd.random()
+                    if r < empty_ratio:
+                        cells.append(_cell(None))
+                        i += 1
+                        continue
+
+                    span = 1
+                    if r > 1 - lecture_ratio:
+                        span = min(rnd.randint(2, 3), n_groups - i)
+
+                    cells.append(_cell(generated_lesson_text(rnd), span=span))
+                    i += span
+
+                rows.append("<w:tr>" + "".join(cells) + "</w:tr>")
+
+    grid = "<w:gridCol/>" * (2 + n_groups)
+    return f'<w:tbl><w:tblGrid>{grid}</w:tblGrid>{"".join(rows)}</w:tbl>'
+
+
+def document_xml(tables: "List[str]") -> str:
+    """
+    Wraps tables (w:tbl) into word/document.xml, with an empty paragraph after each of them.
+    """
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{W_NAMESPACE}"><w:body>'
+        + "".join(table + "<w:p/>" for table in tables)
+        + "</w:body></w:document>"
+    )
+
+
+def generate_document_xml(
+    n_groups: int = 6,
+    n_days: int = 5,
+    pairs_per_day: int = 5,
+    seed: int = 0,
+    biweekly_ratio: float = 0.3,
+    empty_ratio: float = 0.2,
+    lecture_ratio: float = 0.15,
+    n_tables: int = 1,
+) -> str:
+    """
+    Generates word/document.xml of a schedule document.
+
+    Args:
+        n_groups (int): Number of group columns.
+        n_days (int): Number of days, up to 5.
+        pairs_per_day (int): Number of pairs in a day.
+        seed (int): Seed of the random generator, the same seed gives the same document.
+        biweekly_ratio (float): Share of pairs split into two rows (first and second week).
+        empty_ratio (float): Share of empty cells.
+        lecture_ratio (float): Share of cells merged across two or three neighbouring groups.
+        n_tables (int): Number of schedule tables, e.g. one per course. Every table but the first
+            has a title row above its header and groups of its own.
+
+    Returns:
+        str: The XML.
+    """
+    rnd = random.Random(seed)
+    return document_xml(
+        [
+            generate_table_xml(
+                rnd,
+                n_groups,
+                n_days,
+                pairs_per_day,
+                biweekly_ratio,
+                empty_ratio,
+                lecture_ratio,
+                first_group=i * n_groups,
+                title=f"{i + 1} курс" if i > 0 else None,
+            )
+            for i in range(n_tables)
+        ]
+    )
+
+
+def write_docx(path: str, xml: str):
+    """
+    Writes a .docx file with xml as its word/document.xml.
+    """
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr("[Content_Types].xml", CONTENT_TYPES)
+        docx.writestr("_rels/.rels", RELATIONSHIPS)
+        docx.writestr("word/document.xml", xml)
+
+
+def generate_docx(path: str, **kwargs):
+    """
+    Writes a generated schedule document to path. Takes the same arguments as generate_document_xml.
+    """
+    write_docx(path, generate_document_xml(**kwargs))
+
+
+def generate_corpus(
+    path: str,
+    n_documents: int,
+    n_groups: int = 6,
+    n_days: int = 5,
+    pairs_per_day: int = 5,
+    seed: int = 0,
+    n_tables: int = 1,
+) -> "List[str]":
+    """
+    Writes n_documents generated documents to the directory.
+
+    Returns:
+        list[str]: Paths of the documents.
+    """
+    os.makedirs(path, exist_ok=True)
+
+    paths = []
+    for i in range(n_documents):
+        doc_path = os.path.join(path, f"schedule_{i}.docx")
+        generate_docx(
+            doc_path, n_groups=n_groups, n_days=n_days, pairs_per_day=pairs_per_day, seed=seed + i, n_tables=n_tables
+        )
+        paths.append(doc_path)
+    return paths
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-o", "--output", required=True, help="Directory to save the documents to")
+    ap.add_argument("-n", "--documents", type=int, default=10, help="Number of documents. Default is 10")
+    ap.add_argument("-g", "--groups", type=int, default=6, help="Number of groups per document. Default is 6")
+    ap.add_argument("-d", "--days", type=int, default=5, choices=range(1, 6), help="Number of days. Default is 5")
+    ap.add_argument("-p", "--pairs", type=int, default=5, help="Number of pairs per day. Default is 5")
+    ap.add_argument("-t", "--tables", type=int, default=1, help="Number of schedule tables per document. Default is 1")
+    ap.add_argument("--seed", type=int, default=0, help="Seed of the first document. Default is 0")
+    args = ap.parse_args()
+
+    paths = generate_corpus(args.output, args.documents, args.groups, args.days, args.pairs, args.seed, args.tables)
+
+    print(f"[INFO] {len(paths)} documents saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
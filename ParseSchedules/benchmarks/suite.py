@@ -0,0 +1,217 @@
+# times the main steps of the parser on generated documents (see docx_generator), stores the results
+# as a named baseline and compares later runs against it, failing on regressions. The "main" baseline
+# in baselines/ is committed; record it again after a change that is meant to move the timings:
+# python -m ParseSchedules.benchmarks.suite --save main
+# python -m ParseSchedules.benchmarks.suite --compare main [--threshold 0.1] [--metric median]
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, List
+
+import pandas as pd
+
+from ParseSchedules.benchmarks.docx_generator import generate_corpus
+from ParseSchedules.core import extract_all_schedules, extract_single_schedule, preprocess_table, read_schedule_document
+from ParseSchedules.docx_reader import readers
+from ParseSchedules.extract_teacher_schedules import build_teacher_schedules
+from ParseSchedules.serialization import JsonWriter
+
+DEFAULT_BASELINES = os.path.join(os.path.dirname(__file__), "baselines")
+
+metrics = ["min", "median", "mean"]
+
+
+class Workspace:
+    """
+    Generated documents and a working directory shared by the benchmarks.
+    The parser writes to output_json/ relative to the current directory, so the suite runs inside it.
+    """
+
+    def __init__(self, path: str, n_documents: int, n_groups: int):
+        self.path = path
+        self.documents = generate_corpus(os.path.join(path, "word_schedules"), n_documents, n_groups=n_groups)
+        # a single wide document, e.g. a whole faculty on one page
+        self.wide_document = generate_corpus(os.path.join(path, "wide"), 1, n_groups=n_groups * 5, seed=1000)[0]
+        os.makedirs(os.path.join(path, "output_json"), exist_ok=True)
+
+
+# name -> function that prepares a benchmark in the workspace and returns the code to time
+benchmarks: "dict[str, Callable[[Workspace], Callable[[], object]]]" = {}
+
+
+def benchmark(setup: "Callable[[Workspace], Callable[[], object]]"):
+    benchmarks[setup.__name__] = setup
+    return setup
+
+
+@benchmark
+def read_table(workspace: Workspace):
+    return lambda: readers["native"](workspace.wide_document)
+
+
+@benchmark
+def preprocess(workspace: Workspace):
+    df = readers["native"](workspace.wide_document)
+    return lambda: preprocess_table(df.copy())
+
+
+@benchmark
+def extract_single(workspace: Workspace):
+    df, group_names, _ = read_schedule_document(workspace.wide_document, "native")
+    writer = JsonWriter()
+    return lambda: extract_single_schedule(df, group_names[len(group_names) // 2], writer)
+
+
+@benchmark
+def extract_all(workspace: Workspace):
+    # end to end: read, parse and save every document, without the rebuild cache
+    return lambda: extract_all_schedules(workspace.documents)
+
+
+@benchmark
+def teachers(workspace: Workspace):
+    extract_all_schedules(workspace.documents)
+    dest = os.path.join(workspace.path, "teachers_output_json")
+    return lambda: build_teacher_schedules("output_json", dest)
+
+
+def measure(fn: "Callable[[], object]", rounds: int) -> dict:
+    # the first call warms up caches (imports, compiled regexes, the day corrector) and isn't counted
+    fn()
+
+    timings = []
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started_at)
+
+    return {
+        "rounds": rounds,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "stdev": statistics.stdev(timings) if rounds > 1 else 0.0,
+    }
+
+
+def run_suite(names: "List[str]", rounds: int, n_documents: int, n_groups: int) -> "dict[str, dict]":
+    results = {}
+    cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            # the parser reports every file it saves, keep the suite's own output readable
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                workspace = Workspace(tmp, n_documents, n_groups)
+
+            for name in names:
+                with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                    results[name] = measure(benchmarks[name](workspace), rounds)
+                print(f"{name:>16}: {results[name]['median'] * 1000:10.2f} ms (median of {rounds})")
+        finally:
+            os.chdir(cwd)
+
+    return results
+
+
+def machine_info() -> dict:
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+    }
+
+
+def compare(results: "dict[str, dict]", baseline: dict, metric: str, threshold: float) -> "List[str]":
+    """
+    Compares results against a baseline.
+
+    Returns:
+        list[str]: Names of the benchmarks that got slower than threshold allows.
+    """
+    regressions = []
+
+    print(f"\n{'benchmark':>16}  {'baseline':>12}  {'now':>12}  change ({metric})")
+    for name, result in results.items():
+        if name not in baseline["benchmarks"]:
+            print(f"{name:>16}  {'-':>12}  {result[metric] * 1000:9.2f} ms  not in the baseline")
+            continue
+
+        before = baseline["benchmarks"][name][metric]
+        change = result[metric] / before - 1
+
+        regressed = change > threshold
+        if regressed:
+            regressions.append(name)
+
+        print(
+            f"{name:>16}  {before * 1000:9.2f} ms  {result[metric] * 1000:9.2f} ms  "
+            f"{change:+.1%}{'  REGRESSION' if regressed else ''}"
+        )
+
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-k", "--only", nargs="+", choices=list(benchmarks), help="Run only these benchmarks")
+    ap.add_argument("-r", "--rounds", type=int, default=5, help="Timed rounds per benchmark. Default is 5")
+    ap.add_argument("-n", "--documents", type=int, default=10, help="Number of generated documents. Default is 10")
+    ap.add_argument("-g", "--groups", type=int, default=8, help="Number of groups per document. Default is 8")
+    ap.add_argument("--save", metavar="NAME", help="Save the results as a baseline")
+    ap.add_argument("--compare", metavar="NAME", help="Compare the results to a saved baseline")
+    ap.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Slowdown against the baseline that counts as a regression, 0.1 is 10%%. Default is 0.1",
+    )
+    ap.add_argument("--metric", choices=metrics, default="median", help="Timing compared to the baseline. Default is median")
+    ap.add_argument("--baselines", default=DEFAULT_BASELINES, help="Directory with baselines")
+    args = ap.parse_args()
+
+    if args.compare and not os.path.exists(os.path.join(args.baselines, args.compare + ".json")):
+        ap.error(f"no baseline named {args.compare!r} in {args.baselines}")
+
+    names = args.only or list(benchmarks)
+    results = run_suite(names, args.rounds, args.documents, args.groups)
+
+    # the timings depend on the size of the generated documents
+    options = {"documents": args.documents, "groups": args.groups}
+
+    if args.save:
+        os.makedirs(args.baselines, exist_ok=True)
+        path = os.path.join(args.baselines, args.save + ".json")
+        baseline = {"machine": machine_info(), "options": options, "benchmarks": results}
+        with open(path, "w", encoding="utf8") as f:
+            json.dump(baseline, f, indent=4)
+        print(f"[INFO] Baseline saved to {path}")
+
+    if args.compare:
+        path = os.path.join(args.baselines, args.compare + ".json")
+        with open(path, "r", encoding="utf8") as f:
+            baseline = json.load(f)
+
+        if baseline["machine"] != machine_info():
+            print(f"[WARNING] The baseline was recorded on a different setup: {baseline['machine']}")
+        if baseline["options"] != options:
+            print(f"[WARNING] The baseline was recorded with different options: {baseline['options']}")
+
+        regressions = compare(results, baseline, args.metric, args.threshold)
+        if regressions:
+            print(f"[ERROR] {len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}: {regressions}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# generators of synthetic, but realistic looking schedule data for benchmarks
+
+import random
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ParseSchedules.tokenizer import tokenize_lesson
+from ParseSchedules.utilities import days_eng_lower, days_ukr, qualifications
+
+subjects = [
+    "Системи керування контентом",
+    "Проектування аудіо і відео",
+    "Бази даних",
+    "Програмування для мобільних платформ",
+    "Фізичне виховання",
+    "Іноземна мова (за проф. спрямуванням)",
+]
+
+teachers = [
+    "проф. Піх",
+    "доц. Сабат",
+    "ст. в. Шепіта",
+    "ас. Коваль І.",
+    "ст.викл. Бойко",
+    "викл. Гнатюк О. В.",
+    "ст. ас. Їжак",
+    "пр. Ґудзь",
+]
+
+
+def random_room(rnd: random.Random) -> str:
+    return "а.%d%s" % (rnd.randint(100, 450), rnd.choice(["", "а", "б", "/1"]))
+
+
+def random_lesson_text(rnd: random.Random) -> str:
+    """
+    A lesson cell: room, subject and one or two teachers.
+    """
+    text = f"{random_room(rnd)} {rnd.choice(subjects)} {rnd.choice(teachers)}"
+
+    if rnd.random() < 0.15:
+        text += ", " + rnd.choice(teachers)
+
+    return text
+
+
+def group_names(n_groups: int) -> "List[str]":
+    return [f"ІСТ-{i + 1}" for i in range(n_groups)]
+
+
+def synthetic_table(n_groups: int, pairs_per_day: int = 5, seed: int = 0, empty_ratio: float = 0.3) -> pd.DataFrame:
+    """
+    A preprocessed schedule table: "День", "Пара" and one column per group,
+    with split (biweekly) rows for some of the pairs.
+
+    Args:
+        n_groups (int): Number of group columns.
+        pairs_per_day (int): Number of pairs in a day.
+        seed (int): Seed of the random generator.
+        empty_ratio (float): Share of empty lesson cells.
+
+    Returns:
+        pandas.DataFrame: The table.
+    """
+    rnd = random.Random(seed)
+    columns: "dict[str, list]" = {"День": [], "Пара": []}
+    groups = group_names(n_groups)
+    for group in groups:
+        columns[group] = []
+
+    for day in days_ukr:
+        for pair in range(1, pairs_per_day + 1):
+            rows = 2 if rnd.random() < 0.3 else 1
+            for _ in range(rows):
+                columns["День"].append(day)
+                columns["Пара"].append(pair)
+                for group in groups:
+                    cell: Optional[str] = None if rnd.random() < empty_ratio else random_lesson_text(rnd)
+                    columns[group].append(np.nan if cell is None else cell)
+
+    return pd.DataFrame(columns)
+
+
+_surname_syllables = ["Ко", "ва", "ле", "нко", "Бой", "Шеп", "іта", "Са", "бат", "Гна", "тюк", "Ли", "се", "нко", "Ткач", "ук", "Мель", "ник"]
+
+
+def teacher_pool(n_teachers: int, seed: int = 0) -> "List[str]":
+    """
+    Distinct teachers with a qualification, e.g. "доц. Сабатлеко".
+    """
+    rnd = random.Random(seed)
+    quals = [q.replace("\\", "") for q in qualifications]
+    pool = {}
+    while len(pool) < n_teachers:
+        surname = "".join(rnd.choice(_surname_syllables) for _ in range(rnd.randint(2, 4))).capitalize()
+        pool.setdefault(surname, f"{rnd.choice(quals)} {surname}")
+    return list(pool.values())
+
+
+def synthetic_group_schedule(rnd: random.Random, teachers_: "List[str]", pairs_per_day: int = 5) -> dict:
+    """
+    A group schedule in the format of output_json, with a few biweekly classes.
+    """
+    schedule = {}
+    for day in days_eng_lower:
+        classes = []
+        for pair in range(1, pairs_per_day + 1):
+            if rnd.random() < 0.4:
+                continue
+            weeks = [1, 2] if rnd.random() < 0.2 else [None]
+            for week in weeks:
+                text = f"{random_room(rnd)} {rnd.choice(subjects)} {rnd.choice(teachers_)}"
+                tokens = tokenize_lesson(text)
+                classes.append(
+                    {
+                        "index": pair,
+                        "name": tokens.name,
+                        "room": tokens.room,
+                        "qualification": tokens.qualification,
+                        "teacher": tokens.teacher,
+                        "label": None if week is None else float(week),
+                        "isBiweekly": None if week is None else True,
+                        "week": week,
+                    }
+                )
+        schedule[day] = {"classes": classes} if classes else []
+    return schedule
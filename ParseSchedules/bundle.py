@@ -0,0 +1,208 @@
+# packs all group and teacher schedules into a single compressed file with an offset index,
+# so the viewer can fetch the index once and then range-read just the schedule it needs
+#
+# layout:
+#   MAGIC (8 bytes) | index length (4 bytes, little endian) | index (UTF-8 JSON) | entries
+# the index is {"codec": "gzip" | "zstd", "entries": {"<kind>/<name>": [offset, length]}},
+# offsets are from the start of the file and each entry is a separately compressed JSON schedule
+
+import argparse
+import gzip
+import json
+import mmap
+import os
+import struct
+from typing import Iterator, Tuple
+
+try:
+    import zstandard
+except ImportError:  # optional, only needed for zstd bundles
+    zstandard = None
+
+from ParseSchedules.serialization import write_atomically
+
+MAGIC = b"PSBNDL01"
+_HEADER = struct.Struct("<8sI")
+
+GROUPS = "groups"
+TEACHERS = "teachers"
+
+codecs = ["gzip", "zstd"]
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == "gzip":
+        # mtime=0 keeps the bundle byte-identical between runs
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if codec == "zstd":
+        if zstandard is None:
+            raise ImportError("zstd bundles need the zstandard package: pip install zstandard")
+        return zstandard.ZstdCompressor(level=19).compress(data)
+    raise ValueError(f"Unknown codec: {codec}")
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "gzip":
+        return gzip.decompress(data)
+    if codec == "zstd":
+        if zstandard is None:
+            raise ImportError("zstd bundles need the zstandard package: pip install zstandard")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unknown codec: {codec}")
+
+
+def iter_schedule_files(path: str) -> "Iterator[Tuple[str, bytes]]":
+    """
+    Reads raw schedule files from the directory and all subdirectories, in a stable order.
+
+    Yields:
+        tuple[str, bytes]: The schedule name (file name without extension) and the file contents.
+    """
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for file in sorted(files):
+            if file.endswith(".json"):
+                with open(os.path.join(root, file), "rb") as f:
+                    yield os.path.splitext(file)[0], f.read()
+
+
+def write_bundle(path: str, schedules: "dict[str, dict[str, bytes]]", codec: str = "gzip") -> int:
+    """
+    Writes schedules into a bundle.
+
+    Args:
+        path (str): Path of the bundle.
+        schedules (dict[str, dict[str, bytes]]): Kind ("groups" or "teachers") -> name -> JSON of the schedule.
+        codec (str): "gzip" or "zstd".
+
+    Returns:
+        int: Size of the bundle in bytes.
+    """
+    entries = []
+    for kind, named_schedules in schedules.items():
+        for name, data in named_schedules.items():
+            entries.append((f"{kind}/{name}", compress(data, codec)))
+
+    # offsets depend on the size of the index, which depends on the offsets.
+    # compute the index with placeholder offsets first, then grow until the digits fit
+    index_size = 0
+    while True:
+        offset = _HEADER.size + index_size
+        index = {"codec": codec, "entries": {}}
+        for key, blob in entries:
+            index["entries"][key] = [offset, len(blob)]
+            offset += len(blob)
+
+        index_bytes = json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        if len(index_bytes) <= index_size:
+            break
+        index_size = len(index_bytes)
+
+    # pad the index with spaces so it is exactly index_size bytes long
+    index_bytes = index_bytes.ljust(index_size, b" ")
+
+    data = b"".join([_HEADER.pack(MAGIC, index_size), index_bytes] + [blob for _, blob in entries])
+    write_atomically(path, data)
+
+    return len(data)
+
+
+def build_bundle(
+    path: str,
+    path_to_student_schedules: str = "output_json",
+    path_to_teacher_schedules: str = "teachers_output_json",
+    codec: str = "gzip",
+) -> int:
+    """
+    Packs the group schedules and teacher schedules produced by the parser into a bundle.
+
+    Returns:
+        int: Size of the bundle in bytes.
+    """
+    schedules = {GROUPS: dict(iter_schedule_files(path_to_student_schedules))}
+    if os.path.isdir(path_to_teacher_schedules):
+        schedules[TEACHERS] = dict(iter_schedule_files(path_to_teacher_schedules))
+
+    return write_bundle(path, schedules, codec)
+
+
+def read_index(buffer) -> dict:
+    """
+    Reads the index of a bundle from its first bytes.
+
+    Args:
+        buffer: The bundle, or at least its header and index (bytes, mmap, ...).
+
+    Returns:
+        dict: {"codec": ..., "entries": {"<kind>/<name>": [offset, length]}}
+    """
+    magic, index_size = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a schedule bundle")
+
+    return json.loads(bytes(buffer[_HEADER.size:_HEADER.size + index_size]))
+
+
+def load_schedule(bundle: str, name: str, kind: str = GROUPS) -> dict:
+    """
+    Loads a single schedule from a bundle. The bundle is memory-mapped
+    and only the requested entry is decompressed and parsed.
+
+    Args:
+        bundle (str): Path to the bundle.
+        name (str): Group name (or teacher name, with kind="teachers").
+        kind (str): "groups" or "teachers".
+
+    Returns:
+        dict: The schedule.
+    """
+    with open(bundle, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            index = read_index(buffer)
+
+            key = f"{kind}/{name}"
+            if key not in index["entries"]:
+                raise KeyError(f"{key} is not in the bundle")
+
+            offset, length = index["entries"][key]
+            data = decompress(buffer[offset:offset + length], index["codec"])
+
+    return json.loads(data)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument(
+        "-s",
+        "--student_schedules",
+        default="./output_json",
+        help="Path to group schedules produced by parse_schedules",
+    )
+    ap.add_argument(
+        "-t",
+        "--teacher_schedules",
+        default="./teachers_output_json",
+        help="Path to teacher schedules produced by extract_teacher_schedules",
+    )
+    ap.add_argument(
+        "-o",
+        "--output",
+        default="./schedules.bundle",
+        help="Path of the bundle",
+    )
+    ap.add_argument(
+        "-c",
+        "--codec",
+        choices=codecs,
+        default="gzip",
+        help="Compression of the entries. zstd needs the zstandard package. Default is gzip",
+    )
+    args = vars(ap.parse_args())
+
+    size = build_bundle(args["output"], args["student_schedules"], args["teacher_schedules"], args["codec"])
+
+    print(f"[INFO] Bundle saved to {args['output']}, {size:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+from typing import List
+
+import pandas as pd
+
+DEFAULT_CACHE_PATH = ".schedules_cache.json"
+
+# modules whose code decides what ends up in output_json
+_parser_modules = ["core.py", "docx_reader.py", "tokenizer.py", "utilities.py", "models.py", "serialization.py"]
+
+
+def file_sha256(path: str) -> str:
+    """
+    Computes the SHA-256 digest of a file, reading it in chunks.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        str: Hex digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parser_fingerprint(reader: str, output_format: str = "pretty") -> str:
+    """
+    Fingerprints everything besides the document itself that affects the parsed output:
+    the parser source code, the table reader, the output format and the pandas version.
+
+    Args:
+        reader (str): Name of the table reader.
+        output_format (str): Format of the saved JSON.
+
+    Returns:
+        str: Hex digest identifying the parser version.
+    """
+    digest = hashlib.sha256()
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for module in _parser_modules:
+        with open(os.path.join(package_dir, module), "rb") as f:
+            digest.update(f.read())
+    digest.update(reader.encode())
+    digest.update(output_format.encode())
+    digest.update(pd.__version__.encode())
+    return digest.hexdigest()
+
+
+class ScheduleCache:
+    """
+    Persistent map of .docx file -> (content hash, parser fingerprint, groups it produced).
+    Used to skip documents that haven't changed since the last run.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, output_dir: str = "output_json"):
+        self.path = path
+        self.output_dir = output_dir
+        self.entries: "dict[str, dict]" = {}
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    @staticmethod
+    def key(doc_schedule: str) -> str:
+        return os.path.abspath(doc_schedule)
+
+    def output_path(self, group: str) -> str:
+        return os.path.join(self.output_dir, f"{group}.json")
+
+    def is_fresh(self, doc_schedule: str, sha256: str, fingerprint: str) -> bool:
+        """
+        Checks whether the document is unchanged and all of its outputs are still in place.
+        """
+        entry = self.entries.get(self.key(doc_schedule))
+
+        if entry is None:
+            return False
+
+        if entry["sha256"] != sha256 or entry["fingerprint"] != fingerprint:
+            return False
+
+        return all(os.path.exists(self.output_path(group)) for group in entry["groups"])
+
+    def groups_of(self, doc_schedule: str) -> "List[str]":
+        entry = self.entries.get(self.key(doc_schedule))
+        return [] if entry is None else entry["groups"]
+
+    def update(self, doc_schedule: str, sha256: str, fingerprint: str, groups: "List[str]") -> "List[str]":
+        """
+        Records the groups a document produced.
+        Removes outputs the document produced before, but doesn't produce anymore,
+        unless some other document still produces them.
+
+        Returns:
+            list[str]: The groups whose outputs were removed.
+        """
+        key = self.key(doc_schedule)
+        previous_groups = self.groups_of(doc_schedule)
+
+        self.entries[key] = {
+            "sha256": sha256,
+            "fingerprint": fingerprint,
+            "groups": list(groups),
+        }
+
+        groups_of_other_documents = {
+            group
+            for other_key, entry in self.entries.items()
+            if other_key != key
+            for group in entry["groups"]
+        }
+
+        removed_groups = []
+        for group in previous_groups:
+            if group in groups or group in groups_of_other_documents:
+                continue
+
+            if os.path.exists(self.output_path(group)):
+                os.remove(self.output_path(group))
+            removed_groups.append(group)
+
+        return removed_groups
+
+    def prune(self, doc_schedules: "List[str]") -> "List[str]":
+        """
+        Forgets the documents that aren't among doc_schedules anymore, e.g. deleted ones, and removes their outputs,
+        unless some other document still produces them. Such a shared output may hold the schedule of the forgotten
+        document, so the documents producing it are marked to be parsed again.
+
+        Returns:
+            list[str]: The groups whose outputs were removed.
+        """
+        keys = {self.key(doc_schedule) for doc_schedule in doc_schedules}
+        forgotten = [self.entries.pop(key) for key in list(self.entries) if key not in keys]
+
+        removed_groups = []
+        for group in dict.fromkeys(group for entry in forgotten for group in entry["groups"]):
+            producers = [entry for entry in self.entries.values() if group in entry["groups"]]
+            for entry in producers:
+                entry["sha256"] = None
+
+            if not producers:
+                if os.path.exists(self.output_path(group)):
+                    os.remove(self.output_path(group))
+                removed_groups.append(group)
+
+        return removed_groups
+
+    def save(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=4, ensure_ascii=False)
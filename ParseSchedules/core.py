@@ -1,29 +1,47 @@
+import io
 import logging
+import multiprocessing
 import os
-from typing import List
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
-import json
-from pydocx import PyDocX
 
 from progress.bar import IncrementalBar
 
-from ParseSchedules.models import Lesson, WeeklySchedule
+from ParseSchedules.cache import ScheduleCache, file_sha256, parser_fingerprint
+from ParseSchedules.docx_reader import readers, table_readers
+from ParseSchedules.models import DaySchedule, Lesson, WeeklySchedule
+from ParseSchedules import profiling
+from ParseSchedules.profiling import profiler
+from ParseSchedules.serialization import JsonWriter
+from ParseSchedules.tokenizer import tokenize_lessons
 
 from ParseSchedules.utilities import (
-    correct_spelling,
-    remove_duplicates,
     strip_each_text_cell,
-    label_upper_and_lower_duplicates,
-    qualifications,
-)
-from ParseSchedules.utilities import (
     days_ukr,
     days_eng_lower,
     extract_group_names,
     correct_group_names,
+    SpellingCorrector,
 )
 
-def extract_single_schedule(df: pd.DataFrame, target_group: str):
+day_corrector = SpellingCorrector(days_ukr)
+
+# a path to a .docx file, its contents or a binary file-like object with them
+DocumentSource = Union[str, bytes, BinaryIO]
+
+DEFAULT_OUTPUT_DIRECTORY = "output_json"
+
+
+def extract_single_schedule(
+    df: pd.DataFrame,
+    target_group: str,
+    writer: Optional[JsonWriter] = None,
+    directory: str = DEFAULT_OUTPUT_DIRECTORY,
+) -> WeeklySchedule:
     """
     Extracts a single schedule from a DataFrame based on the target group.
     Saves it to a separate file, the name of which is target_group.json
@@ -31,123 +49,291 @@ def extract_single_schedule(df: pd.DataFrame, target_group: str):
     Args:
         df (pandas.DataFrame): The DataFrame containing the schedule data.
         target_group (str): The target group to filter the schedule for.
+        writer (JsonWriter, optional): Serializes and writes the file. Pretty JSON by default.
+        directory (str): Where the file is saved. output_json, relative to the working directory, by default.
 
     Returns:
-        None
+        WeeklySchedule: The saved schedule.
     """
+    schedule = build_schedule(df, target_group)
+    save_schedule(target_group, schedule, writer or JsonWriter(), directory)
+    return schedule
 
-    # filter groups to target group
-    df = df.loc[:, ["День", "Пара", target_group]]
 
-    # assumption: room number is always in the beginning of class description. May end with a slash and a number
-    re_for_room_number = r"\b(\w\. ?\d{1,5}\w{0,5}(/\d)*)\b"
-    # TODO: unhardcode
-    df["Аудиторія"] = (
-        df[target_group]
-        .str.extractall(re_for_room_number)
-        .groupby(level=0)[0]
-        .apply(lambda x: "|".join(x))
-    )  # extract
-    df[target_group] = df[target_group].str.replace(re_for_room_number, "")  # remove
-
-    # extract teacher qualifications into own column
-    teacherQualRE = "(" + "|".join(qualifications) + ")"
-    # The groupby() method is then used to group the matches by their original index (i.e., the index of the row in the original DataFrame),
-    # and the apply() method is used to concatenate the grouped matches into a single string using the join() method.
-    df["qualification"] = (
-        df[target_group]
-        .str.extractall(teacherQualRE)
-        .groupby(level=0)[0]
-        .apply(lambda x: "|".join(x))
-    )
+def save_schedule(target_group: str, schedule: WeeklySchedule, writer: JsonWriter, directory: str = DEFAULT_OUTPUT_DIRECTORY):
+    """
+    Serializes a schedule and saves it to directory/target_group.json
 
-    # extract teacher name into own column. Use qualification column as a separator
-    # teacher namee is their qualification in lower case, followed by a dot, followed by their name, first letter capitalized.
-    # then, optionally, a space and single uppercase letter (for name)
-
-    # warning: [А-Я] doesn't include some of ukrainian letters
-    teacherRe = rf"{teacherQualRE} ([А-ЩЬЮЯҐЄІЇ][а-щьюяґєії]+( [А-ЩЬЮЯҐЄІЇ]\.)*)"
-    # df['teacher'] = df[target_group].str.split(teacherQualRE).str[2]
-    df["teacher"] = (
-        df[target_group]
-        .str.extractall(teacherRe)
-        .groupby(level=0)[1]
-        .apply(lambda x: "|".join(x))
-    )
+    Args:
+        target_group (str): The group the schedule belongs to.
+        schedule (WeeklySchedule): The schedule.
+        writer (JsonWriter): Serializes and writes the file.
+        directory (str): Where the file is saved.
+    """
+    with profiler.stage("write_json", group=target_group):
+        writer.write(schedule_output_path(target_group, directory), schedule)
+    report_saved_schedule(target_group, directory)
 
-    # clean up class description column:
-    # subtract qualification, then teacher name from the class description column
-    df[target_group] = df[target_group].str.replace(teacherQualRE, "")
-    df[target_group] = df[target_group].str.replace(
-        "|".join(df["teacher"].dropna()), ""
-    )
+
+def schedule_output_path(target_group: str, directory: str = DEFAULT_OUTPUT_DIRECTORY) -> str:
+    return f"{directory}/{target_group}.json"
+
+
+def report_saved_schedule(target_group: str, directory: str = DEFAULT_OUTPUT_DIRECTORY):
+    print(f"[INFO] {target_group}.json saved to {schedule_output_path(target_group, directory)}")
+
+
+def build_schedule(df: pd.DataFrame, target_group: str) -> WeeklySchedule:
+    """
+    Extracts a single schedule from a DataFrame based on the target group
+    without touching the filesystem.
+
+    Args:
+        df (pandas.DataFrame): The DataFrame containing the schedule data.
+        target_group (str): The target group to filter the schedule for.
+
+    Returns:
+        WeeklySchedule: The schedule of the target group.
+    """
+
+    # filter groups to target group
+    df = df.loc[:, ["День", "Пара", target_group]]
+
+    # split each lesson cell into room, teacher qualification, teacher name and the cleaned up lesson name
+    with profiler.stage("tokenize", group=target_group):
+        tokens = tokenize_lessons(df[target_group])
+        df["Аудиторія"] = tokens["room"]
+        df["qualification"] = tokens["qualification"]
+        df["teacher"] = tokens["teacher"]
+        df[target_group] = tokens["name"]
 
     # rename columns
     replacement_table = {"Аудиторія": "room", "Пара": "index"}
     replacement_table[target_group] = "name"
     df.rename(columns=replacement_table, inplace=True)
 
-    df = strip_each_text_cell(df)
+    with profiler.stage("strip", group=target_group):
+        df = strip_each_text_cell(df)
 
-    # --- process the table [end] ---
-    # chunk into df by each day
+    with profiler.stage("schedule_from_frame", group=target_group):
+        schedule = schedule_from_frame(df)
+    logging.info(df)
 
-    dfs_per_day = [df[df["День"] == day] for day in days_ukr]
+    return schedule
 
-    def df_to_json():
-        """
-        Converts a DataFrame to a JSON object. Saves the JSON object to a file.
-        """
-        json_: WeeklySchedule = {}
-        for day, day_df in zip(days_eng_lower, dfs_per_day):
-            if day_df.empty:
-                json_[day] = []
-                continue
-
-            label_upper_and_lower_duplicates(day_df)
-
-            # TODO: unhardcode
-            # drop rows if they don't have any data in name column
-            day_df.dropna(subset=[df.columns[2]], inplace=True)
-
-            # drop duplicates
-            day_df = remove_duplicates(day_df)
-
-            # TODO: unhardcode
-            # drop rows if they don't have any meaningful data in class name column
-            day_df = day_df[day_df["name"].str.startswith("---") != True]
-
-            day_df = day_df.drop(["День"], axis=1)
-            # TODO: Annotate
-            classes: list[Lesson] = [
-                Lesson(**lesson_dict)
-                for lesson_dict in json.loads(
-                    day_df.to_json(orient="records", force_ascii=False)
-                )
-            ]
-            
-            # mark classes as biweekly and assign week number
-            for class_ in classes:
-                if not class_.label is None:
-                    class_.isBiweekly = True
-                    class_.week = int(class_.label)
 
-            json_[day] = {"classes": classes}
+def build_document_schedules(df: pd.DataFrame, group_names: "List[str]") -> "dict[str, WeeklySchedule]":
+    """
+    Extracts the schedules of all groups of a document at once.
+    The table is melted to long form (day, pair, group, cell) and only the unique cell texts are tokenized,
+    so lectures shared by several groups (merged cells) are processed once.
+    Gives the same result as build_schedule for each group.
+
+    Args:
+        df (pandas.DataFrame): The preprocessed table of the document.
+        group_names (list[str]): The group columns of the table.
+
+    Returns:
+        dict[str, WeeklySchedule]: Group name -> the schedule of the group.
+    """
+    return build_tables_schedules([(df, group_names)])
+
+
+def build_tables_schedules(tables: "List[Tuple[pd.DataFrame, List[str]]]") -> "dict[str, WeeklySchedule]":
+    """
+    Extracts the schedules of all groups of all tables of a document, in a single pass over their rows.
+    A group found in several tables (e.g. one table per week) gets the schedule from the last of them,
+    as if the tables were separate documents.
+
+    Args:
+        tables (list[tuple[pandas.DataFrame, list[str]]]): The preprocessed tables and their group columns.
+
+    Returns:
+        dict[str, WeeklySchedule]: Group name -> the schedule of the group.
+    """
+    frames = []
+    codes = []
+    groups = []
+    for df, group_names in tables:
+        if len(group_names) == 0:
+            continue
+
+        long_df, group_column = document_lessons_frame(df, group_names)
+        table_codes, table_groups = pd.factorize(group_column)
+
+        frames.append(long_df)
+        # groups of different tables are kept apart, even if they have the same name
+        codes.append(table_codes + len(groups))
+        groups.extend(table_groups)
+
+    if len(frames) == 0:
+        return {}
+
+    if len({frame["index"].dtype for frame in frames}) > 1:
+        # e.g. one table has a pair without a number and its index became float. Keep the numbers of the other tables as they are
+        frames = [frame.astype({"index": object}) for frame in frames]
+    long_df = frames[0] if len(frames) == 1 else pd.concat(frames)
+
+    # label, dedupe and split all groups in one pass. Rows of each group keep the order of the table
+    with profiler.stage("schedules_from_frame"):
+        group_schedules = schedules_from_frame(long_df, np.concatenate(codes).astype(np.intp), len(groups))
+
+    schedules = {}
+    for group, schedule in zip(groups, group_schedules):
+        if group in schedules:
+            logging.warning(f"{group} is in more than one table, the last one is used")
+        schedules[group] = schedule
+    return schedules
+
+
+def document_lessons_frame(df: pd.DataFrame, group_names: "List[str]") -> "tuple[pd.DataFrame, np.ndarray]":
+    """
+    Melts the table of a document to one row per day, pair and group and tokenizes the cells.
+
+    Args:
+        df (pandas.DataFrame): The preprocessed table of the document.
+        group_names (list[str]): The group columns of the table.
 
-        # write json to file
-        dfs_per_day_json_string = json.dumps(
-            json_, indent=4, default=lambda obj: obj.__dict__, ensure_ascii=False
+    Returns:
+        tuple[pandas.DataFrame, numpy.ndarray]: Columns "День", index, name, room, qualification and teacher,
+        grouped by group and in table order within a group; and the group of each row.
+    """
+    with profiler.stage("melt"):
+        long_df = df.melt(
+            id_vars=["День", "Пара"],
+            value_vars=group_names,
+            var_name="group",
+            value_name="cell",
+            ignore_index=False,
         )
-        with open(
-            f"output_json/{target_group}.json",
-            "w",
-            encoding="utf-8",
-        ) as f:
-            f.write(dfs_per_day_json_string)
-            print(f"[INFO] {target_group}.json saved to output_json/{target_group}.json")
-
-    df_to_json()
-    logging.info(df)
+
+    # tokenize each distinct cell text once. Empty cells get code -1,
+    # which picks the all-NaN row appended to the end of the tokens
+    with profiler.stage("tokenize"):
+        codes, cells = pd.factorize(long_df["cell"])
+        tokens = strip_each_text_cell(tokenize_lessons(pd.Series(cells, dtype=object)))
+        tokens.loc[len(tokens)] = np.nan
+        tokens = tokens.take(codes)
+
+    with profiler.stage("strip"):
+        days_and_pairs = strip_each_text_cell(long_df[["День", "Пара"]].copy())
+
+    group_column = long_df["group"].to_numpy()
+
+    long_df = pd.DataFrame(
+        {
+            "День": days_and_pairs["День"],
+            "index": days_and_pairs["Пара"],
+            "name": tokens["name"].to_numpy(),
+            "room": tokens["room"].to_numpy(),
+            "qualification": tokens["qualification"].to_numpy(),
+            "teacher": tokens["teacher"].to_numpy(),
+        },
+        index=long_df.index,
+    )
+    logging.info(long_df)
+
+    return long_df, group_column
+
+
+def schedule_from_frame(df: pd.DataFrame) -> WeeklySchedule:
+    """
+    Splits the schedule of a single group by day, labels biweekly classes, drops empty and duplicate classes
+    and converts the schedule to lessons.
+
+    Args:
+        df (pandas.DataFrame): The schedule of a group, with columns "День", index, name, room, qualification and teacher.
+
+    Returns:
+        WeeklySchedule: The schedule, day -> classes of the day.
+    """
+    return schedules_from_frame(df, np.zeros(len(df), dtype=np.intp), 1)[0]
+
+
+def schedules_from_frame(df: pd.DataFrame, group_codes: np.ndarray, n_groups: int) -> "List[WeeklySchedule]":
+    """
+    Does what schedule_from_frame does for the rows of many groups at once, in a single pass over the table
+    instead of one pass (and one copy) per group and day.
+
+    Within each group and day:
+    - rows sharing a pair index are biweekly and get labels 1 and 2, alternating in table order
+    - rows without a name are dropped
+    - rows with the same index, name and room are duplicates, only the last one is kept and its label is cleared.
+      Rows without a room are all duplicates of each other (their old "index + name + room" signature was NaN)
+    - rows whose name starts with "---" are dropped
+
+    Args:
+        df (pandas.DataFrame): Columns "День", index, name, room, qualification and teacher. Rows in table order.
+        group_codes (numpy.ndarray): The group of each row, 0 to n_groups - 1.
+        n_groups (int): Number of groups.
+
+    Returns:
+        list[WeeklySchedule]: The schedule of each group, by group code.
+    """
+    with profiler.stage("split_days"):
+        day_codes = pd.Categorical(df["День"], categories=days_ukr).codes.astype(np.intp)
+
+        # days a group has no rows for at all are saved as empty lists
+        in_week = day_codes >= 0
+        has_day = np.zeros((n_groups, len(days_ukr)), dtype=bool)
+        has_day[group_codes[in_week], day_codes[in_week]] = True
+
+        group_codes = group_codes[in_week]
+        day_codes = day_codes[in_week]
+        columns = {column: df[column].to_numpy()[in_week] for column in ["index", "name", "room", "qualification", "teacher"]}
+
+    with profiler.stage("label_biweekly"):
+        pairs = pd.DataFrame({"group": group_codes, "day": day_codes, "index": columns["index"]})
+        biweekly = pairs.duplicated(keep=False).to_numpy()
+
+        # rank of each biweekly row among the biweekly rows of its day: 1, 2, 1, 2...
+        rank = pairs[biweekly].groupby(["group", "day"], sort=False).cumcount().to_numpy()
+        label = np.full(len(pairs), np.nan)
+        label[biweekly] = np.where(rank % 2 == 0, 1.0, 2.0)
+
+    with profiler.stage("drop_empty_and_duplicates"):
+        # drop rows if they don't have any data in name column
+        named = np.flatnonzero(pd.notna(columns["name"]))
+
+        no_room = pd.isna(columns["room"][named])
+        signatures = pd.DataFrame(
+            {
+                "group": group_codes[named],
+                "day": day_codes[named],
+                "index": np.where(no_room, None, columns["index"][named]),
+                "name": np.where(no_room, None, columns["name"][named]),
+                "room": columns["room"][named],
+            }
+        )
+
+        # remove biweekly label from kept instance of duplicate, keep the last instance of each duplicate
+        label[named[signatures.duplicated(keep="first").to_numpy()]] = np.nan
+        kept = named[~signatures.duplicated(keep="last").to_numpy()]
+
+        # TODO: unhardcode
+        # drop rows if they don't have any meaningful data in class name column
+        kept = kept[pd.Series(columns["name"][kept], dtype=object).str.startswith("---").to_numpy() != True]
+
+    with profiler.stage("to_lessons"):
+        lessons_df = pd.DataFrame({column: values[kept] for column, values in columns.items()})
+        lessons_df["label"] = label[kept]
+
+        classes = [[[] for _ in days_ukr] for _ in range(n_groups)]
+        for class_, group, day in zip(Lesson.from_records(lessons_df), group_codes[kept].tolist(), day_codes[kept].tolist()):
+            # mark classes as biweekly and assign week number
+            if not class_.label is None:
+                class_.isBiweekly = True
+                class_.week = int(class_.label)
+            classes[group][day].append(class_)
+
+    schedules = []
+    for group in range(n_groups):
+        json_: WeeklySchedule = {}
+        for day, day_name in enumerate(days_eng_lower):
+            json_[day_name] = DaySchedule(classes[group][day]) if has_day[group, day] else []
+        schedules.append(json_)
+
+    return schedules
 
 
 def preprocess_table(df: pd.DataFrame):
@@ -170,54 +356,355 @@ def preprocess_table(df: pd.DataFrame):
     df["День"] = df["День"].map(lambda day: day[::-1] if day[-1].isupper() else day)
     
     # fix day misspellings
-    df["День"] = df["День"].map(lambda day: correct_spelling(day, days_ukr))    
+    df["День"] = df["День"].map(day_corrector)
     
     return df
 
 
-def extract_all_schedules(
-    paths_to_doc_schedules: 'List[str]',
-    group_into_folders: bool,
-    group_size: int):
+def read_schedule_tables(doc_schedule: str, reader: str, source=None):
+    """
+    Reads every schedule table of a .docx file in one conversion, preprocesses them and finds the groups in each.
 
-    bar = IncrementalBar("Parsing schedules...", max=len(paths_to_doc_schedules))
+    Args:
+        doc_schedule (str): Path to the .docx file.
+        reader (str): Name of the table reader to use, see docx_reader.table_readers.
+        source (optional): A binary file-like object with the contents of the file, if it was already read.
+
+    Returns:
+        tuple[list[tuple[pandas.DataFrame, list[str]]], float]: The preprocessed tables with their group names
+        and the time in seconds it took to read the tables.
+    """
+    started_at = time.perf_counter()
+    with profiler.stage("read_table"):
+        dfs = table_readers[reader](doc_schedule if source is None else source)
+    read_time = time.perf_counter() - started_at
+
+    tables = []
+    for df in dfs:
+        with profiler.stage("preprocess_table"):
+            df = preprocess_table(df)
 
-    for doc_schedule in paths_to_doc_schedules:
-        print("[INFO] Parsing", doc_schedule)
-        path_to_html = doc_schedule
+        with profiler.stage("extract_group_names"):
+            tables.append((df, extract_group_names(df)))
+
+    return tables, read_time
+
+
+def read_schedule_document(doc_schedule: str, reader: str, source=None):
+    """
+    Reads the first schedule table from a .docx file, preprocesses it and finds the groups in it.
+
+    Args:
+        doc_schedule (str): Path to the .docx file.
+        reader (str): Name of the table reader to use, see docx_reader.readers.
+        source (optional): A binary file-like object with the contents of the file, if it was already read.
 
-        # Pass in a path
-        html = PyDocX.to_html(path_to_html)
+    Returns:
+        tuple[pandas.DataFrame, list[str], float]: The preprocessed table, the group names
+        and the time in seconds it took to read the table.
+    """
+    started_at = time.perf_counter()
+    with profiler.stage("read_table"):
+        df = readers[reader](doc_schedule if source is None else source)
+    read_time = time.perf_counter() - started_at
 
-        df = pd.read_html(html, header=0)[0]
+    with profiler.stage("preprocess_table"):
         df = preprocess_table(df)
 
+    with profiler.stage("extract_group_names"):
         group_names = extract_group_names(df)
-        
-        print("[INFO] Found groups:", group_names)
-        
-        if len(group_names) == 0:
-            raise ValueError("No groups found.")
 
+    return df, group_names, read_time
+
+
+def parse_schedule_document(doc_schedule: str, reader: str, source=None):
+    """
+    Reads a .docx file and extracts the schedules of all groups of all its schedule tables.
+
+    Args:
+        doc_schedule (str): Path to the .docx file.
+        reader (str): Name of the table reader to use, see docx_reader.table_readers.
+        source (optional): A binary file-like object with the contents of the file, if it was already read.
+
+    Returns:
+        tuple[list[str], float, dict[str, WeeklySchedule]]: The group names, the time in seconds it took to read the tables
+        and the schedule of each group.
+    """
+    with profiler.stage("parse", document=doc_schedule):
+        tables, read_time = read_schedule_tables(doc_schedule, reader, source)
+
+        with profiler.stage("build_schedules"):
+            schedules = build_tables_schedules(tables)
+
+    # groups of all tables, in document order
+    group_names = list(dict.fromkeys(group for _, table_groups in tables for group in table_groups))
+    return group_names, read_time, schedules
+
+
+def open_document(document: DocumentSource, position: int = 0) -> "Tuple[str, Optional[BinaryIO]]":
+    """
+    Gives a name to a document and the source to read it from: None for a path, which the reader opens itself.
+    Bytes are wrapped into a file-like object. Unnamed documents are called "<document N>", N being position.
+    """
+    if isinstance(document, (str, os.PathLike)):
+        return os.fspath(document), None
+
+    if isinstance(document, (bytes, bytearray, memoryview)):
+        return f"<document {position}>", io.BytesIO(document)
+
+    name = getattr(document, "name", None)
+    if not isinstance(name, str):
+        name = f"<document {position}>"
+
+    # .docx files are zip archives, which are read from the end. Pipes, e.g. stdin, can't seek
+    if not document.seekable():
+        document = io.BytesIO(document.read())
+    return name, document
+
+
+def iter_documents(documents: "Iterable[DocumentSource]", reader: str = "native"):
+    """
+    Parses documents one at a time, as they are asked for. Only the schedules of the current document are kept,
+    and documents is only iterated as far as the caller gets, so it can be a generator too.
+
+    Args:
+        documents (Iterable[str | bytes | BinaryIO]): Paths to .docx files, their contents or binary file-like objects.
+        reader (str): Name of the table reader to use, see docx_reader.table_readers.
+
+    Yields:
+        tuple[str, list[str], float, dict[str, WeeklySchedule]]: The name of the document (its path), its group names,
+        the time in seconds it took to read the tables and the schedule of each group.
+    """
+    for position, document in enumerate(documents):
+        name, source = open_document(document, position)
+        yield (name, *parse_schedule_document(name, reader, source))
+
+
+def iter_schedules(documents: "Iterable[DocumentSource]", reader: str = "native") -> "Iterator[Tuple[str, WeeklySchedule]]":
+    """
+    Parses documents lazily, without touching the filesystem (besides reading the documents given by path).
+    A group found in several documents is yielded once per document, the way extract_all_schedules
+    overwrites its file.
+
+    Args:
+        documents (Iterable[str | bytes | BinaryIO]): Paths to .docx files, their contents or binary file-like objects.
+        reader (str): Name of the table reader to use, see docx_reader.table_readers.
+
+    Yields:
+        tuple[str, WeeklySchedule]: Group name and its schedule, in document order.
+    """
+    for _, group_names, _, schedules in iter_documents(documents, reader):
         for group in group_names:
-            extract_single_schedule(df, group)
+            yield group, schedules[group]
+
+
+def schedule_lessons(schedule: WeeklySchedule) -> "Iterator[Tuple[str, Lesson]]":
+    """
+    Yields the day and the lesson of every class of a schedule, day by day.
+    """
+    for day in days_eng_lower:
+        # days without classes are empty lists
+        day_schedule = schedule.get(day)
+        if day_schedule:
+            for lesson in day_schedule.classes:
+                yield day, lesson
+
+
+def iter_lessons(documents: "Iterable[DocumentSource]", reader: str = "native") -> "Iterator[Tuple[str, str, Lesson]]":
+    """
+    Same as iter_schedules, flattened to one record per lesson.
+
+    Yields:
+        tuple[str, str, Lesson]: Group name, day (e.g. "monday") and the lesson.
+    """
+    for group, schedule in iter_schedules(documents, reader):
+        for day, lesson in schedule_lessons(schedule):
+            yield group, day, lesson
+
+
+def _parse_in_worker(doc_schedule: str, reader: str):
+    # the stage timings and the day corrections of a worker process are sent back along with the result
+    return parse_schedule_document(doc_schedule, reader), profiler.take_records(), day_corrector.take_stats()
+
+
+def _parse_bytes_in_worker(doc_schedule: str, data: bytes, reader: str):
+    document = parse_schedule_document(doc_schedule, reader, io.BytesIO(data))
+
+    # a parser thread of the main process records straight into its profiler and corrector
+    if multiprocessing.parent_process() is None:
+        return document, [], None
+    return document, profiler.take_records(), day_corrector.take_stats()
+
+
+def report_schedule_document(doc_schedule: str, reader: str, group_names: "List[str]", read_time: float):
+    print("[INFO] Parsing", doc_schedule)
+    print(f"[INFO] Read table with {reader} reader in {read_time:.3f}s")
+    print("[INFO] Found groups:", group_names)
+
+    if len(group_names) == 0:
+        raise ValueError("No groups found.")
+
+
+def find_doc_schedules(path_to_doc_schedules: str) -> "List[str]":
+    """
+    Lists the .docx files with schedules in a directory, skipping the lock files of documents opened in Word.
+
+    Args:
+        path_to_doc_schedules (str): Directory with .docx files.
+
+    Returns:
+        list[str]: Paths to the .docx files.
+    """
+    doc_schedules = os.listdir(path_to_doc_schedules)
+
+    # filter out non-word documents
+    doc_schedules = [doc for doc in doc_schedules if doc.endswith(".docx")]
+
+    # filter out opened word documents
+    doc_schedules = [doc for doc in doc_schedules if not doc.startswith("~$")]
+
+    # create full paths
+    return [os.path.join(path_to_doc_schedules, doc) for doc in doc_schedules]
+
+
+def extract_all_schedules(
+    paths_to_doc_schedules: 'List[str]',
+    reader: str = "native",
+    jobs: int = 1,
+    cache_path: Optional[str] = None,
+    force: bool = False,
+    output_format: str = "pretty",
+    io_concurrency: int = 0):
+
+    bar = IncrementalBar("Parsing schedules...", max=len(paths_to_doc_schedules))
+
+    # the corrections of this run only, e.g. in --watch mode
+    day_corrector.reset_stats()
+
+    read_timings: "dict[str, float]" = {}
+
+    # groups whose output was written or removed in this run
+    updated_groups: "List[str]" = []
+
+    # skip documents that haven't changed since the last run
+    cache = ScheduleCache(cache_path) if cache_path is not None else None
+    if cache is not None:
+        fingerprint = parser_fingerprint(reader, output_format)
+        digests = {doc: file_sha256(doc) for doc in paths_to_doc_schedules}
+
+        # documents that were deleted or moved away
+        removed_groups = cache.prune(paths_to_doc_schedules)
+        if removed_groups:
+            print("[INFO] Removed outputs of documents that are gone:", removed_groups)
+            updated_groups.extend(removed_groups)
+            cache.save()
+
+    docs_to_parse: "List[str]" = paths_to_doc_schedules
+    if cache is not None and not force:
+        docs_to_parse = [
+            doc for doc in paths_to_doc_schedules
+            if not cache.is_fresh(doc, digests[doc], fingerprint)
+        ]
+
+        # documents sharing a group overwrite each other's output, so they have to be re-parsed together
+        reparsed_groups = {group for doc in docs_to_parse for group in cache.groups_of(doc)}
+        docs_to_parse = [
+            doc for doc in paths_to_doc_schedules
+            if doc in docs_to_parse or reparsed_groups.intersection(cache.groups_of(doc))
+        ]
+
+        for doc_schedule in paths_to_doc_schedules:
+            if doc_schedule not in docs_to_parse:
+                print("[INFO] Unchanged, reusing outputs of", doc_schedule, cache.groups_of(doc_schedule))
+                bar.next()
+
+    def finish_document(doc_schedule: str, group_names: "List[str]"):
+        if cache is not None:
+            removed_groups = cache.update(doc_schedule, digests[doc_schedule], fingerprint, group_names)
+            if removed_groups:
+                print("[INFO] Removed stale outputs:", removed_groups)
+            updated_groups.extend(removed_groups)
+            cache.save()
 
         bar.next()
 
-    if group_into_folders:
-        # group all the schedules into folders. Each folder should have group_size schedules
-        # (except for the last folder, which may have less than group_size schedules)
+    writer = JsonWriter(output_format)
+
+    def save_document(doc_schedule: str, group_names: "List[str]", read_time: float, schedules: "dict[str, WeeklySchedule]"):
+        read_timings[doc_schedule] = read_time
+        report_schedule_document(doc_schedule, reader, group_names, read_time)
+
+        with profiler.stage("save", document=doc_schedule):
+            for group in group_names:
+                save_schedule(group, schedules[group], writer)
+        updated_groups.extend(group_names)
+
+        finish_document(doc_schedule, group_names)
+
+    async def save_document_async(doc_schedule: str, parsed, write_files):
+        # same as save_document, with the files written by the I/O threads of the pipeline
+        (group_names, read_time, schedules), records, day_stats = parsed
+        profiler.records.extend(records)
+        if day_stats is not None:
+            day_corrector.merge_stats(day_stats)
+
+        read_timings[doc_schedule] = read_time
+        report_schedule_document(doc_schedule, reader, group_names, read_time)
+
+        with profiler.stage("save", document=doc_schedule):
+            files = []
+            for group in group_names:
+                with profiler.stage("serialize", group=group):
+                    files.append((schedule_output_path(group), writer.dumps(schedules[group])))
+
+            with profiler.stage("write_files"):
+                await write_files(files)
+
+        for group, (_, data) in zip(group_names, files):
+            writer.count_written(data)
+            report_saved_schedule(group)
+        updated_groups.extend(group_names)
+
+        finish_document(doc_schedule, group_names)
+
+    # workers profile their stages when the main process does. cProfile stays in the main process
+    initializer, initargs = (profiling.enable, (False,)) if profiler.enabled else (None, ())
+
+    if io_concurrency > 0:
+        from ParseSchedules.pipeline import Pipeline
+
+        pipeline = Pipeline(
+            partial(_parse_bytes_in_worker, reader=reader),
+            save_document_async,
+            jobs,
+            io_concurrency,
+            initializer,
+            initargs,
+        )
+        pipeline.run(docs_to_parse)
+    elif jobs == 1:
+        for doc_schedule, *document in iter_documents(docs_to_parse, reader):
+            save_document(doc_schedule, *document)
+    else:
+        # workers only read and extract. Serialization, logging and writing stay in this process
+        # and follow the order of the serial run, so the output is the same
+        with ProcessPoolExecutor(max_workers=jobs or None, initializer=initializer, initargs=initargs) as executor:
+            document_futures = [
+                executor.submit(_parse_in_worker, doc_schedule, reader)
+                for doc_schedule in docs_to_parse
+            ]
+
+            for doc_schedule, document_future in zip(docs_to_parse, document_futures):
+                document, records, day_stats = document_future.result()
+                profiler.records.extend(records)
+                day_corrector.merge_stats(day_stats)
+                save_document(doc_schedule, *document)
 
-        # get all the schedules
-        schedules = os.listdir("output_json")
+    bar.finish()
 
-        # create folders
-        for i in range(0, len(schedules), group_size):
-            # overwrite existing folders
-            os.mkdir(f"output_json/group{i//group_size}")
+    total_read_time = sum(read_timings.values())
+    print(f"[INFO] {reader} reader: {len(read_timings)} file(s) read in {total_read_time:.3f}s")
+    print(f"[INFO] Output: {writer.report()}")
+    logging.info(f"Day spelling corrections: {day_corrector.stats}")
 
-        # move schedules into folders
-        for i, schedule in enumerate(schedules):
-            os.rename(
-                f"output_json/{schedule}", f"output_json/group{i//group_size}/{schedule}"
-            )
\ No newline at end of file
+    return updated_groups
@@ -0,0 +1,390 @@
+# keeps the lessons of all groups in an indexed SQLite database, so questions like "who is in room а.311а
+# on Tuesday, pair 3", "which rooms are free" or "all lessons of a teacher" are answered by a query instead
+# of reading every file in output_json/. The database is built from the group files and kept up to date
+# incrementally: only groups whose files changed are reloaded
+#
+# python -m ParseSchedules.database [-s output_json] [-o schedules.sqlite] [-f] [--conflicts]
+
+import argparse
+import hashlib
+import json
+import sqlite3
+from typing import List, Optional
+
+from ParseSchedules.extract_teacher_schedules import iter_group_files, iter_lesson_dicts
+from ParseSchedules.models import WeeklySchedule
+from ParseSchedules.utilities import days_eng_lower
+
+DEFAULT_DATABASE_PATH = "schedules.sqlite"
+
+# bumped when the tables change. An older database is dropped and rebuilt
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS groups (
+    name TEXT PRIMARY KEY,
+    sha256 TEXT
+);
+
+CREATE TABLE IF NOT EXISTS lessons (
+    id INTEGER PRIMARY KEY,
+    group_name TEXT NOT NULL REFERENCES groups (name) ON DELETE CASCADE,
+    day TEXT NOT NULL,
+    -- 0 is monday, for sorting
+    day_number INTEGER NOT NULL,
+    -- the index of the lesson, i.e. the pair
+    pair INTEGER,
+    name TEXT,
+    room TEXT,
+    qualification TEXT,
+    teacher TEXT,
+    label REAL,
+    is_biweekly INTEGER,
+    week INTEGER
+);
+
+-- a lesson can have several teachers ("Піх|Сабат"), one row per teacher
+CREATE TABLE IF NOT EXISTS lesson_teachers (
+    lesson_id INTEGER NOT NULL REFERENCES lessons (id) ON DELETE CASCADE,
+    teacher TEXT NOT NULL
+);
+
+-- and several rooms ("а.101|а.102"), one row per room. The slot is repeated to find clashes by index
+CREATE TABLE IF NOT EXISTS lesson_rooms (
+    lesson_id INTEGER NOT NULL REFERENCES lessons (id) ON DELETE CASCADE,
+    room TEXT NOT NULL,
+    day TEXT NOT NULL,
+    pair INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS lessons_slot ON lessons (day, pair);
+CREATE INDEX IF NOT EXISTS lessons_group ON lessons (group_name);
+CREATE INDEX IF NOT EXISTS lesson_teachers_teacher ON lesson_teachers (teacher);
+CREATE INDEX IF NOT EXISTS lesson_teachers_lesson ON lesson_teachers (lesson_id);
+CREATE INDEX IF NOT EXISTS lesson_rooms_room ON lesson_rooms (room, day, pair);
+CREATE INDEX IF NOT EXISTS lesson_rooms_lesson ON lesson_rooms (lesson_id);
+"""
+
+LESSON_COLUMNS = "group_name, day, pair, name, room, qualification, teacher, label, is_biweekly, week"
+
+
+def _lesson_from_row(row: tuple) -> dict:
+    """
+    Turns a row of LESSON_COLUMNS back into a lesson dict, as in the group files plus "group" and "day".
+    """
+    group, day, pair, name, room, qualification, teacher, label, is_biweekly, week = row
+    return {
+        "group": group,
+        "day": day,
+        "index": pair,
+        "name": name,
+        "room": room,
+        "qualification": qualification,
+        "teacher": teacher,
+        "label": label,
+        "isBiweekly": None if is_biweekly is None else bool(is_biweekly),
+        "week": week,
+    }
+
+
+def _week_condition(week: Optional[int], alias: str = "") -> "tuple[str, list]":
+    # a lesson without a week happens every week
+    if week is None:
+        return "", []
+    return f" AND ({alias}week IS NULL OR {alias}week = ?)", [week]
+
+
+class ScheduleDatabase:
+    """
+    The lessons of all groups in SQLite, with indexes on (day, pair), room, teacher and group.
+
+    Args:
+        path (str): Path of the database file. Created if it doesn't exist. ":memory:" keeps it in memory.
+    """
+
+    def __init__(self, path: str = DEFAULT_DATABASE_PATH):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            self.connection.executescript(
+                "DROP TABLE IF EXISTS lesson_rooms; DROP TABLE IF EXISTS lesson_teachers; DROP TABLE IF EXISTS lessons; DROP TABLE IF EXISTS groups;"
+            )
+
+        self.connection.executescript(SCHEMA)
+        self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> "ScheduleDatabase":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def group_hashes(self) -> "dict[str, str]":
+        """
+        Returns:
+            dict[str, str]: Group -> SHA-256 of the group file it was loaded from.
+        """
+        return dict(self.connection.execute("SELECT name, sha256 FROM groups"))
+
+    def replace_group(self, group: str, schedule: WeeklySchedule, sha256: Optional[str] = None):
+        """
+        Replaces all lessons of a group. Doesn't commit, see sync_database.
+
+        Args:
+            group (str): The group name.
+            schedule (WeeklySchedule): The schedule, as read from a group file or as built by the parser.
+            sha256 (str, optional): Hash of the group file, to skip it while it doesn't change.
+        """
+        self.remove_group(group)
+        self.connection.execute("INSERT INTO groups (name, sha256) VALUES (?, ?)", (group, sha256))
+
+        for day, lesson in iter_lesson_dicts(schedule):
+            cursor = self.connection.execute(
+                "INSERT INTO lessons (group_name, day, day_number, pair, name, room, qualification, teacher, label, is_biweekly, week) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    group,
+                    day,
+                    days_eng_lower.index(day),
+                    lesson.get("index"),
+                    lesson.get("name"),
+                    lesson.get("room"),
+                    lesson.get("qualification"),
+                    lesson.get("teacher"),
+                    lesson.get("label"),
+                    lesson.get("isBiweekly"),
+                    lesson.get("week"),
+                ),
+            )
+
+            if lesson.get("teacher") is not None:
+                self.connection.executemany(
+                    "INSERT INTO lesson_teachers (lesson_id, teacher) VALUES (?, ?)",
+                    [(cursor.lastrowid, teacher) for teacher in lesson["teacher"].split("|")],
+                )
+            if lesson.get("room") is not None:
+                # a room listed twice is still taken once
+                self.connection.executemany(
+                    "INSERT INTO lesson_rooms (lesson_id, room, day, pair) VALUES (?, ?, ?, ?)",
+                    [(cursor.lastrowid, room, day, lesson.get("index")) for room in dict.fromkeys(lesson["room"].split("|"))],
+                )
+
+    def remove_group(self, group: str):
+        # lessons, their teachers and rooms go with the group
+        self.connection.execute("DELETE FROM groups WHERE name = ?", (group,))
+
+    def clear(self):
+        self.connection.execute("DELETE FROM groups")
+
+    def lessons(
+        self,
+        day: Optional[str] = None,
+        pair: Optional[int] = None,
+        room: Optional[str] = None,
+        teacher: Optional[str] = None,
+        group: Optional[str] = None,
+        week: Optional[int] = None,
+    ) -> "List[dict]":
+        """
+        Finds lessons. Every given argument narrows the search down, e.g.
+        lessons(room="а.311а", day="tuesday", pair=3) is who is in the room on Tuesday, pair 3.
+
+        Args:
+            day (str, optional): "monday" to "friday".
+            pair (int, optional): The index of the lesson.
+            room (str, optional): One of the rooms of the lesson.
+            teacher (str, optional): One of the teachers of the lesson.
+            group (str, optional): The group.
+            week (int, optional): 1 or 2. Lessons of the other week are left out, weekly ones are kept.
+
+        Returns:
+            list[dict]: Lessons as in the group files, plus "group" and "day". Sorted by day, pair and group.
+        """
+        conditions = []
+        parameters = []
+        for column, value in [("day", day), ("pair", pair), ("group_name", group)]:
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+
+        if room is not None:
+            conditions.append("id IN (SELECT lesson_id FROM lesson_rooms WHERE room = ?)")
+            parameters.append(room)
+        if teacher is not None:
+            conditions.append("id IN (SELECT lesson_id FROM lesson_teachers WHERE teacher = ?)")
+            parameters.append(teacher)
+
+        week_condition, week_parameters = _week_condition(week)
+
+        query = f"SELECT {LESSON_COLUMNS} FROM lessons WHERE {' AND '.join(conditions) or '1'}{week_condition} "
+        query += "ORDER BY day_number, pair, group_name, id"
+
+        return [_lesson_from_row(row) for row in self.connection.execute(query, parameters + week_parameters)]
+
+    def rooms(self) -> "List[str]":
+        return [room for (room,) in self.connection.execute("SELECT DISTINCT room FROM lesson_rooms ORDER BY room")]
+
+    def teachers(self) -> "List[str]":
+        return [teacher for (teacher,) in self.connection.execute("SELECT DISTINCT teacher FROM lesson_teachers ORDER BY teacher")]
+
+    def groups(self) -> "List[str]":
+        return [group for (group,) in self.connection.execute("SELECT name FROM groups ORDER BY name")]
+
+    def free_rooms(self, day: str, pair: int, week: Optional[int] = None) -> "List[str]":
+        """
+        Rooms that have lessons at some point of the week, but not on this day and pair.
+
+        Args:
+            day (str): "monday" to "friday".
+            pair (int): The index of the lesson.
+            week (int, optional): 1 or 2. Without it, a room busy on either week isn't free.
+
+        Returns:
+            list[str]: The rooms, sorted.
+        """
+        week_condition, week_parameters = _week_condition(week, "l.")
+        query = (
+            "SELECT DISTINCT room FROM lesson_rooms WHERE room NOT IN ("
+            f"SELECT r.room FROM lesson_rooms r JOIN lessons l ON l.id = r.lesson_id WHERE r.day = ? AND r.pair = ?{week_condition}"
+            ") ORDER BY room"
+        )
+        return [room for (room,) in self.connection.execute(query, [day, pair] + week_parameters)]
+
+    def room_conflicts(self, day: Optional[str] = None) -> "List[dict]":
+        """
+        Finds rooms taken by two different lessons of different groups at the same time.
+        A lecture shared by several groups (same name and teacher) isn't a conflict, neither are lessons
+        of different weeks.
+
+        Args:
+            day (str, optional): Only look at this day.
+
+        Returns:
+            list[dict]: {"room", "day", "index", "lessons": [first lesson, second lesson]}, one per room and clashing pair
+            of lessons. Lessons in several rooms ("а.101|а.102") clash in each of them.
+        """
+        columns = ", ".join(f"a.{column}" for column in LESSON_COLUMNS.split(", "))
+        columns += ", " + ", ".join(f"b.{column}" for column in LESSON_COLUMNS.split(", "))
+
+        query = (
+            f"SELECT ra.room, {columns} FROM lesson_rooms ra "
+            "JOIN lessons a ON a.id = ra.lesson_id "
+            "JOIN lesson_rooms rb ON rb.room = ra.room AND rb.day = ra.day AND rb.pair = ra.pair AND rb.lesson_id > ra.lesson_id "
+            "JOIN lessons b ON b.id = rb.lesson_id "
+            "WHERE a.group_name != b.group_name "
+            "AND (a.week IS NULL OR b.week IS NULL OR a.week = b.week) "
+            "AND (a.name IS NOT b.name OR a.teacher IS NOT b.teacher)"
+        )
+        parameters = []
+        if day is not None:
+            query += " AND a.day = ?"
+            parameters.append(day)
+        query += " ORDER BY a.day_number, a.pair, ra.room, a.id, b.id"
+
+        width = len(LESSON_COLUMNS.split(", "))
+        conflicts = []
+        for room, *row in self.connection.execute(query, parameters):
+            first, second = _lesson_from_row(row[:width]), _lesson_from_row(row[width:])
+            conflicts.append({"room": room, "day": first["day"], "index": first["index"], "lessons": [first, second]})
+        return conflicts
+
+
+def sync_database(
+    path_to_student_schedules: str = "output_json",
+    path_to_database: str = DEFAULT_DATABASE_PATH,
+    force: bool = False,
+) -> int:
+    """
+    Brings the database up to date with the group files. Groups whose files haven't changed since they were
+    loaded (same SHA-256) are skipped, changed ones are reloaded and groups without a file anymore are removed.
+    All in a single transaction, so readers never see a half-updated database.
+
+    Args:
+        path_to_student_schedules (str): Directory with group schedules.
+        path_to_database (str): The database file.
+        force (bool): Reload every group.
+
+    Returns:
+        int: The number of groups loaded or removed.
+    """
+    with ScheduleDatabase(path_to_database) as database:
+        with database.connection:
+            if force:
+                database.clear()
+
+            known = database.group_hashes()
+            group_files = list(iter_group_files(path_to_student_schedules))
+
+            changed_groups = 0
+            for group, path in group_files:
+                with open(path, "rb") as f:
+                    data = f.read()
+
+                sha256 = hashlib.sha256(data).hexdigest()
+                if known.get(group) == sha256:
+                    continue
+
+                database.replace_group(group, json.loads(data), sha256)
+                changed_groups += 1
+
+            removed_groups = known.keys() - {group for group, _ in group_files}
+            for group in removed_groups:
+                database.remove_group(group)
+
+    print(
+        f"[INFO] {path_to_database}: {changed_groups} group(s) loaded, {len(removed_groups)} removed, "
+        f"{len(group_files) - changed_groups} unchanged"
+    )
+    return changed_groups + len(removed_groups)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument(
+        "-s",
+        "--student_schedules",
+        default="./output_json",
+        help="Path to group schedules produced by parse_schedules",
+    )
+    ap.add_argument(
+        "-o",
+        "--output",
+        default=DEFAULT_DATABASE_PATH,
+        help=f"Path of the database. Default is {DEFAULT_DATABASE_PATH}",
+    )
+    ap.add_argument(
+        "-f",
+        "--force",
+        action="store_true",
+        help="Reload all groups, not only the ones whose files changed",
+    )
+    ap.add_argument(
+        "--conflicts",
+        action="store_true",
+        help="Print rooms taken by different lessons of different groups at the same time",
+    )
+    args = vars(ap.parse_args())
+
+    sync_database(args["student_schedules"], args["output"], args["force"])
+
+    if args["conflicts"]:
+        with ScheduleDatabase(args["output"]) as database:
+            conflicts = database.room_conflicts()
+
+        for conflict in conflicts:
+            first, second = conflict["lessons"]
+            print(
+                f"[WARNING] {conflict['room']}, {conflict['day']} pair {conflict['index']}: "
+                f"{first['group']} ({first['name']}) and {second['group']} ({second['name']})"
+            )
+        print(f"[INFO] {len(conflicts)} room conflict(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+import re
+import zipfile
+from typing import List, Optional
+
+import pandas as pd
+from lxml import etree
+from pandas.io.parsers import TextParser
+
+from ParseSchedules.profiling import profiler
+from ParseSchedules.utilities import is_group_name
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+TBL = W_NS + "tbl"
+TR = W_NS + "tr"
+TC = W_NS + "tc"
+P = W_NS + "p"
+T = W_NS + "t"
+BR = W_NS + "br"
+CR = W_NS + "cr"
+TAB = W_NS + "tab"
+GRID_SPAN = W_NS + "gridSpan"
+V_MERGE = W_NS + "vMerge"
+GRID_BEFORE = W_NS + "gridBefore"
+VAL = W_NS + "val"
+
+# same whitespace normalization pandas.read_html applies to every <td>
+_RE_WHITESPACE = re.compile(r"[\r\n]+|\s{2,}")
+
+# how far down a table its header (the row with the group names) is looked for
+HEADER_SEARCH_ROWS = 5
+
+
+def _normalize_cell_text(paragraphs: "List[str]") -> str:
+    # PyDocX puts a <br /> between non-empty paragraphs of a cell, read_html turns it into a newline
+    text = "\n".join(p for p in paragraphs if p)
+    return _RE_WHITESPACE.sub(" ", text.strip())
+
+
+def _read_tables(source, first_only: bool = False) -> "List[List[List[str]]]":
+    """
+    Streams word/document.xml and collects the text rows of every top-level table.
+
+    Cells spanning several grid columns (w:gridSpan) are repeated, and cells continuing
+    a vertical merge (w:vMerge) get the text of the cell above them,
+    the same way pandas.read_html expands colspan and rowspan.
+    The text of a table nested in a cell is glued to the cell's text, like the text of
+    a nested <table> in the HTML of PyDocX.
+
+    Args:
+        source: A path to a .docx file or a binary file-like object.
+        first_only (bool): Stop after the first table.
+
+    Returns:
+        list[list[list[str]]]: The rows of cell texts of each table, padded to the same length within a table.
+    """
+    tables: "List[List[List[str]]]" = []
+    rows: "List[List[str]]" = []
+    # grid column -> text of the cell that started a vertical merge there
+    merge_origins: "dict[int, str]" = {}
+
+    table_depth = 0
+    row: "List[str]" = []
+    grid_col = 0
+    paragraphs: "List[str]" = []
+    runs: "List[str]" = []
+    span = 1
+    v_merge: Optional[str] = None
+    # text of the cells of a nested table, and whether the paragraph after it continues the previous one
+    nested_text = ""
+    nested_paragraphs: "List[str]" = []
+    glue_paragraph = False
+
+    with zipfile.ZipFile(source) as docx:
+        with docx.open("word/document.xml") as document:
+            for event, el in etree.iterparse(document, events=("start", "end")):
+                tag = el.tag
+
+                if event == "start":
+                    if tag == TBL:
+                        table_depth += 1
+                        if table_depth == 1:
+                            rows = []
+                            merge_origins = {}
+                    elif tag == P:
+                        runs = []
+                    elif table_depth != 1:
+                        continue
+                    elif tag == TR:
+                        row = []
+                        grid_col = 0
+                    elif tag == TC:
+                        paragraphs = []
+                        span = 1
+                        v_merge = None
+                        glue_paragraph = False
+                    continue
+
+                # nested tables are flattened into the text of the enclosing cell. read_html takes the text of
+                # a nested <table> without separators, only the paragraphs within one of its cells are apart
+                if table_depth > 1:
+                    if tag == T:
+                        runs.append(el.text or "")
+                    elif tag == P:
+                        nested_paragraphs.append("".join(runs))
+                    elif tag == TC:
+                        nested_text += "\n".join(p for p in nested_paragraphs if p)
+                        nested_paragraphs = []
+                    elif tag == TBL:
+                        table_depth -= 1
+                        if table_depth == 1:
+                            if paragraphs:
+                                paragraphs[-1] += nested_text
+                            else:
+                                paragraphs.append(nested_text)
+                            nested_text = ""
+                            glue_paragraph = True
+                    continue
+
+                if table_depth == 0:
+                    continue
+
+                if tag == T:
+                    runs.append(el.text or "")
+                elif tag in (BR, CR):
+                    runs.append("\n")
+                elif tag == TAB and el.getparent() is not None and el.getparent().tag != W_NS + "tabs":
+                    runs.append("\t")
+                elif tag == P:
+                    if glue_paragraph and paragraphs:
+                        paragraphs[-1] += "".join(runs)
+                    else:
+                        paragraphs.append("".join(runs))
+                    glue_paragraph = False
+                elif tag == GRID_SPAN:
+                    span = int(el.get(VAL, 1))
+                elif tag == V_MERGE:
+                    v_merge = el.get(VAL, "continue")
+                elif tag == GRID_BEFORE:
+                    grid_col += int(el.get(VAL, 0))
+                elif tag == TC:
+                    if v_merge == "continue":
+                        text = merge_origins.get(grid_col, "")
+                    else:
+                        text = _normalize_cell_text(paragraphs)
+                        if v_merge == "restart":
+                            merge_origins[grid_col] = text
+                        else:
+                            merge_origins.pop(grid_col, None)
+
+                    row.extend([text] * span)
+                    grid_col += span
+                    el.clear()
+                elif tag == TR:
+                    rows.append(row)
+                    el.clear()
+                elif tag == TBL:
+                    table_depth = 0
+                    tables.append(rows)
+                    if first_only:
+                        # the rest of the document is not needed
+                        break
+
+    # fill out ragged rows
+    for rows in tables:
+        width = max((len(r) for r in rows), default=0)
+        for r in rows:
+            r.extend([""] * (width - len(r)))
+
+    return tables
+
+
+def find_header_row(rows: "List[List[str]]") -> Optional[int]:
+    """
+    Finds the header of a schedule table, the first row with a group name after the day and pair columns.
+    It is usually the first row, but some tables start with a title (e.g. the course or the week).
+
+    Args:
+        rows (list[list[str]]): Rows of cell texts.
+
+    Returns:
+        int: The index of the header row. None if the table has no groups, i.e. isn't a schedule.
+    """
+    for i, row in enumerate(rows[:HEADER_SEARCH_ROWS]):
+        if any(is_group_name(cell) for cell in row[2:]):
+            return i
+    return None
+
+
+def _parse_rows(rows: "List[List[str]]") -> pd.DataFrame:
+    # same parser (and defaults) read_html uses to turn cell texts into a frame
+    with profiler.stage("text_parser"), TextParser(rows, header=0, thousands=",") as parser:
+        return parser.read()
+
+
+def _frame_rows(df: pd.DataFrame) -> "List[List[str]]":
+    # back to cell texts, header included, so a table read with the wrong header can be parsed again
+    return [[str(column) for column in df.columns]] + [
+        ["" if pd.isna(value) else str(value) for value in row] for row in df.itertuples(index=False)
+    ]
+
+
+def read_table_native(source) -> pd.DataFrame:
+    """
+    Reads the schedule table directly from the OOXML of a .docx file.
+
+    Produces the same DataFrame as pandas.read_html(PyDocX.to_html(source), header=0)[0],
+    without building and re-parsing an HTML document.
+
+    Args:
+        source: A path to a .docx file or a binary file-like object.
+
+    Returns:
+        pandas.DataFrame: The first table of the document, first row used as header.
+    """
+    with profiler.stage("read_xml"):
+        tables = _read_tables(source, first_only=True)
+
+    if len(tables) == 0 or len(tables[0]) == 0:
+        raise ValueError("No tables found")
+
+    return _parse_rows(tables[0])
+
+
+def read_tables_native(source) -> "List[pd.DataFrame]":
+    """
+    Reads every schedule table of a .docx file in a single pass over its OOXML.
+    The header of each table is found with find_header_row, tables without groups are left out.
+
+    Args:
+        source: A path to a .docx file or a binary file-like object.
+
+    Returns:
+        list[pandas.DataFrame]: The schedule tables, in document order. Each table is read the way
+        read_table_native reads the first one, starting at its header.
+    """
+    with profiler.stage("read_xml"):
+        tables = _read_tables(source)
+
+    if not any(tables):
+        raise ValueError("No tables found")
+
+    frames = []
+    for rows in tables:
+        header_row = find_header_row(rows)
+        if header_row is not None:
+            frames.append(_parse_rows(rows[header_row:]))
+    return frames
+
+
+def read_table_pydocx(source) -> pd.DataFrame:
+    """
+    Reads the schedule table by converting the .docx file to HTML with PyDocX
+    and parsing the HTML with pandas.read_html.
+
+    Args:
+        source: A path to a .docx file or a binary file-like object.
+
+    Returns:
+        pandas.DataFrame: The first table of the document, first row used as header.
+    """
+    from pydocx import PyDocX
+
+    with profiler.stage("docx_to_html"):
+        html = PyDocX.to_html(source)
+
+    with profiler.stage("read_html"):
+        return pd.read_html(html, header=0)[0]
+
+
+def read_tables_pydocx(source) -> "List[pd.DataFrame]":
+    """
+    Reads every schedule table of a .docx file from a single PyDocX conversion to HTML.
+    Tables whose header isn't their first row are parsed again from their header, see find_header_row.
+
+    Args:
+        source: A path to a .docx file or a binary file-like object.
+
+    Returns:
+        list[pandas.DataFrame]: The schedule tables, in document order.
+    """
+    from pydocx import PyDocX
+
+    with profiler.stage("docx_to_html"):
+        html = PyDocX.to_html(source)
+
+    with profiler.stage("read_html"):
+        tables = pd.read_html(html, header=0)
+
+    frames = []
+    for df in tables:
+        if any(is_group_name(str(column)) for column in df.columns[2:]):
+            frames.append(df)
+            continue
+
+        rows = _frame_rows(df)
+        header_row = find_header_row(rows)
+        if header_row is not None:
+            frames.append(_parse_rows(rows[header_row:]))
+    return frames
+
+
+readers = {
+    "native": read_table_native,
+    "pydocx": read_table_pydocx,
+}
+
+# readers of all schedule tables of a document
+table_readers = {
+    "native": read_tables_native,
+    "pydocx": read_tables_pydocx,
+}
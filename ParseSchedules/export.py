@@ -0,0 +1,322 @@
+# exports the lessons of all groups into one columnar Parquet dataset for analytics: teacher load, room
+# utilization, biweekly balance. One row per lesson with its group, day and week, strings dictionary-encoded,
+# one partition per semester (<dir>/semester=<semester>/lessons.parquet), so a report over the whole
+# university is a vectorized scan of a few columns instead of re-reading every group file.
+# Needs pyarrow: pip install pyarrow
+#
+# python -m ParseSchedules.export [-s output_json] [-o lessons_parquet] [--semester 2023-2024-1] [--report]
+
+import argparse
+import datetime
+import os
+import re
+from typing import Iterable, Optional, Tuple
+
+try:
+    import pyarrow
+    import pyarrow.compute as pc
+    import pyarrow.dataset
+    import pyarrow.parquet
+except ImportError:  # optional, only needed for the export
+    pyarrow = None
+
+from ParseSchedules.extract_teacher_schedules import iter_group_schedules, iter_lesson_dicts
+from ParseSchedules.serialization import write_atomically
+from ParseSchedules.utilities import days_eng_lower, pair_number
+
+DEFAULT_EXPORT_PATH = "lessons_parquet"
+
+# a pair lasts two academic hours
+HOURS_PER_PAIR = 2
+
+# partitions are directories, so a semester has to be a safe directory name
+_SEMESTER_PATTERN = re.compile(r"^[\w.-]+$")
+
+
+def _require_pyarrow():
+    if pyarrow is None:
+        raise ImportError("The Parquet export needs the pyarrow package: pip install pyarrow")
+
+
+def current_semester(today: Optional[datetime.date] = None) -> str:
+    """
+    The semester a date falls into: "<first year>-<second year>-<1 or 2>" of the academic year, which starts
+    in September. The second semester starts in February.
+    """
+    today = today or datetime.date.today()
+    if today.month >= 9:
+        return f"{today.year}-{today.year + 1}-1"
+    if today.month == 1:
+        return f"{today.year - 1}-{today.year}-1"
+    return f"{today.year - 1}-{today.year}-2"
+
+
+def lesson_schema():
+    """
+    Columns of the exported lessons. The semester isn't stored in the files, it is the partition.
+    """
+    _require_pyarrow()
+    strings = pyarrow.dictionary(pyarrow.int32(), pyarrow.string())
+    return pyarrow.schema(
+        [
+            ("group", strings),
+            ("day", strings),
+            # 0 is monday, for sorting
+            ("day_number", pyarrow.int8()),
+            # the index of the lesson, i.e. the pair
+            ("pair", pyarrow.int8()),
+            ("name", strings),
+            ("room", strings),
+            ("qualification", strings),
+            ("teacher", strings),
+            # a lesson can have several teachers ("Піх|Сабат"), split for per-teacher reports
+            ("teachers", pyarrow.list_(pyarrow.string())),
+            ("label", pyarrow.float64()),
+            ("is_biweekly", pyarrow.bool_()),
+            ("week", pyarrow.int8()),
+        ]
+    )
+
+
+def lessons_table(schedules: "Iterable[Tuple[str, object]]"):
+    """
+    Puts the lessons of schedules into one table, one row per lesson.
+
+    Args:
+        schedules (Iterable[tuple[str, WeeklySchedule]]): Group name and schedule, as built by the parser
+            or read from a group file (either the models or their dicts).
+
+    Returns:
+        pyarrow.Table: The lessons, see lesson_schema.
+    """
+    schema = lesson_schema()
+    columns = {field.name: [] for field in schema}
+
+    for group, schedule in schedules:
+        for day, lesson in iter_lesson_dicts(schedule):
+            teacher = lesson.get("teacher")
+            columns["group"].append(group)
+            columns["day"].append(day)
+            columns["day_number"].append(days_eng_lower.index(day))
+            # null for an index that isn't a pair number, e.g. "1-2"
+            columns["pair"].append(pair_number(lesson.get("index")))
+            columns["name"].append(lesson.get("name"))
+            columns["room"].append(lesson.get("room"))
+            columns["qualification"].append(lesson.get("qualification"))
+            columns["teacher"].append(teacher)
+            columns["teachers"].append(teacher.split("|") if teacher is not None else [])
+            columns["label"].append(lesson.get("label"))
+            columns["is_biweekly"].append(lesson.get("isBiweekly"))
+            columns["week"].append(lesson.get("week"))
+
+    arrays = []
+    for field in schema:
+        if pyarrow.types.is_dictionary(field.type):
+            # encoded once here, the Parquet writer keeps the dictionaries
+            arrays.append(pyarrow.array(columns[field.name], pyarrow.string()).dictionary_encode().cast(field.type))
+        else:
+            arrays.append(pyarrow.array(columns[field.name], field.type))
+
+    return pyarrow.Table.from_arrays(arrays, schema=schema)
+
+
+def partition_path(path: str, semester: str) -> str:
+    if not _SEMESTER_PATTERN.match(semester):
+        raise ValueError(f"Not a valid semester: {semester!r}, expected something like 2023-2024-1")
+    return os.path.join(path, f"semester={semester}", "lessons.parquet")
+
+
+def write_lessons(path: str, table, semester: str) -> int:
+    """
+    Saves lessons as the partition of a semester, replacing what was exported for it before.
+    Other semesters are kept.
+
+    Args:
+        path (str): The dataset directory.
+        table (pyarrow.Table): The lessons, see lessons_table.
+        semester (str): The semester, e.g. "2023-2024-1".
+
+    Returns:
+        int: Size of the partition in bytes.
+    """
+    _require_pyarrow()
+    destination = partition_path(path, semester)
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+
+    sink = pyarrow.BufferOutputStream()
+    # one row group keeps every dictionary in one place, a semester is small enough
+    pyarrow.parquet.write_table(table, sink, compression="zstd", row_group_size=max(len(table), 1))
+    data = sink.getvalue().to_pybytes()
+
+    write_atomically(destination, data)
+    return len(data)
+
+
+def export_lessons(
+    path_to_student_schedules: str = "output_json",
+    path: str = DEFAULT_EXPORT_PATH,
+    semester: Optional[str] = None,
+) -> int:
+    """
+    Exports the lessons of every group file into the partition of a semester.
+
+    Args:
+        path_to_student_schedules (str): Directory with group schedules.
+        path (str): The dataset directory.
+        semester (str, optional): The semester. The current one by default, see current_semester.
+
+    Returns:
+        int: The number of lessons exported.
+    """
+    semester = semester or current_semester()
+
+    table = lessons_table(iter_group_schedules(path_to_student_schedules))
+    size = write_lessons(path, table, semester)
+
+    print(f"[INFO] {len(table)} lesson(s) of {len(pc.unique(table['group']))} group(s) exported to {partition_path(path, semester)}, {size:,} bytes")
+    return len(table)
+
+
+def load_lessons(path: str = DEFAULT_EXPORT_PATH, semester: Optional[str] = None, columns=None):
+    """
+    Reads the exported lessons, with a "semester" column.
+
+    Args:
+        path (str): The dataset directory.
+        semester (str, optional): Only read this semester. All of them by default.
+        columns (list[str], optional): Only read these columns.
+
+    Returns:
+        pyarrow.Table: The lessons.
+    """
+    _require_pyarrow()
+    dataset = pyarrow.dataset.dataset(path, format="parquet", partitioning="hive")
+    row_filter = pc.field("semester") == semester if semester is not None else None
+    return dataset.to_table(columns=columns, filter=row_filter)
+
+
+def _renamed(table, names: "dict[str, str]"):
+    # results are small, and dictionary columns can't be sorted
+    columns = [
+        column.cast(column.type.value_type) if pyarrow.types.is_dictionary(column.type) else column
+        for column in table.columns
+    ]
+    return pyarrow.table(columns, names=[names.get(name, name) for name in table.column_names])
+
+
+def _weekly_share(table):
+    # a lesson of one week only happens every other week, so it is half a pair per week on average
+    return pc.if_else(pc.is_null(table["week"]), 1.0, 0.5)
+
+
+def teacher_hours(table):
+    """
+    Academic hours per week of every teacher. A lesson with several teachers counts for each of them,
+    a lecture shared by several groups counts once.
+
+    Returns:
+        pyarrow.Table: Columns teacher, pairs (per week, on average) and hours, the busiest teacher first.
+    """
+    # one row per teacher of every lesson
+    rows = pc.list_parent_indices(table["teachers"])
+    per_teacher = pyarrow.table(
+        {
+            "teacher": pc.list_flatten(table["teachers"]),
+            "day_number": pc.take(table["day_number"], rows),
+            "pair": pc.take(table["pair"], rows),
+            "week": pc.take(table["week"], rows),
+        }
+    )
+    slots = per_teacher.group_by(["teacher", "day_number", "pair", "week"]).aggregate([])
+    slots = slots.append_column("pairs", _weekly_share(slots))
+
+    result = _renamed(slots.group_by("teacher").aggregate([("pairs", "sum")]), {"pairs_sum": "pairs"})
+    result = result.append_column("hours", pc.multiply(result["pairs"], HOURS_PER_PAIR))
+    return result.select(["teacher", "pairs", "hours"]).sort_by([("pairs", "descending"), ("teacher", "ascending")])
+
+
+def room_utilization(table):
+    """
+    How busy every room is. A lecture shared by several groups takes its slot once.
+
+    Returns:
+        pyarrow.Table: Columns room, pairs (per week, on average) and utilization (the share of the
+        day x pair slots of the week the room is taken), the busiest room first.
+    """
+    lessons = table.filter(pc.is_valid(table["room"])).select(["room", "day_number", "pair", "week"])
+    slots = lessons.group_by(["room", "day_number", "pair", "week"]).aggregate([])
+    slots = slots.append_column("pairs", _weekly_share(slots))
+
+    result = _renamed(slots.group_by("room").aggregate([("pairs", "sum")]), {"pairs_sum": "pairs"})
+    n_slots = len(days_eng_lower) * (pc.max(table["pair"]).as_py() or 0)
+    result = result.append_column("utilization", pc.divide(result["pairs"], float(max(n_slots, 1))))
+    return result.select(["room", "pairs", "utilization"]).sort_by([("pairs", "descending"), ("room", "ascending")])
+
+
+def biweekly_balance(table):
+    """
+    Lessons of every group on the first and the second week. Weekly lessons count for both.
+
+    Returns:
+        pyarrow.Table: Columns group, week_1, week_2 and difference (week_1 - week_2), the most unbalanced group first.
+    """
+    weekly = pc.is_null(table["week"])
+    counts = pyarrow.table(
+        {
+            "group": table["group"],
+            "week_1": pc.cast(pc.or_kleene(weekly, pc.equal(table["week"], 1)), pyarrow.int32()),
+            "week_2": pc.cast(pc.or_kleene(weekly, pc.equal(table["week"], 2)), pyarrow.int32()),
+        }
+    )
+    result = counts.group_by("group").aggregate([("week_1", "sum"), ("week_2", "sum")])
+    result = _renamed(result, {"week_1_sum": "week_1", "week_2_sum": "week_2"})
+    result = result.append_column("difference", pc.subtract(result["week_1"], result["week_2"]))
+    result = result.append_column("imbalance", pc.abs(result["difference"]))
+    result = result.sort_by([("imbalance", "descending"), ("group", "ascending")])
+    return result.select(["group", "week_1", "week_2", "difference"])
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument(
+        "-s",
+        "--student_schedules",
+        default="./output_json",
+        help="Path to group schedules produced by parse_schedules",
+    )
+    ap.add_argument(
+        "-o",
+        "--output",
+        default=DEFAULT_EXPORT_PATH,
+        help=f"Directory of the Parquet dataset. Default is {DEFAULT_EXPORT_PATH}",
+    )
+    ap.add_argument(
+        "--semester",
+        help="Semester the schedules are for, e.g. 2023-2024-1. Its partition is replaced, others are kept. "
+        "Default is the current semester",
+    )
+    ap.add_argument(
+        "--report",
+        action="store_true",
+        help="Print the busiest teachers and rooms and the least balanced groups of the semester",
+    )
+    args = vars(ap.parse_args())
+
+    semester = args["semester"] or current_semester()
+    export_lessons(args["student_schedules"], args["output"], semester)
+
+    if args["report"]:
+        table = load_lessons(args["output"], semester)
+        reports = [
+            ("Teacher hours per week", teacher_hours(table)),
+            ("Room utilization", room_utilization(table)),
+            ("Biweekly balance", biweekly_balance(table)),
+        ]
+        for title, report in reports:
+            print(f"[INFO] {title}:")
+            for row in report.slice(0, 10).to_pylist():
+                print("[INFO]   " + ", ".join(f"{key}: {round(value, 2) if isinstance(value, float) else value}" for key, value in row.items()))
+
+
+if __name__ == "__main__":
+    main()
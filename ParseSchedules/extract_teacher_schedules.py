@@ -1,112 +1,556 @@
 # extracts teachers schedules from data available in regular schedules
 
+import argparse
+import hashlib
 import os
 import json
-from pprint import pprint
+from collections import Counter
+from typing import Iterator, List, Optional, Set, Tuple
+
 from ParseSchedules.models import Lesson, WeeklySchedule
+from ParseSchedules.serialization import JsonWriter, write_atomically
 
-from ParseSchedules.utilities import construct_empty_schedule, merge_classes
+from ParseSchedules.utilities import construct_empty_schedule, days_eng_lower, merge_classes
 
-path_to_student_schedules = "./output_json"
-student_schedules_json: "dict[str, WeeklySchedule]" = {}
+# (index, name, week). Classes with the same signature are merged into one, combining their groups
+ClassSignature = Tuple[int, str, int]
 
-# read all json files in the directory and all subdirectories
-for root, dirs, files in os.walk(path_to_student_schedules):
-    for file in files:
-        if file.endswith(".json"):
-            print(os.path.join(root, file))
+# rewriting a teacher reads their file and the groups they teach. Once the changed groups touch more than
+# this share of the teachers, rebuilding all of them from one pass over the groups is faster
+REBUILD_TOUCHED_FRACTION = 0.5
 
-            # open the file using a context manager
-            with open(os.path.join(root, file), "r", encoding="utf8") as f:
-                # read the file
-                data = f.read()
 
-            # parse the json
-            parsed_json: WeeklySchedule = json.loads(data)
+def read_group_schedule(path: str) -> WeeklySchedule:
+    with open(path, "r", encoding="utf8") as f:
+        return json.load(f)
 
-            #  get file name without extension
-            file_name = os.path.splitext(file)[0]
 
-            student_schedules_json[file_name] = parsed_json
+def iter_group_files(path_to_student_schedules: str) -> "Iterator[Tuple[str, str]]":
+    """
+    Yields (group name, path) of every group schedule, in the order teacher schedules are built in.
+    """
+    for root, dirs, files in os.walk(path_to_student_schedules):
+        dirs.sort()
+        for file in sorted(files):
+            if file.endswith(".json"):
+                yield os.path.splitext(file)[0], os.path.join(root, file)
 
-# iterate over all student schedules and extract all teachers into a set
 
-teachers: "set[str]" = set()
-for schedule_name, schedule_data in student_schedules_json.items():
-    for day in schedule_data.keys():
-        lessons: list[Lesson] = schedule_data[day]["classes"]
-        for lesson in lessons:
-            should_add_teacher = lesson.teacher is not None
+def iter_group_schedules(path_to_student_schedules: str) -> "Iterator[Tuple[str, WeeklySchedule]]":
+    """
+    Reads group schedules one at a time from all json files in the directory and all subdirectories.
+
+    Args:
+        path_to_student_schedules (str): Directory with group schedules.
 
-            if should_add_teacher:
-                if "|" in lesson.teacher:
-                    # split by pipe and iterate
-                    teachers_list = lesson.teacher.split("|")
-                    teachers.update(teachers_list)
+    Yields:
+        tuple[str, WeeklySchedule]: The group name (file name without extension) and its schedule.
+    """
+    for group, path in iter_group_files(path_to_student_schedules):
+        yield group, read_group_schedule(path)
 
-                else:
-                    teachers.add(lesson.teacher)
 
+def day_classes(schedule: WeeklySchedule, day: str) -> "list[Lesson]":
+    # days without classes are saved as empty lists
+    day_schedule = schedule.get(day) or {}
+    return day_schedule.get("classes", [])
 
-print(teachers)
-print(len(teachers))
 
-# given a teacher, construct teacher schedule
-teacher_name_to_schedule_mapping = {
-    teacher: construct_empty_schedule() for teacher in teachers
-}
+def iter_lesson_dicts(schedule) -> "Iterator[Tuple[str, dict]]":
+    """
+    Yields the day and every lesson of a schedule as a dict, day by day. The schedule is either read from
+    a group file or built by the parser (DaySchedule models per day, or a WeeklySchedule).
+    """
+    if hasattr(schedule, "to_dict"):
+        schedule = schedule.to_dict()
+
+    for day in days_eng_lower:
+        day_schedule = schedule.get(day)
+        if hasattr(day_schedule, "classes"):
+            lessons = [lesson.to_dict() for lesson in day_schedule.classes]
+        else:
+            lessons = day_classes(schedule, day)
 
-for schedule_name, schedule_data in student_schedules_json.items():
-    day: str
-    for day in schedule_data.keys():
-        lessons: list[Lesson] = schedule_data[day]["classes"]
         for lesson in lessons:
-            teacher = lesson.teacher
-            has_at_least_one_teacher = teacher is not None
-            has_several_teachers = has_at_least_one_teacher and "|" in teacher
+            yield day, lesson
+
+
+def lesson_teachers(lesson: dict, aliases: "Optional[dict[str, str]]" = None) -> "List[str]":
+    """
+    The teachers of a lesson. With an alias map (see ParseSchedules.teacher_names), their canonical names, each once.
+    """
+    teachers = lesson["teacher"].split("|")
+    if not aliases:
+        return teachers
+    return list(dict.fromkeys(aliases.get(teacher, teacher) for teacher in teachers))
+
+
+def aliases_fingerprint(aliases: "Optional[dict[str, str]]") -> Optional[str]:
+    # teacher schedules built with other aliases are keyed by other names, and have to be rebuilt
+    if not aliases:
+        return None
+    data = json.dumps(sorted(aliases.items()), ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class TeacherScheduleIndex:
+    """
+    Teacher -> day -> class signature -> class.
+    Classes are merged as they are added, so the index grows with the number of teachers
+    and their distinct classes, not with the number of lessons read.
+
+    Args:
+        aliases (dict[str, str], optional): Variant -> canonical teacher name, see ParseSchedules.teacher_names.
+    """
+
+    def __init__(self, aliases: "Optional[dict[str, str]]" = None):
+        self.teachers: "dict[str, dict[str, dict[ClassSignature, dict]]]" = {}
+        self.aliases = aliases
+
+    def add_group_schedule(self, group: str, schedule: WeeklySchedule):
+        for day in days_eng_lower:
+            for lesson in day_classes(schedule, day):
+                if lesson.get("teacher") is None:
+                    continue
+
+                teachers = lesson_teachers(lesson, self.aliases)
+                if self.aliases:
+                    # the lesson lists the teachers by their canonical names too
+                    lesson = {**lesson, "teacher": "|".join(teachers)}
+                for teacher in teachers:
+                    self.add_class(teacher, day, group, lesson)
+
+    def add_class(self, teacher: str, day: str, group: str, lesson: dict):
+        days = self.teachers.get(teacher)
+        if days is None:
+            days = self.teachers[teacher] = {day: {} for day in days_eng_lower}
+
+        classes = days[day]
+        signature: ClassSignature = (lesson["index"], lesson["name"], lesson.get("week", 1))
+
+        merged_class = classes.get(signature)
+        if merged_class is None:
+            # include group name in the lesson
+            classes[signature] = {**lesson, "group": group}
+        else:
+            # merge the "group" field by appending the group name
+            merged_class["group"] += f"|{group}"
+
+    def schedules(self) -> "Iterator[Tuple[str, WeeklySchedule]]":
+        """
+        Yields each teacher's schedule with classes sorted by index.
+        """
+        for teacher, days in self.teachers.items():
+            schedule = construct_empty_schedule()
+            for day, classes in days.items():
+                schedule[day]["classes"] = sorted(classes.values(), key=lambda c: c["index"])
+            yield teacher, schedule
+
+
+def lesson_entries(schedule: WeeklySchedule, aliases: "Optional[dict[str, str]]" = None) -> "dict[str, list[list[str]]]":
+    """
+    Reduces a group schedule to what its teachers depend on: for each day,
+    a fingerprint of every lesson that has a teacher, along with the teachers (their canonical names with aliases).
+
+    Returns:
+        dict[str, list[list[str]]]: Day -> [[fingerprint, teachers joined with "|"], ...].
+    """
+    entries = {}
+    for day in days_eng_lower:
+        entries[day] = [
+            [lesson_fingerprint(lesson), "|".join(lesson_teachers(lesson, aliases))]
+            for lesson in day_classes(schedule, day)
+            if lesson.get("teacher") is not None
+        ]
+    return entries
+
+
+def lesson_fingerprint(lesson: dict) -> str:
+    data = json.dumps(lesson, ensure_ascii=False).encode("utf-8")
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def diff_lessons(old: "dict[str, list[list[str]]]", new: "dict[str, list[list[str]]]") -> "dict[str, Set[str]]":
+    """
+    Compares two versions of a group's lessons (as returned by lesson_entries).
+
+    Returns:
+        dict[str, set[str]]: Teacher -> days on which one of their lessons was added, removed or changed.
+    """
+    touched: "dict[str, Set[str]]" = {}
+    for day in days_eng_lower:
+        old_lessons = Counter(map(tuple, old.get(day, [])))
+        new_lessons = Counter(map(tuple, new.get(day, [])))
+
+        # a changed lesson shows up as one removed and one added fingerprint
+        for _, teachers in (old_lessons - new_lessons) + (new_lessons - old_lessons):
+            for teacher in teachers.split("|"):
+                touched.setdefault(teacher, set()).add(day)
+    return touched
+
+
+def default_index_path(path_to_teacher_schedules: str) -> str:
+    # next to the directory rather than inside it, so it isn't mistaken for a teacher schedule
+    return os.path.normpath(path_to_teacher_schedules) + ".index.json"
+
+
+class GroupTeacherIndex:
+    """
+    Persisted state of the teacher schedules: for every group file they were built from,
+    its SHA-256 and the fingerprints of its lessons along with their teachers.
+    Knowing the previous lessons of a group is what lets a changed group be diffed.
+    """
+
+    version = 1
+
+    def __init__(self, path: str, output_format: str, aliases: "Optional[dict[str, str]]" = None):
+        self.path = path
+        self.output_format = output_format
+        self.aliases = aliases
+        # group -> {"sha256": ..., "lessons": day -> [[fingerprint, teachers], ...]}
+        self.groups: "dict[str, dict]" = {}
+        self.loaded = False
+
+        if not os.path.exists(path):
+            return
+
+        try:
+            with open(path, "r", encoding="utf8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # a broken index only costs a full rebuild
+            return
+
+        # teacher files of another format, or keyed by other aliases, can't be patched, they have to be rebuilt
+        if (
+            data.get("version") == self.version
+            and data.get("output_format") == output_format
+            and data.get("aliases") == aliases_fingerprint(aliases)
+        ):
+            self.groups = data.get("groups", {})
+            self.loaded = True
+
+    def teachers_of(self, group: str) -> "Set[str]":
+        teachers: "Set[str]" = set()
+        for lessons in self.groups[group]["lessons"].values():
+            for _, lesson_teachers in lessons:
+                teachers.update(lesson_teachers.split("|"))
+        return teachers
+
+    def update(self, group: str, sha256: str, schedule: WeeklySchedule) -> "dict[str, Set[str]]":
+        """
+        Records the new version of a group.
+
+        Returns:
+            dict[str, set[str]]: Teacher -> days touched by the change.
+        """
+        previous = self.groups.get(group, {}).get("lessons", {})
+        lessons = lesson_entries(schedule, self.aliases)
+        self.groups[group] = {"sha256": sha256, "lessons": lessons}
+        return diff_lessons(previous, lessons)
+
+    def remove(self, group: str) -> "dict[str, Set[str]]":
+        return diff_lessons(self.groups.pop(group)["lessons"], {})
+
+    def save(self):
+        data = {
+            "version": self.version,
+            "output_format": self.output_format,
+            "aliases": aliases_fingerprint(self.aliases),
+            "groups": self.groups,
+        }
+        write_atomically(self.path, json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def build_teacher_days(
+    teacher: str,
+    days: "Set[str]",
+    group_files: "list[Tuple[str, str]]",
+    group_schedules: "dict[str, WeeklySchedule]",
+    aliases: "Optional[dict[str, str]]" = None,
+) -> "dict[str, list[dict]]":
+    """
+    Collects and merges the classes of one teacher on the given days from the given groups.
+
+    Args:
+        teacher (str): The teacher.
+        days (set[str]): Days to build.
+        group_files (list[tuple[str, str]]): (group name, path) of the groups the teacher has classes in, in build order.
+        group_schedules (dict[str, WeeklySchedule]): Already read group schedules. Missing ones are read and added.
+        aliases (dict[str, str], optional): Variant -> canonical teacher name.
+
+    Returns:
+        dict[str, list[dict]]: Day -> classes sorted by index.
+    """
+    classes = {day: [] for day in days}
+    for group, path in group_files:
+        schedule = group_schedules.get(group)
+        if schedule is None:
+            schedule = group_schedules[group] = read_group_schedule(path)
+
+        for day in days:
+            for lesson in day_classes(schedule, day):
+                if lesson.get("teacher") is None:
+                    continue
+
+                teachers = lesson_teachers(lesson, aliases)
+                if aliases:
+                    lesson = {**lesson, "teacher": "|".join(teachers)}
+                # same as TeacherScheduleIndex: a teacher listed twice in a lesson is added twice
+                for lesson_teacher in teachers:
+                    if lesson_teacher == teacher:
+                        classes[day].append({**lesson, "group": group})
+
+    return {day: sorted(merge_classes(lessons), key=lambda c: c["index"]) for day, lessons in classes.items()}
+
+
+def sync_teacher_schedules(
+    path_to_student_schedules: str,
+    path_to_teacher_schedules: str,
+    writer: Optional[JsonWriter] = None,
+    index_path: Optional[str] = None,
+    force: bool = False,
+    aliases: "Optional[dict[str, str]]" = None,
+) -> int:
+    """
+    Brings teacher schedules up to date with group schedules, rewriting only what changed.
+
+    Every group file is compared to the version recorded in the index (see GroupTeacherIndex).
+    Changed groups are diffed lesson by lesson, and only the teachers whose lessons were added,
+    removed or changed are rewritten, rebuilding just the touched days. The other days are kept
+    from the existing teacher file. Without a usable index, with force, or when the changes touch more
+    than REBUILD_TOUCHED_FRACTION of the teachers, everything is rebuilt.
+
+    Args:
+        path_to_student_schedules (str): Directory with group schedules.
+        path_to_teacher_schedules (str): Directory with teacher schedules.
+        writer (JsonWriter, optional): Serializes and writes the files. Pretty JSON by default.
+        index_path (str, optional): Where the index is kept. Next to the teacher directory by default.
+        force (bool): Rebuild all teacher schedules.
+        aliases (dict[str, str], optional): Variant -> canonical teacher name, see ParseSchedules.teacher_names.
+            Teachers are keyed by their canonical names. A different map rebuilds everything.
+
+    Returns:
+        int: The number of teacher schedules rewritten.
+    """
+    writer = writer or JsonWriter()
+    index = GroupTeacherIndex(index_path or default_index_path(path_to_teacher_schedules), writer.output_format, aliases)
+
+    rebuild = force or not index.loaded or not os.path.isdir(path_to_teacher_schedules)
+    if force:
+        index.groups = {}
+
+    group_files = list(iter_group_files(path_to_student_schedules))
+    # schedules of the changed groups, for rebuilding the touched days. A rebuild streams every group into
+    # the teacher index instead, holding one group schedule at a time
+    group_schedules: "dict[str, WeeklySchedule]" = {}
+    touched: "dict[str, Set[str]]" = {}
+    changed_groups = 0
+    removed_groups: "Set[str]" = set()
+    # teachers of the index, whose files a rebuild removes if they have no classes left
+    known_teachers: "Set[str]" = set()
+
+    def read_group_file(path: str) -> "Tuple[bytes, str]":
+        with open(path, "rb") as f:
+            data = f.read()
+        return data, hashlib.sha256(data).hexdigest()
+
+    def add_touched(teacher_days: "dict[str, Set[str]]"):
+        for teacher, days in teacher_days.items():
+            touched.setdefault(teacher, set()).update(days)
+
+    if not rebuild:
+        for group in index.groups:
+            known_teachers |= index.teachers_of(group)
+        max_touched = len(known_teachers) * REBUILD_TOUCHED_FRACTION
+
+        removed_groups = index.groups.keys() - {group for group, _ in group_files}
+        for group in removed_groups:
+            add_touched(index.remove(group))
+
+        for group, path in group_files:
+            # no need to read the rest once a rebuild is decided
+            if len(touched) > max_touched:
+                break
+
+            data, sha256 = read_group_file(path)
+            if index.groups.get(group, {}).get("sha256") == sha256:
+                continue
+
+            changed_groups += 1
+            schedule = json.loads(data)
+            add_touched(index.update(group, sha256, schedule))
+            group_schedules[group] = schedule
+
+        if len(touched) > max_touched:
+            print(f"[INFO] Changes touch more than {REBUILD_TOUCHED_FRACTION:.0%} of the teachers, rebuilding all of them")
+            rebuild = True
+
+    if rebuild:
+        teacher_index = TeacherScheduleIndex(aliases)
+        for group, path in group_files:
+            data, sha256 = read_group_file(path)
+            schedule = json.loads(data)
+            # nothing is diffed, the index only has to describe the new files. Entries of unchanged groups still do
+            if index.groups.get(group, {}).get("sha256") != sha256:
+                index.groups[group] = {"sha256": sha256, "lessons": lesson_entries(schedule, aliases)}
+            teacher_index.add_group_schedule(group, schedule)
+        index.groups = {group: index.groups[group] for group, _ in group_files}
+
+        os.makedirs(path_to_teacher_schedules, exist_ok=True)
+        for teacher, schedule in teacher_index.schedules():
+            writer.write(os.path.join(path_to_teacher_schedules, teacher + ".json"), schedule)
+
+        # schedules of the variants, written before they were aliased
+        for variant in (aliases or {}).keys() - teacher_index.teachers.keys():
+            path = os.path.join(path_to_teacher_schedules, variant + ".json")
+            if os.path.exists(path):
+                os.remove(path)
+                print(f"[INFO] {variant}: aliased to {aliases[variant]}, removed")
+
+        for teacher in sorted(known_teachers - teacher_index.teachers.keys()):
+            path = os.path.join(path_to_teacher_schedules, teacher + ".json")
+            if os.path.exists(path):
+                os.remove(path)
+                print(f"[INFO] {teacher}: no classes left, removed")
+
+        index.save()
+        print(f"[INFO] All {len(teacher_index.teachers)} teacher schedules rebuilt from {len(group_files)} group(s)")
+        return len(teacher_index.teachers)
+
+    all_teachers: "Set[str]" = set()
+    for group in index.groups:
+        all_teachers |= index.teachers_of(group)
+
+    teacher_groups: "dict[str, list[Tuple[str, str]]]" = {teacher: [] for teacher in touched}
+    for group, path in group_files:
+        for teacher in index.teachers_of(group) & touched.keys():
+            teacher_groups[teacher].append((group, path))
+
+    rewritten = 0
+    rewritten_days = 0
+    for teacher in sorted(touched):
+        path = os.path.join(path_to_teacher_schedules, teacher + ".json")
+
+        if teacher not in all_teachers:
+            if os.path.exists(path):
+                os.remove(path)
+            print(f"[INFO] {teacher}: no classes left, removed")
+            continue
+
+        days = touched[teacher]
+        if os.path.exists(path):
+            schedule = read_group_schedule(path)
+        else:
+            # a new teacher, every day has to be built
+            schedule = construct_empty_schedule()
+            days = set(days_eng_lower)
+
+        for day, classes in build_teacher_days(teacher, days, teacher_groups[teacher], group_schedules, aliases).items():
+            schedule[day] = {"classes": classes}
+
+        writer.write(path, schedule)
+        rewritten += 1
+        rewritten_days += len(days)
+        print(f"[INFO] {teacher}: {', '.join(day for day in days_eng_lower if day in days)} rewritten")
+
+    index.save()
+
+    print(
+        f"[INFO] {changed_groups} changed and {len(removed_groups)} removed of {len(group_files)} group(s); "
+        f"{rewritten} of {len(all_teachers)} teacher schedule(s) rewritten ({rewritten_days} day(s)), "
+        f"{len(all_teachers) - rewritten} skipped"
+    )
+    return rewritten
+
+
+def build_teacher_schedules(
+    path_to_student_schedules: str,
+    path_to_teacher_schedules: str,
+    writer: Optional[JsonWriter] = None,
+    aliases: "Optional[dict[str, str]]" = None,
+) -> int:
+    """
+    Builds teacher schedules out of group schedules in a single pass over the group files
+    and saves them to separate files, the name of which is the teacher's name.
+
+    Args:
+        path_to_student_schedules (str): Directory with group schedules.
+        path_to_teacher_schedules (str): Directory to save teacher schedules to.
+        writer (JsonWriter, optional): Serializes and writes the files. Pretty JSON by default.
+        aliases (dict[str, str], optional): Variant -> canonical teacher name, see ParseSchedules.teacher_names.
+
+    Returns:
+        int: The number of teacher schedules saved.
+    """
+    writer = writer or JsonWriter()
+    index = TeacherScheduleIndex(aliases)
 
-            if has_at_least_one_teacher:
-                # include group name in the lesson
-                lesson["group"] = schedule_name
+    for group, schedule in iter_group_schedules(path_to_student_schedules):
+        index.add_group_schedule(group, schedule)
 
-                # helper function to get day classes from teacher's schedule
-                get_day_classes = lambda teacher: teacher_name_to_schedule_mapping[
-                    teacher
-                ][day]["classes"]
+    os.makedirs(path_to_teacher_schedules, exist_ok=True)
 
-                if has_several_teachers:
-                    # split by pipe and iterate
-                    teachers_list = teacher.split("|")
-                    for teacher in teachers_list:
-                        get_day_classes(teacher).append(lesson)
-                else:
-                    # otherwise just add the lesson to the teacher's schedule
-                    get_day_classes(teacher).append(lesson)
+    for teacher, schedule in index.schedules():
+        writer.write(os.path.join(path_to_teacher_schedules, teacher + ".json"), schedule)
 
-# merge classes with same index, name and week. The final class should combine groups from each class
-for teacher, schedule in teacher_name_to_schedule_mapping.items():
-    for day in schedule.keys():
-        schedule[day]["classes"] = merge_classes(schedule[day]["classes"])
+    return len(index.teachers)
 
 
-# sort classes by index
-for teacher, schedule in teacher_name_to_schedule_mapping.items():
-    for day in schedule.keys():
-        schedule[day]["classes"].sort(key=lambda c: c["index"])
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument(
+        "-s",
+        "--student_schedules",
+        default="./output_json",
+        help="Path to group schedules produced by parse_schedules",
+    )
+    ap.add_argument(
+        "-t",
+        "--teacher_schedules",
+        default="./teachers_output_json",
+        help="Path to save teacher schedules to",
+    )
+    ap.add_argument(
+        "--format",
+        choices=["pretty", "compact"],
+        default="pretty",
+        help="Format of the saved JSON: 'pretty' is indented, 'compact' has no whitespace (uses orjson if installed). Default is pretty",
+    )
+    ap.add_argument(
+        "-f",
+        "--force",
+        action="store_true",
+        help="Rebuild all teacher schedules, not only the ones affected by changed group schedules",
+    )
+    ap.add_argument(
+        "--aliases",
+        help="Alias map of teacher names (see ParseSchedules.teacher_names), applied if it exists. "
+        "Default is <teacher_schedules>.aliases.json",
+    )
+    ap.add_argument(
+        "--canonicalize",
+        action="store_true",
+        help="Find the variants of teacher names (\"Піх\", \"Піх І.\", typos) and update the alias map first",
+    )
+    args = vars(ap.parse_args())
 
+    from ParseSchedules.teacher_names import TeacherAliases, default_alias_path, update_aliases
 
-# save teacher schedules to json files. The file name should be the teacher's name
-for teacher, schedule in teacher_name_to_schedule_mapping.items():
-    # construct file name
-    file_name = teacher + ".json"
+    path_to_aliases = args["aliases"] or default_alias_path(args["teacher_schedules"])
+    if args["canonicalize"]:
+        aliases = update_aliases(args["student_schedules"], path_to_aliases)
+    else:
+        aliases = TeacherAliases(path_to_aliases)
 
-    # open the file
-    f = open(os.path.join("./teachers_output_json", file_name), "w", encoding="utf8")
+    writer = JsonWriter(args["format"])
+    rewritten = sync_teacher_schedules(
+        args["student_schedules"], args["teacher_schedules"], writer, force=args["force"], aliases=aliases.mapping
+    )
 
-    # write the json
-    f.write(json.dumps(schedule, ensure_ascii=False, indent=4))
+    print(f"[INFO] {rewritten} teacher schedule(s) rewritten in {args['teacher_schedules']}")
+    print(f"[INFO] Output: {writer.report()}")
 
-    # close the file
-    f.close()
 
-pprint(teacher_name_to_schedule_mapping["Шепіта"])
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# a local stand-in for the CMS schedules are published to (see ParseSchedules.publish), for trying the
+# publisher out without touching the real one. Keeps the entries in memory, rejects batches over the size
+# limit like Contentful does, and can be made slow and unreliable:
+#
+#   POST /batch      stores or deletes the entries of a batch
+#   GET  /entries    everything stored: {"<kind>/<name>": {"sha256": ..., "content": ...}}
+#   GET  /stats      requests, batches, failures injected and connections accepted
+#
+# python -m ParseSchedules.mock_cms [-p 8001] [--max-batch 20] [--latency MS] [--fail-rate 0.1]
+
+import argparse
+import json
+import random
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PORT = 8001
+
+
+class MockCMS:
+    """
+    The state of the mock: stored entries and counters.
+
+    Args:
+        max_batch (int): Largest batch accepted, bigger ones get 413.
+        latency (float): Seconds every request takes.
+        fail_rate (float): Share of batches answered with 503 instead of being stored.
+        seed (int): Seed of the failures.
+    """
+
+    def __init__(self, max_batch: int = 20, latency: float = 0.0, fail_rate: float = 0.0, seed: int = 0):
+        self.max_batch = max_batch
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.random = random.Random(seed)
+
+        self.entries: "dict[str, dict]" = {}
+        self.stats = {"requests": 0, "batches": 0, "failures": 0, "connections": 0}
+        self.lock = threading.Lock()
+
+    def store_batch(self, entries: "list[dict]") -> HTTPStatus:
+        with self.lock:
+            self.stats["requests"] += 1
+
+            if len(entries) > self.max_batch:
+                return HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+            if self.random.random() < self.fail_rate:
+                self.stats["failures"] += 1
+                return HTTPStatus.SERVICE_UNAVAILABLE
+
+            for entry in entries:
+                key = f"{entry['kind']}/{entry['name']}"
+                if entry.get("deleted"):
+                    self.entries.pop(key, None)
+                else:
+                    self.entries[key] = {"sha256": entry["sha256"], "content": entry["content"]}
+
+            self.stats["batches"] += 1
+            return HTTPStatus.OK
+
+
+class MockCMSRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    # set by make_mock_server
+    cms: MockCMS
+    verbose = False
+
+    def setup(self):
+        super().setup()
+        with self.cms.lock:
+            self.cms.stats["connections"] += 1
+
+    def send_json(self, status: HTTPStatus, data, headers: "dict[str, str]" = None):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.cms.latency)
+
+        if self.path != "/batch":
+            self.send_json(HTTPStatus.NOT_FOUND, {"error": f"Not found: {self.path}"})
+            return
+
+        try:
+            entries = json.loads(body)["entries"]
+        except (ValueError, KeyError):
+            self.send_json(HTTPStatus.BAD_REQUEST, {"error": "Expected {\"entries\": [...]}"})
+            return
+
+        status = self.cms.store_batch(entries)
+        if status == HTTPStatus.OK:
+            self.send_json(status, {"stored": len(entries)})
+        elif status == HTTPStatus.SERVICE_UNAVAILABLE:
+            self.send_json(status, {"error": "Injected failure"}, {"Retry-After": "0"})
+        else:
+            self.send_json(status, {"error": f"At most {self.cms.max_batch} entries per batch"})
+
+    def do_GET(self):
+        with self.cms.lock:
+            if self.path == "/entries":
+                data = dict(self.cms.entries)
+            elif self.path == "/stats":
+                data = dict(self.cms.stats)
+            else:
+                data = None
+
+        if data is None:
+            self.send_json(HTTPStatus.NOT_FOUND, {"error": f"Not found: {self.path}"})
+        else:
+            self.send_json(HTTPStatus.OK, data)
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+def make_mock_server(cms: MockCMS, host: str = "127.0.0.1", port: int = DEFAULT_PORT, verbose: bool = False) -> ThreadingHTTPServer:
+    """
+    Creates a server for the mock. Port 0 picks a free port, see server.server_address.
+    """
+    handler = type("Handler", (MockCMSRequestHandler,), {"cms": cms, "verbose": verbose})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1", help="Address to listen on. Default is 127.0.0.1")
+    ap.add_argument("-p", "--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on. Default is {DEFAULT_PORT}")
+    ap.add_argument("--max-batch", dest="max_batch", type=int, default=20, help="Largest batch accepted. Default is 20")
+    ap.add_argument("--latency", type=float, default=0, help="Milliseconds every request takes. Default is 0")
+    ap.add_argument("--fail-rate", dest="fail_rate", type=float, default=0, help="Share of batches failed with 503. Default is 0")
+    ap.add_argument("-v", "--verbose", action="store_true", help="Log every request")
+    args = vars(ap.parse_args())
+
+    cms = MockCMS(args["max_batch"], args["latency"] / 1000, args["fail_rate"])
+    server = make_mock_server(cms, args["host"], args["port"], args["verbose"])
+    host, port = server.server_address[:2]
+    print(f"[INFO] Mock CMS on http://{host}:{port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"[INFO] Stopped, {len(cms.entries)} entries stored, {cms.stats}")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,30 @@
+import math
 from typing import List, Optional
 
 
+def _none_if_nan(value):
+    # pandas marks missing values with NaN, json expects null
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _column_values(df, column: str) -> list:
+    if column not in df.columns:
+        return [None] * len(df)
+
+    values = df[column].tolist()
+
+    # only float and object columns can hold NaN
+    if df[column].dtype.kind not in "fO":
+        return values
+
+    return [_none_if_nan(value) for value in values]
+
+
 class Lesson:
+    __slots__ = ("index", "name", "room", "qualification", "teacher", "label", "isBiweekly", "week")
+
     def __init__(
         self,
         index: int,
@@ -22,13 +45,53 @@ class Lesson:
         self.isBiweekly = isBiweekly
         self.week = week
 
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in Lesson.__slots__}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Lesson":
+        """
+        Creates a lesson from its dict representation. Keys that aren't lesson fields (e.g. "group") are ignored.
+        """
+        return cls(**{field: d[field] for field in Lesson.__slots__ if field in d})
+
+    @classmethod
+    def from_records(cls, df) -> "List[Lesson]":
+        """
+        Creates lessons directly from the columns of a DataFrame, one lesson per row.
+        Missing values become None.
+
+        Args:
+            df (pandas.DataFrame): Columns index, name, room, qualification, teacher, label
+                and, optionally, isBiweekly and week.
+
+        Returns:
+            list[Lesson]: The lessons.
+        """
+        columns = [_column_values(df, field) for field in Lesson.__slots__]
+
+        return [cls(*values) for values in zip(*columns)]
+
 
 class DaySchedule:
+    __slots__ = ("classes",)
+
     def __init__(self, classes: List[Lesson]):
         self.classes = classes
 
+    def to_dict(self) -> dict:
+        return {"classes": [lesson.to_dict() for lesson in self.classes]}
+
+    @classmethod
+    def from_dict(cls, d) -> "DaySchedule":
+        # days without classes are saved as empty lists
+        classes = d.get("classes", []) if d else []
+        return cls([Lesson.from_dict(lesson) for lesson in classes])
+
 
 class WeeklySchedule:
+    __slots__ = ("monday", "tuesday", "wednesday", "thursday", "friday")
+
     def __init__(
         self,
         monday: DaySchedule,
@@ -42,3 +105,10 @@ class WeeklySchedule:
         self.wednesday = wednesday
         self.thursday = thursday
         self.friday = friday
+
+    def to_dict(self) -> dict:
+        return {day: getattr(self, day).to_dict() for day in WeeklySchedule.__slots__}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "WeeklySchedule":
+        return cls(**{day: DaySchedule.from_dict(d.get(day)) for day in WeeklySchedule.__slots__})
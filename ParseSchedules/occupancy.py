@@ -0,0 +1,308 @@
+# finds mistakes of the Word documents that reach students: two groups put into the same room, or one teacher
+# into two places, in the same pair. The lessons of all groups are turned once into occupancy arrays over
+# (room or teacher) x day x pair x week, and conflicts and "which rooms are free" become array operations.
+# Run after parsing by parse_schedules, or on its own:
+#
+# python -m ParseSchedules.occupancy [-s output_json] [--free-rooms DAY PAIR] [--week 1|2]
+
+import argparse
+import time
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ParseSchedules.extract_teacher_schedules import iter_group_schedules, iter_lesson_dicts
+from ParseSchedules.utilities import days_eng_lower, pair_number
+
+ROOMS = "room"
+TEACHERS = "teacher"
+
+# a lesson without a week happens on both
+WEEKS = 2
+
+LESSON_FIELDS = ("group", "day", "index", "name", "room", "teacher", "week")
+
+
+def _codes(values: list) -> "tuple[np.ndarray, list]":
+    """
+    Numbers the distinct values in order of appearance.
+
+    Returns:
+        tuple[numpy.ndarray, list]: The number of every value and the distinct values.
+    """
+    ids = {}
+    codes = np.fromiter((ids.setdefault(value, len(ids)) for value in values), np.intp, len(values))
+    return codes, list(ids)
+
+
+class Occupancy:
+    """
+    The slots of one kind of occupant (rooms or teachers).
+
+    counts[occupant, day, pair, week] is how many different lessons take the slot: 0 is free, 1 is fine,
+    more is a conflict. A lecture shared by several groups is one lesson, as its rows are the same
+    (same name and teacher for a room, same name and room for a teacher).
+
+    Args:
+        names (list[str]): The occupants.
+        occupant (numpy.ndarray): Occupant of every row, an index into names.
+        lesson (numpy.ndarray): Lesson of every row, an index into the lessons of the index.
+        day, pair, week (numpy.ndarray): Slot of every row. week is 0 or 1.
+        key (numpy.ndarray): Rows with the same key and slot are the same lesson.
+        n_pairs (int): Pairs per day, i.e. the largest pair + 1.
+    """
+
+    def __init__(self, names: "List[str]", occupant, lesson, day, pair, week, key, n_pairs: int):
+        self.names = names
+        self.ids = {name: i for i, name in enumerate(names)}
+        # for listing free occupants in order without sorting every time
+        self.order = np.argsort(np.asarray(names, dtype=object), kind="stable") if names else np.zeros(0, np.intp)
+        self.sorted_names = [names[i] for i in self.order]
+        self.n_pairs = n_pairs
+
+        shape = (len(names), len(days_eng_lower), n_pairs, WEEKS)
+        self.slot = np.ravel_multi_index((occupant, day, pair, week), shape)
+        self.lesson = lesson
+
+        # one row per different lesson in a slot, then the number of them per slot
+        n_keys = int(key.max()) + 1 if len(key) else 1
+        distinct = np.unique(self.slot.astype(np.int64) * n_keys + key) // n_keys
+        self.counts = np.bincount(distinct, minlength=int(np.prod(shape))).reshape(shape)
+        self.occupied = self.counts > 0
+
+    def taken(self, day: str, pair: int, week: Optional[int] = None) -> np.ndarray:
+        """
+        Returns:
+            numpy.ndarray: Whether each occupant is busy on the day and pair, on the week or on either week.
+        """
+        if not 0 <= pair < self.n_pairs:
+            return np.zeros(len(self.names), bool)
+
+        slots = self.occupied[:, days_eng_lower.index(day), pair]
+        return slots.any(axis=1) if week is None else slots[:, week - 1]
+
+    def free(self, day: str, pair: int, week: Optional[int] = None) -> "List[str]":
+        free = ~self.taken(day, pair, week)[self.order]
+        return [name for name, is_free in zip(self.sorted_names, free.tolist()) if is_free]
+
+    def conflict_slots(self) -> "Tuple[np.ndarray, ...]":
+        """
+        Returns:
+            tuple[numpy.ndarray, ...]: occupant, day, pair and week of every slot taken by more than one lesson.
+        """
+        return np.nonzero(self.counts > 1)
+
+
+class OccupancyIndex:
+    """
+    Occupancy of rooms and teachers, built from the lessons of all groups.
+
+    Args:
+        schedules (Iterable[tuple[str, WeeklySchedule]]): Group name and schedule, as built by the parser
+            or read from a group file (either the models or their dicts).
+    """
+
+    def __init__(self, schedules: "Iterable[Tuple[str, object]]"):
+        # one tuple of LESSON_FIELDS per lesson
+        self.lessons: "List[tuple]" = []
+        # lessons whose index isn't a pair number ("1-2"), they can't be put into a slot
+        self.skipped: "List[dict]" = []
+        days, pairs = [], []
+
+        for group, schedule in schedules:
+            for day, lesson in iter_lesson_dicts(schedule):
+                day_number = days_eng_lower.index(day)
+                if lesson.get("index") is None:
+                    continue
+                pair = pair_number(lesson["index"])
+                if pair is None:
+                    self.skipped.append({"group": group, "day": day, **lesson})
+                    continue
+
+                self.lessons.append(
+                    (group, day, lesson["index"], lesson.get("name"), lesson.get("room"), lesson.get("teacher"), lesson.get("week"))
+                )
+                days.append(day_number)
+                pairs.append(pair)
+
+        _, _, _, names, rooms, teachers, weeks = zip(*self.lessons) if self.lessons else ([],) * len(LESSON_FIELDS)
+
+        day = np.array(days, np.intp)
+        pair = np.array(pairs, np.intp)
+        # 0 is every week
+        week = np.array([week or 0 for week in weeks], np.intp)
+        n_pairs = int(pair.max()) + 1 if len(pair) else 1
+
+        room_key, _ = _codes(list(zip(names, teachers)))
+        teacher_key, _ = _codes(list(zip(names, rooms)))
+
+        # a lesson can be in several rooms ("а.101|а.102") and have several teachers ("Піх|Сабат"), each of them is busy
+        room_rows = [(i, room) for i, lesson_rooms in enumerate(rooms) if lesson_rooms is not None for room in lesson_rooms.split("|")]
+        teacher_rows = [(i, teacher) for i, lesson_teachers in enumerate(teachers) if lesson_teachers is not None for teacher in lesson_teachers.split("|")]
+
+        self.occupancies = {
+            ROOMS: self._occupancy(room_rows, day, pair, week, room_key, n_pairs),
+            TEACHERS: self._occupancy(teacher_rows, day, pair, week, teacher_key, n_pairs),
+        }
+
+    @staticmethod
+    def _occupancy(rows: "List[tuple]", day, pair, week, key, n_pairs: int) -> Occupancy:
+        lesson = np.fromiter((i for i, _ in rows), np.intp, len(rows))
+        occupant, names = _codes([name for _, name in rows])
+
+        # a weekly lesson takes the slot on both weeks, a biweekly one on its own week
+        lesson_week = week[lesson]
+        on_first, on_second = lesson_week != 2, lesson_week != 1
+        rows_by_week = [(on_first, 0), (on_second, 1)]
+
+        def both_weeks(values):
+            return np.concatenate([values[mask] for mask, _ in rows_by_week])
+
+        return Occupancy(
+            names,
+            both_weeks(occupant),
+            both_weeks(lesson),
+            both_weeks(day[lesson]),
+            both_weeks(pair[lesson]),
+            np.concatenate([np.full(np.count_nonzero(mask), w, np.intp) for mask, w in rows_by_week]),
+            both_weeks(key[lesson]),
+            n_pairs,
+        )
+
+    def lesson(self, i: int) -> dict:
+        return dict(zip(LESSON_FIELDS, self.lessons[i]))
+
+    @property
+    def rooms(self) -> Occupancy:
+        return self.occupancies[ROOMS]
+
+    @property
+    def teachers(self) -> Occupancy:
+        return self.occupancies[TEACHERS]
+
+    def free_rooms(self, day: str, pair: int, week: Optional[int] = None) -> "List[str]":
+        """
+        Rooms that have lessons at some point of the week, but not on this day and pair.
+
+        Args:
+            day (str): "monday" to "friday".
+            pair (int): The index of the lesson.
+            week (int, optional): 1 or 2. Without it, a room busy on either week isn't free.
+
+        Returns:
+            list[str]: The rooms, sorted.
+        """
+        return self.rooms.free(day, pair, week)
+
+    def conflicts(self, kind: Optional[str] = None) -> "List[dict]":
+        """
+        Finds rooms taken by, and teachers put into, two different lessons at the same time.
+
+        Args:
+            kind (str, optional): "room" or "teacher". Both by default.
+
+        Returns:
+            list[dict]: {"kind", "name", "day", "index", "weeks", "lessons"}, one per occupant and pair. weeks are the
+            weeks (1, 2) of the clash, lessons the clashing lessons with their "group".
+        """
+        conflicts = []
+        for occupancy_kind, occupancy in self.occupancies.items():
+            if kind is not None and kind != occupancy_kind:
+                continue
+
+            occupant, day, pair, week = occupancy.conflict_slots()
+            if not len(occupant):
+                continue
+
+            # the distinct lessons of every clashing slot, in slot order
+            clashing = np.ravel_multi_index((occupant, day, pair, week), occupancy.counts.shape)
+            rows = np.isin(occupancy.slot, clashing)
+            n_lessons = max(len(self.lessons), 1)
+            slot_lessons = np.unique(occupancy.slot[rows].astype(np.int64) * n_lessons + occupancy.lesson[rows])
+            slots, lessons = np.divmod(slot_lessons, n_lessons)
+            # clashing is sorted too, so the lessons of the i-th clashing slot are the i-th run
+            bounds = [0] + (np.flatnonzero(np.diff(slots)) + 1).tolist() + [len(slots)]
+            lessons = lessons.tolist()
+            lessons_by_slot = [lessons[start:end] for start, end in zip(bounds, bounds[1:])]
+
+            # the same clash on both weeks is reported once
+            by_pair = {}
+            for slot_lessons, o, d, p, w in zip(lessons_by_slot, occupant.tolist(), day.tolist(), pair.tolist(), week.tolist()):
+                conflict = by_pair.setdefault(
+                    (o, d, p),
+                    {"kind": occupancy_kind, "name": occupancy.names[o], "day": days_eng_lower[d], "index": p, "weeks": [], "lessons": {}},
+                )
+                conflict["weeks"].append(w + 1)
+                conflict["lessons"].update(dict.fromkeys(slot_lessons))
+
+            for conflict in by_pair.values():
+                conflict["lessons"] = [self.lesson(lesson) for lesson in sorted(conflict["lessons"])]
+
+            conflicts.extend(by_pair[key] for key in sorted(by_pair, key=lambda key: (key[1], key[2], occupancy.names[key[0]])))
+
+        return conflicts
+
+
+def read_occupancy(path_to_student_schedules: str = "output_json") -> OccupancyIndex:
+    return OccupancyIndex(iter_group_schedules(path_to_student_schedules))
+
+
+def check_conflicts(path_to_student_schedules: str = "output_json") -> "List[dict]":
+    """
+    Validates the group schedules: prints every room taken by two lessons at once and every teacher
+    put into two places at once.
+
+    Returns:
+        list[dict]: The conflicts, see OccupancyIndex.conflicts.
+    """
+    started_at = time.perf_counter()
+    index = read_occupancy(path_to_student_schedules)
+    conflicts = index.conflicts()
+
+    for lesson in index.skipped:
+        print(f"[WARNING] Skipped {lesson['group']}, {lesson['day']} pair {lesson['index']!r} ({lesson.get('name')}): the pair isn't a number")
+    for conflict in conflicts:
+        weeks = "" if conflict["weeks"] == [1, 2] else f", week {conflict['weeks'][0]}"
+        lessons = "; ".join(f"{lesson['group']} ({lesson['name']})" for lesson in conflict["lessons"])
+        print(f"[WARNING] {conflict['kind'].capitalize()} {conflict['name']}, {conflict['day']} pair {conflict['index']}{weeks}: {lessons}")
+
+    n_rooms = sum(1 for conflict in conflicts if conflict["kind"] == ROOMS)
+    print(
+        f"[INFO] Checked {len(index.lessons)} lesson(s) in {time.perf_counter() - started_at:.3f}s: "
+        f"{n_rooms} room and {len(conflicts) - n_rooms} teacher conflict(s)"
+    )
+    return conflicts
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument(
+        "-s",
+        "--student_schedules",
+        default="./output_json",
+        help="Path to group schedules produced by parse_schedules",
+    )
+    ap.add_argument(
+        "--free-rooms",
+        dest="free_rooms",
+        nargs=2,
+        metavar=("DAY", "PAIR"),
+        help="Print the rooms free on a day (monday to friday) and pair instead of checking for conflicts",
+    )
+    ap.add_argument("--week", type=int, choices=[1, 2], help="Week of --free-rooms. Without it, rooms busy on either week aren't free")
+    args = vars(ap.parse_args())
+
+    if args["free_rooms"]:
+        day, pair = args["free_rooms"]
+        if day not in days_eng_lower:
+            ap.error(f"DAY must be one of {', '.join(days_eng_lower)}")
+
+        rooms = read_occupancy(args["student_schedules"]).free_rooms(day, int(pair), args["week"])
+        print(f"[INFO] {len(rooms)} free room(s): {', '.join(rooms)}")
+        return
+
+    check_conflicts(args["student_schedules"])
+
+
+if __name__ == "__main__":
+    main()
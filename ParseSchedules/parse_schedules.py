@@ -1,82 +1,310 @@
-import os
-
 import argparse
 
+# only argparse is imported up front, so --help and importing this module stay fast.
+# pandas, the readers and the rest of the parser are imported in main(), once there is something to parse
 
-import logging
-import warnings
-from pandas.errors import SettingWithCopyWarning
 
-from ParseSchedules.core import extract_all_schedules
+def non_negative_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a whole number, got {value!r}")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {number}")
+    return number
 
-# Disable pandas' SettingWithCopyWarning and FutureWarning
-warnings.filterwarnings("ignore", category=SettingWithCopyWarning)
-warnings.filterwarnings("ignore", category=FutureWarning)
-# warnings.resetwarnings()
 
-# construct the argument parser and parse the arguments
+def positive_int(value: str) -> int:
+    number = non_negative_int(value)
+    if number == 0:
+        raise argparse.ArgumentTypeError("must be at least 1, got 0")
+    return number
 
-ap = argparse.ArgumentParser()
-ap.add_argument(
-    "-w",
-    "--word_schedules",
-    default="ParseSchedules/word_schedules",
-    help="Path to .docx files with schedules",
-)
 
-ap.add_argument(
-    "-g",
-    "--group_into_folders",
-    action="store_true",
-    help="Chunk output into folders. Specify the number of schedules per folder with --schedules_per_folder (default is 20)",
-)
+def build_argument_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser()
+    ap.add_argument(
+        "-w",
+        "--word_schedules",
+        default="ParseSchedules/word_schedules",
+        help="Path to .docx files with schedules",
+    )
 
-ap.add_argument(
-    "-n",
-    "--schedules_per_folder",
-    type=int,
-    default=20,
-    help="Number of schedules per folder. Only used if --group_into_folders is True",
-)
+    ap.add_argument(
+        "-r",
+        "--reader",
+        choices=["native", "pydocx"],
+        default="native",
+        help="How tables are read from .docx files: 'native' reads the document XML directly, 'pydocx' converts to HTML first. Default is native",
+    )
 
-ap.add_argument(
-    "-v",
-    "--verbose",
-    action="store_true",
-    help="Include more info in the output. Default is False",
-)
+    ap.add_argument(
+        "-j",
+        "--jobs",
+        type=non_negative_int,
+        default=1,
+        help="Number of worker processes to parse documents with. 0 means one per CPU core. Default is 1",
+    )
 
-args = vars(ap.parse_args())
+    ap.add_argument(
+        "--io-concurrency",
+        dest="io_concurrency",
+        type=int,
+        default=0,
+        help="Overlap reading documents, parsing them (with --jobs processes) and writing the results, "
+        "with up to this many files read or written at once. Helps on slow or network storage. 0 (default) disables it",
+    )
 
-# Configure the logging module
+    ap.add_argument(
+        "-f",
+        "--force",
+        action="store_true",
+        help="Re-parse all documents, even the ones that haven't changed since the last run",
+    )
 
-logging_level = logging.NOTSET if args["verbose"] else logging.ERROR
-logging.basicConfig(level=logging_level)
+    ap.add_argument(
+        "--format",
+        choices=["pretty", "compact"],
+        default="pretty",
+        help="Format of the saved JSON: 'pretty' is indented, 'compact' has no whitespace (uses orjson if installed). Default is pretty",
+    )
 
-path_to_doc_schedules: str = args["word_schedules"]
+    ap.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and re-parse documents as they change, updating the affected teacher schedules too",
+    )
 
-group_into_folders: bool = args["group_into_folders"]
-group_size: int = args["schedules_per_folder"]
-            
+    ap.add_argument(
+        "-t",
+        "--teacher_schedules",
+        default="teachers_output_json",
+        help="Path to teacher schedules kept up to date in --watch mode",
+    )
+
+    ap.add_argument(
+        "--no-conflict-check",
+        dest="conflict_check",
+        action="store_false",
+        help="Don't check the parsed schedules for rooms taken by two lessons, or teachers put into two places, "
+        "at the same time (see ParseSchedules.occupancy)",
+    )
+
+    ap.add_argument(
+        "--database",
+        help="Also keep the lessons of all groups in this SQLite database, for queries by room, teacher, group "
+        "and time slot (see ParseSchedules.database). Only changed groups are reloaded",
+    )
+
+    ap.add_argument(
+        "--export",
+        metavar="DIR",
+        help="Also export the lessons of all groups into a Parquet dataset in DIR, partitioned by --semester, "
+        "for analytics (see ParseSchedules.export). Needs pyarrow",
+    )
+
+    ap.add_argument(
+        "--semester",
+        help="Semester of the schedules for --export, e.g. 2023-2024-1. Its partition is replaced, others are kept. "
+        "Default is the current semester",
+    )
+
+    ap.add_argument(
+        "--publish",
+        metavar="URL",
+        help="Upload the group schedules (and teacher schedules, if there are any) that changed since they were last "
+        "published to the CMS at URL, in batches of --batch-size (see ParseSchedules.publish). "
+        "The bearer token is read from the PUBLISH_TOKEN environment variable",
+    )
+
+    ap.add_argument(
+        "--batch-size",
+        dest="batch_size",
+        type=int,
+        default=20,
+        help="Schedules per upload request of --publish. Default is 20, the most Contentful takes at once",
+    )
+
+    ap.add_argument(
+        "--publish-concurrency",
+        dest="publish_concurrency",
+        type=positive_int,
+        default=4,
+        help="Upload requests of --publish in flight at once. Default is 4",
+    )
+
+    ap.add_argument(
+        "--publish-retries",
+        dest="publish_retries",
+        type=non_negative_int,
+        default=5,
+        help="Retries of a failed upload, with exponential backoff. Default is 5",
+    )
+
+    ap.add_argument(
+        "--publish-state",
+        dest="publish_state",
+        default=".publish_state.json",
+        help="Where the hashes of published schedules are kept, to skip unchanged ones. Default is .publish_state.json",
+    )
+
+    ap.add_argument(
+        "--profile-report",
+        dest="profile_report",
+        help="Save how long each stage took, per document (and per group for writing the files), to this file. CSV if it ends with .csv, JSON otherwise",
+    )
+
+    ap.add_argument(
+        "--cprofile",
+        metavar="DIR",
+        help="Profile each stage with cProfile and save the stats to DIR as <stage>.pstats files",
+    )
+
+    ap.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Include more info in the output. Default is False",
+    )
+
+    return ap
+
+
+def main(argv=None):
+    ap = build_argument_parser()
+    args = vars(ap.parse_args(argv))
+
+    if args["io_concurrency"] < 0:
+        ap.error("--io-concurrency can't be negative")
+
+    if args["batch_size"] < 1:
+        ap.error("--batch-size must be at least 1")
+
+    if args["export"]:
+        import importlib.util
+
+        # found out before parsing rather than after it
+        if importlib.util.find_spec("pyarrow") is None:
+            ap.error("--export needs the pyarrow package: pip install pyarrow")
+
+    import logging
+    import warnings
+    from pandas.errors import SettingWithCopyWarning
+
+    from ParseSchedules.cache import DEFAULT_CACHE_PATH
+    from ParseSchedules.core import extract_all_schedules, find_doc_schedules
+    from ParseSchedules import profiling
+    from ParseSchedules.profiling import profiler
+
+    # Disable pandas' SettingWithCopyWarning and FutureWarning
+    warnings.filterwarnings("ignore", category=SettingWithCopyWarning)
+    warnings.filterwarnings("ignore", category=FutureWarning)
+
+    # Configure the logging module
+
+    logging_level = logging.NOTSET if args["verbose"] else logging.ERROR
+    logging.basicConfig(level=logging_level)
+
+    path_to_doc_schedules: str = args["word_schedules"]
+
+    reader: str = args["reader"]
+    jobs: int = args["jobs"]
+    io_concurrency: int = args["io_concurrency"]
+    force: bool = args["force"]
+    output_format: str = args["format"]
+    watch: bool = args["watch"]
+    path_to_teacher_schedules: str = args["teacher_schedules"]
+    profile_report: str = args["profile_report"]
+    cprofile_dir: str = args["cprofile"]
+    path_to_database: str = args["database"]
+    conflict_check: bool = args["conflict_check"]
+    path_to_export: str = args["export"]
+    semester: str = args["semester"]
+    publish_url: str = args["publish"]
+
+    if profile_report or cprofile_dir:
+        profiling.enable(cprofile=bool(cprofile_dir))
+
+    doc_schedules = find_doc_schedules(path_to_doc_schedules)
 
-if __name__ == "__main__":
-    
-    doc_schedules = os.listdir(path_to_doc_schedules)
-
-    # filter out non-word documents
-    doc_schedules = [doc for doc in doc_schedules if doc.endswith(".docx")]
-
-    # filter out opened word documents
-    doc_schedules = [doc for doc in doc_schedules if not doc.startswith("~$")]
-    
-    # create full paths
-    doc_schedules = [os.path.join(path_to_doc_schedules, doc) for doc in doc_schedules]
-    
     extract_all_schedules(
         doc_schedules,
-        group_into_folders,
-        group_size
+        reader,
+        jobs,
+        DEFAULT_CACHE_PATH,
+        force,
+        output_format,
+        io_concurrency,
     )
-    
-    
-warnings.resetwarnings()
+
+    if conflict_check:
+        from ParseSchedules.occupancy import check_conflicts
+
+        check_conflicts("output_json")
+
+    if path_to_database:
+        from ParseSchedules.database import sync_database
+
+        sync_database("output_json", path_to_database)
+
+    if path_to_export:
+        from ParseSchedules.export import export_lessons
+
+        export_lessons("output_json", path_to_export, semester)
+
+    if publish_url:
+        import os
+        import sys
+        from ParseSchedules.bundle import GROUPS, TEACHERS
+        from ParseSchedules.publish import PublishError, publish_schedules
+
+        directories = {GROUPS: "output_json"}
+        if os.path.isdir(path_to_teacher_schedules):
+            directories[TEACHERS] = path_to_teacher_schedules
+
+        try:
+            publish_schedules(
+                publish_url,
+                directories,
+                args["publish_state"],
+                args["batch_size"],
+                args["publish_concurrency"],
+                args["publish_retries"],
+                token=os.environ.get("PUBLISH_TOKEN"),
+            )
+        except PublishError as e:
+            print(f"[ERROR] {e}")
+            sys.exit(1)
+
+    if profile_report:
+        profiler.write_report(profile_report)
+        print(f"[INFO] Profile report saved to {profile_report}")
+
+    if cprofile_dir:
+        pstats_paths = profiler.dump_pstats(cprofile_dir)
+        print(f"[INFO] {len(pstats_paths)} stage profile(s) saved to {cprofile_dir}")
+
+    if profiler.enabled:
+        print("[INFO] Slowest stages:")
+        slowest = sorted(profiler.summary().items(), key=lambda item: item[1]["total"], reverse=True)
+        for stage, timing in slowest[:5]:
+            print(f"[INFO]   {stage}: {timing['total']:.3f}s in {timing['count']} run(s)")
+
+    if watch:
+        from ParseSchedules.watch import watch_schedules
+
+        watch_schedules(
+            path_to_doc_schedules,
+            path_to_teacher_schedules,
+            reader,
+            output_format,
+            path_to_database=path_to_database,
+            jobs=jobs,
+            io_concurrency=io_concurrency,
+        )
+
+    warnings.resetwarnings()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# runs documents through three overlapping stages connected by bounded queues:
+#
+#   read .docx bytes (asyncio + I/O threads) -> parse (CPU executor) -> save outputs (asyncio + I/O threads)
+#
+# while one document is being parsed, the next ones are already being read and the previous one is being written,
+# so slow storage (e.g. a network share) doesn't leave the CPU idle. The queues are bounded, so a slow stage makes
+# the ones before it wait instead of piling documents up in memory. Documents are saved in the order they were given,
+# the same order the serial path saves them in
+
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from ParseSchedules.serialization import write_atomically
+
+# writes (path, data) pairs, at most io_concurrency at once
+WriteFiles = Callable[["List[Tuple[str, bytes]]"], Awaitable[None]]
+
+
+def read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class Pipeline:
+    """
+    Reads, parses and saves documents with the stages overlapping.
+
+    Args:
+        parse (Callable[[str, bytes], object]): Parses a document from its path and contents. Runs in the CPU executor,
+            so with a process pool it has to be picklable (a module-level function or a functools.partial of one).
+        save (Callable[[str, object, WriteFiles], Awaitable[None]]): Saves the result of parse. Runs in the event loop,
+            one document at a time and in order. Gets a function to write files through the I/O threads.
+        jobs (int): Parser processes. 1 parses in a single thread, 0 uses one process per CPU core.
+        io_concurrency (int): Files read or written at once. Also the number of documents read ahead.
+        initializer (Callable, optional): Passed to the process pool.
+        initargs (tuple): Passed to the process pool.
+    """
+
+    def __init__(
+        self,
+        parse: "Callable[[str, bytes], object]",
+        save: "Callable[[str, object, WriteFiles], Awaitable[None]]",
+        jobs: int = 1,
+        io_concurrency: int = 4,
+        initializer: Optional[Callable] = None,
+        initargs: tuple = (),
+    ):
+        if io_concurrency < 1:
+            raise ValueError("io_concurrency must be at least 1")
+
+        self.parse = parse
+        self.save = save
+        self.jobs = jobs
+        self.io_concurrency = io_concurrency
+        self.initializer = initializer
+        self.initargs = initargs
+
+    def run(self, paths: "List[str]"):
+        asyncio.run(self._run(paths))
+
+    def _cpu_executor(self) -> Executor:
+        if self.jobs == 1:
+            # parsing mostly waits for the GIL-free I/O of the other stages, one thread is enough to overlap them
+            return ThreadPoolExecutor(max_workers=1, thread_name_prefix="parse")
+        return ProcessPoolExecutor(max_workers=self.jobs or None, initializer=self.initializer, initargs=self.initargs)
+
+    async def _run(self, paths: "List[str]"):
+        loop = asyncio.get_running_loop()
+        io_limit = asyncio.Semaphore(self.io_concurrency)
+
+        # read-ahead and parse-ahead. Each holds futures, so put() waits while the next stage is behind
+        read_queue: "asyncio.Queue" = asyncio.Queue(maxsize=self.io_concurrency)
+        parse_queue: "asyncio.Queue" = asyncio.Queue(maxsize=self.jobs or os.cpu_count() or 1)
+
+        with ThreadPoolExecutor(max_workers=self.io_concurrency, thread_name_prefix="io") as io_executor, \
+                self._cpu_executor() as cpu_executor:
+
+            async def read(path: str) -> bytes:
+                async with io_limit:
+                    return await loop.run_in_executor(io_executor, read_bytes, path)
+
+            async def write(path: str, data: bytes):
+                async with io_limit:
+                    await loop.run_in_executor(io_executor, write_atomically, path, data)
+
+            async def write_files(files: "List[Tuple[str, bytes]]"):
+                await asyncio.gather(*(write(path, data) for path, data in files))
+
+            async def read_stage():
+                for path in paths:
+                    await read_queue.put((path, asyncio.ensure_future(read(path))))
+                await read_queue.put(None)
+
+            async def parse_stage():
+                while True:
+                    item = await read_queue.get()
+                    if item is None:
+                        break
+
+                    path, data = item
+                    parsed = loop.run_in_executor(cpu_executor, self.parse, path, await data)
+                    await parse_queue.put((path, parsed))
+                await parse_queue.put(None)
+
+            async def save_stage():
+                while True:
+                    item = await parse_queue.get()
+                    if item is None:
+                        break
+
+                    path, parsed = item
+                    await self.save(path, await parsed, write_files)
+
+            stages = [asyncio.ensure_future(stage()) for stage in (read_stage, parse_stage, save_stage)]
+            try:
+                await asyncio.gather(*stages)
+            except BaseException:
+                # e.g. a document without groups. Stop reading and parsing the rest, like the serial path does
+                for stage in stages:
+                    stage.cancel()
+                await asyncio.gather(*stages, return_exceptions=True)
+                cpu_executor.shutdown(wait=False, cancel_futures=True)
+                raise
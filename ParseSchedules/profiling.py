@@ -0,0 +1,161 @@
+# times the stages of the pipeline per document and per group, and optionally profiles each stage with cProfile.
+# Parsing handles all groups of a document at once, so only the stages that run for one group (saving its file) have a group
+# Stages are no-ops until the profiler is enabled, so the parser doesn't pay for them otherwise
+
+import contextlib
+import cProfile
+import csv
+import io
+import json
+import os
+import threading
+import time
+from typing import Iterator, List, Optional
+
+from ParseSchedules.serialization import write_atomically
+
+# reused for every stage while profiling is disabled
+_NO_OP = contextlib.nullcontext()
+
+report_columns = ["document", "group", "stage", "seconds"]
+
+
+class StageProfiler:
+    """
+    Collects how long each stage took, along with the document and group it ran for.
+
+    Stages nest: a stage started inside another one is recorded as "parent/child" and inherits
+    the document and group of its parent. With cProfile enabled, every stage gets its own profile.
+    A parent's profile is paused while a child runs, so each profile only covers its own stage.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.cprofile = False
+        self.records: "List[dict]" = []
+        self.profiles: "dict[str, cProfile.Profile]" = {}
+        # stages can run in several threads at once (see pipeline), each one nests its own stages
+        self._local = threading.local()
+
+    def enable(self, cprofile: bool = False):
+        # starts from scratch. Forked worker processes would otherwise inherit the records of the main one
+        self.enabled = True
+        self.cprofile = cprofile
+        self.records = []
+        self.profiles = {}
+
+    def stage(self, name: str, document: Optional[str] = None, group: Optional[str] = None):
+        """
+        Times the code in a with block as a stage.
+
+        Args:
+            name (str): Name of the stage.
+            document (str, optional): The document the stage runs for. Inherited from the parent stage by default.
+            group (str, optional): The group the stage runs for. Inherited from the parent stage by default.
+        """
+        if not self.enabled:
+            return _NO_OP
+        return self._timed(name, document, group)
+
+    @property
+    def _stack(self) -> "List[tuple]":
+        # (stage path, document, group) of the stages running in this thread
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextlib.contextmanager
+    def _timed(self, name: str, document: Optional[str], group: Optional[str]) -> "Iterator[None]":
+        parent = self._stack[-1] if self._stack else None
+        if parent is not None:
+            name = f"{parent[0]}/{name}"
+            document = document or parent[1]
+            group = group or parent[2]
+
+        # added now, so records are in the order the stages started
+        record = {"document": document, "group": group, "stage": name, "seconds": None}
+        self.records.append(record)
+        self._stack.append((name, document, group))
+
+        profile = None
+        if self.cprofile:
+            if parent is not None:
+                self.profiles[parent[0]].disable()
+            profile = self.profiles.setdefault(name, cProfile.Profile())
+            profile.enable()
+
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            record["seconds"] = time.perf_counter() - started_at
+
+            if profile is not None:
+                profile.disable()
+                if parent is not None:
+                    self.profiles[parent[0]].enable()
+
+            self._stack.pop()
+
+    def take_records(self) -> "List[dict]":
+        # hands the records over, e.g. from a worker process to the main one
+        records, self.records = self.records, []
+        return records
+
+    def summary(self) -> "dict[str, dict]":
+        """
+        Returns:
+            dict[str, dict]: Stage -> count, total, mean and max seconds, in the order stages first ran.
+        """
+        summary: "dict[str, dict]" = {}
+        for record in self.records:
+            stage = summary.setdefault(record["stage"], {"count": 0, "total": 0.0, "max": 0.0})
+            stage["count"] += 1
+            stage["total"] += record["seconds"]
+            stage["max"] = max(stage["max"], record["seconds"])
+
+        for stage in summary.values():
+            stage["mean"] = stage["total"] / stage["count"]
+
+        return summary
+
+    def write_report(self, path: str):
+        """
+        Saves every record, as CSV if path ends with .csv, otherwise as JSON along with the summary.
+        """
+        if path.lower().endswith(".csv"):
+            buffer = io.StringIO()
+            report = csv.DictWriter(buffer, fieldnames=report_columns, lineterminator="\n")
+            report.writeheader()
+            report.writerows(self.records)
+            data = buffer.getvalue().encode("utf-8")
+        else:
+            report = {"summary": self.summary(), "records": self.records}
+            data = json.dumps(report, ensure_ascii=False, indent=4).encode("utf-8")
+
+        write_atomically(path, data)
+
+    def dump_pstats(self, directory: str) -> "List[str]":
+        """
+        Saves the cProfile stats of each stage to directory/<stage>.pstats ("/" in nested stage names becomes ".").
+        Load them with pstats.Stats(path) or snakeviz.
+
+        Returns:
+            list[str]: Paths of the saved files.
+        """
+        os.makedirs(directory, exist_ok=True)
+
+        paths = []
+        for name, profile in self.profiles.items():
+            path = os.path.join(directory, name.replace("/", ".") + ".pstats")
+            profile.dump_stats(path)
+            paths.append(path)
+        return paths
+
+
+profiler = StageProfiler()
+
+
+def enable(cprofile: bool = False):
+    # module-level, so it can be a ProcessPoolExecutor initializer
+    profiler.enable(cprofile)
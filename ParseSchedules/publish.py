@@ -0,0 +1,397 @@
+# uploads the group and teacher schedules to the CMS the viewer reads them from, in batches
+# (Contentful takes at most 20 files at a time), over a small pool of keep-alive connections,
+# with a bounded number of batches in flight and retries with exponential backoff.
+# Schedules whose contents haven't changed since they were last published are skipped
+#
+# every batch is one request:
+#   POST <url>/batch
+#   {"entries": [{"kind": "groups", "name": "ІСТ-1", "sha256": "...", "content": {...schedule...}},
+#                {"kind": "groups", "name": "ІСТ-9", "deleted": true}, ...]}
+# a 2xx response means the whole batch was stored. 429 and 5xx responses and connection errors are retried
+# (honouring Retry-After), other responses fail the batch. ParseSchedules.mock_cms implements the same
+# protocol locally
+#
+# python -m ParseSchedules.publish URL [-s output_json] [-t teachers_output_json] [--batch-size 20] [-c 4] [--retries 5]
+
+import argparse
+import contextlib
+import hashlib
+import http.client
+import json
+import os
+import queue
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, List, Optional
+from urllib.parse import urlsplit
+
+from ParseSchedules.bundle import GROUPS, TEACHERS, iter_schedule_files
+from ParseSchedules.parse_schedules import non_negative_int, positive_int
+from ParseSchedules.serialization import write_atomically
+
+DEFAULT_STATE_PATH = ".publish_state.json"
+DEFAULT_BATCH_SIZE = 20
+
+# responses worth another try: rate limiting and server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class PublishError(Exception):
+    pass
+
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP connections to a single host, created as needed and reused by the threads sending batches.
+
+    Args:
+        url (str): Base URL, http:// or https://.
+        timeout (float): Socket timeout in seconds.
+    """
+
+    def __init__(self, url: str, timeout: float = 30):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Not an http(s) URL: {url}")
+
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self.host = parts.hostname
+        self.port = parts.port
+        self.timeout = timeout
+        self.idle: "queue.LifoQueue" = queue.LifoQueue()
+        self.opened = 0
+
+    @contextlib.contextmanager
+    def connection(self) -> "Iterator[http.client.HTTPConnection]":
+        """
+        Lends a connection. It goes back to the pool unless the request failed, in which case it is closed.
+        """
+        try:
+            connection = self.idle.get_nowait()
+        except queue.Empty:
+            connection = self.connection_class(self.host, self.port, timeout=self.timeout)
+            self.opened += 1
+
+        try:
+            yield connection
+        except BaseException:
+            connection.close()
+            raise
+        self.idle.put(connection)
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class PublishState:
+    """
+    SHA-256 of every schedule as it was last published, per target URL, kept in a JSON file.
+
+    Args:
+        path (str): The state file.
+        url (str): The target the schedules are published to.
+    """
+
+    version = 1
+
+    def __init__(self, path: str, url: str):
+        self.path = path
+        self.url = url
+        self.targets: "dict[str, dict[str, str]]" = {}
+
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf8") as f:
+                    data = json.load(f)
+                if data.get("version") == self.version:
+                    self.targets = data.get("targets", {})
+            except (OSError, ValueError):
+                # a broken state only costs publishing everything again
+                pass
+
+        # "<kind>/<name>" -> sha256
+        self.published = self.targets.setdefault(url, {})
+
+    def save(self):
+        data = {"version": self.version, "targets": self.targets}
+        write_atomically(self.path, json.dumps(data, ensure_ascii=False, indent=4).encode("utf-8"))
+
+
+class Publisher:
+    """
+    Sends batches of entries to a CMS, see the protocol at the top of the module.
+
+    Args:
+        url (str): Base URL of the CMS. Batches are posted to <url>/batch.
+        concurrency (int): Batches in flight at once, and so the number of pooled connections.
+        retries (int): Retries of a batch after the first attempt.
+        backoff (float): Delay before the first retry in seconds, doubled on every next one.
+        timeout (float): Socket timeout in seconds.
+        token (str, optional): Sent as a bearer token.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        concurrency: int = 4,
+        retries: int = 5,
+        backoff: float = 0.5,
+        timeout: float = 30,
+        token: Optional[str] = None,
+    ):
+        self.path = urlsplit(url).path.rstrip("/") + "/batch"
+        self.pool = ConnectionPool(url, timeout)
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.headers = {"Content-Type": "application/json; charset=utf-8"}
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+
+        self.requests = 0
+        self.retried = 0
+
+    def close(self):
+        self.pool.close()
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after is not None and retry_after.strip().isdigit():
+            return float(retry_after)
+        # exponential backoff with jitter, so batches that failed together don't retry together
+        return self.backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+
+    def send_batch(self, entries: "List[dict]"):
+        """
+        Posts one batch, retrying on connection errors, 429 and 5xx.
+
+        Raises:
+            PublishError: The CMS rejected the batch, or it still failed after all retries.
+        """
+        body = json.dumps({"entries": entries}, ensure_ascii=False).encode("utf-8")
+
+        # a batch is always tried at least once, otherwise it would count as sent
+        retries = max(self.retries, 0)
+        for attempt in range(retries + 1):
+            retry_after = None
+            try:
+                with self.pool.connection() as connection:
+                    self.requests += 1
+                    connection.request("POST", self.path, body=body, headers=self.headers)
+                    response = connection.getresponse()
+                    # the connection can only be reused once the response has been read
+                    response_body = response.read()
+            except (OSError, http.client.HTTPException) as e:
+                error = f"{type(e).__name__}: {e}"
+            else:
+                if 200 <= response.status < 300:
+                    return
+                error = f"HTTP {response.status}: {response_body[:200].decode('utf-8', 'replace')}"
+                if response.status not in RETRY_STATUSES:
+                    raise PublishError(error)
+                retry_after = response.getheader("Retry-After")
+
+            if attempt == retries:
+                raise PublishError(f"{error} (after {retries} retries)")
+
+            self.retried += 1
+            time.sleep(self.delay(attempt, retry_after))
+
+    def publish(self, batches: "List[List[dict]]") -> "Iterator[tuple]":
+        """
+        Sends batches, at most concurrency at once.
+
+        Yields:
+            tuple[list[dict], Optional[PublishError]]: Each batch as it finishes, with its error if it failed.
+        """
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="publish") as executor:
+            futures = {executor.submit(self.send_batch, batch): batch for batch in batches}
+            for future in as_completed(futures):
+                yield futures[future], future.exception()
+
+
+def collect_entries(directories: "dict[str, str]") -> "dict[str, tuple]":
+    """
+    Reads the schedules to publish.
+
+    Args:
+        directories (dict[str, str]): Kind ("groups" or "teachers") -> directory with .json schedules.
+
+    Returns:
+        dict[str, tuple[str, bytes]]: "<kind>/<name>" -> (SHA-256, file contents).
+    """
+    entries = {}
+    for kind, directory in directories.items():
+        for name, data in iter_schedule_files(directory):
+            entries[f"{kind}/{name}"] = (hashlib.sha256(data).hexdigest(), data)
+    return entries
+
+
+def publish_schedules(
+    url: str,
+    directories: "dict[str, str]",
+    state_path: str = DEFAULT_STATE_PATH,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    concurrency: int = 4,
+    retries: int = 5,
+    backoff: float = 0.5,
+    force: bool = False,
+    token: Optional[str] = None,
+) -> int:
+    """
+    Publishes the schedules that changed since they were last published to url, and deletes the ones
+    that are gone. The state is saved after every batch, so an interrupted run resumes where it stopped.
+
+    Args:
+        url (str): Base URL of the CMS.
+        directories (dict[str, str]): Kind ("groups" or "teachers") -> directory with .json schedules.
+        state_path (str): Where the hashes of the published schedules are kept.
+        batch_size (int): Entries per request.
+        concurrency (int): Requests in flight at once.
+        retries (int): Retries of a failed batch.
+        backoff (float): Delay before the first retry in seconds, doubled on every next one.
+        force (bool): Publish everything, even schedules that haven't changed.
+        token (str, optional): Sent as a bearer token.
+
+    Returns:
+        int: The number of entries published or deleted.
+
+    Raises:
+        PublishError: Some batches failed. The others are published and recorded.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    state = PublishState(state_path, url)
+    entries = collect_entries(directories)
+
+    pending = []
+    for key, (sha256, data) in entries.items():
+        if force or state.published.get(key) != sha256:
+            kind, name = key.split("/", 1)
+            pending.append({"kind": kind, "name": name, "sha256": sha256, "content": json.loads(data)})
+
+    # only kinds being published can have deletions, the others are just not part of this run
+    for key in sorted(state.published.keys() - entries.keys()):
+        kind, name = key.split("/", 1)
+        if kind in directories:
+            pending.append({"kind": kind, "name": name, "deleted": True})
+
+    skipped = len(entries) - sum(1 for entry in pending if not entry.get("deleted"))
+    if not pending:
+        print(f"[INFO] Nothing to publish, {skipped} schedule(s) unchanged")
+        return 0
+
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    publisher = Publisher(url, concurrency, retries, backoff, token=token)
+
+    published = 0
+    failed = []
+    started_at = time.perf_counter()
+    try:
+        for batch, error in publisher.publish(batches):
+            if error is not None:
+                failed.append(error)
+                print(f"[ERROR] Batch of {len(batch)} starting with {batch[0]['kind']}/{batch[0]['name']} failed: {error}")
+                continue
+
+            for entry in batch:
+                key = f"{entry['kind']}/{entry['name']}"
+                if entry.get("deleted"):
+                    state.published.pop(key, None)
+                else:
+                    state.published[key] = entry["sha256"]
+            state.save()
+            published += len(batch)
+    finally:
+        publisher.close()
+
+    print(
+        f"[INFO] Published {published} of {len(pending)} entr(ies) in {len(batches)} batch(es) "
+        f"in {time.perf_counter() - started_at:.2f}s; {skipped} unchanged skipped; "
+        f"{publisher.requests} request(s), {publisher.retried} retried, {publisher.pool.opened} connection(s)"
+    )
+
+    if failed:
+        raise PublishError(f"{len(failed)} of {len(batches)} batch(es) failed")
+    return published
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("url", help="Base URL of the CMS, batches are posted to <url>/batch")
+    ap.add_argument(
+        "-s",
+        "--student_schedules",
+        default="./output_json",
+        help="Path to group schedules produced by parse_schedules",
+    )
+    ap.add_argument(
+        "-t",
+        "--teacher_schedules",
+        default="./teachers_output_json",
+        help="Path to teacher schedules produced by extract_teacher_schedules. Skipped if it doesn't exist",
+    )
+    ap.add_argument(
+        "--batch-size",
+        dest="batch_size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Schedules per upload request. Default is {DEFAULT_BATCH_SIZE}, the most Contentful takes at once",
+    )
+    ap.add_argument(
+        "-c",
+        "--concurrency",
+        type=positive_int,
+        default=4,
+        help="Upload requests in flight at once. Default is 4",
+    )
+    ap.add_argument(
+        "--retries",
+        type=non_negative_int,
+        default=5,
+        help="Retries of a failed upload, with exponential backoff. Default is 5",
+    )
+    ap.add_argument(
+        "--state",
+        default=DEFAULT_STATE_PATH,
+        help=f"Where the hashes of published schedules are kept, to skip unchanged ones. Default is {DEFAULT_STATE_PATH}",
+    )
+    ap.add_argument(
+        "-f",
+        "--force",
+        action="store_true",
+        help="Publish all schedules, not only the ones that changed since they were last published",
+    )
+    args = vars(ap.parse_args())
+    if args["batch_size"] < 1:
+        ap.error("--batch-size must be at least 1")
+
+    directories = {GROUPS: args["student_schedules"]}
+    if os.path.isdir(args["teacher_schedules"]):
+        directories[TEACHERS] = args["teacher_schedules"]
+
+    try:
+        publish_schedules(
+            args["url"],
+            directories,
+            args["state"],
+            args["batch_size"],
+            args["concurrency"],
+            args["retries"],
+            force=args["force"],
+            # kept out of the command line, where it would end up in the shell history
+            token=os.environ.get("PUBLISH_TOKEN"),
+        )
+    except PublishError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
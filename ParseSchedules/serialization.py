@@ -0,0 +1,127 @@
+import json
+import os
+import secrets
+import time
+from typing import Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional, stdlib json is used instead
+    orjson = None
+
+formats = ["pretty", "compact"]
+
+
+def _to_dict(obj):
+    # models (Lesson, DaySchedule, WeeklySchedule) know how to turn themselves into dicts
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj, output_format: str = "pretty") -> bytes:
+    """
+    Serializes an object to UTF-8 encoded JSON.
+
+    "pretty" is indented with 4 spaces, the format the schedules have always been saved in.
+    "compact" has no whitespace at all and uses orjson when it's installed.
+
+    Args:
+        obj: A dict, list or model to serialize.
+        output_format (str): "pretty" or "compact".
+
+    Returns:
+        bytes: The JSON.
+    """
+    if output_format == "compact":
+        if orjson is not None:
+            return orjson.dumps(obj, default=_to_dict)
+        return json.dumps(obj, default=_to_dict, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    if output_format == "pretty":
+        return json.dumps(obj, default=_to_dict, ensure_ascii=False, indent=4).encode("utf-8")
+
+    raise ValueError(f"Unknown output format: {output_format}")
+
+
+def file_mode(path: str) -> Optional[int]:
+    """
+    The permissions of the file at path, None if there is no file.
+    """
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        return None
+
+
+def _create_temp_file(directory: str) -> "Tuple[int, str]":
+    # like tempfile.mkstemp, but with the mode open() gives a new file (0o666 without the umask) rather than 0o600.
+    # The OS applies the umask, reading it with os.umask would change it for a moment in every thread
+    while True:
+        path = os.path.join(directory, f".{secrets.token_hex(8)}.tmp")
+        try:
+            return os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666), path
+        except FileExistsError:
+            continue
+
+
+def write_atomically(path: str, data: bytes):
+    """
+    Writes data to a temporary file next to path and renames it to path,
+    so readers see either the old file or the new one, never a half-written one.
+    The file keeps the permissions of the one it replaces, a new file gets the ones open() would give it.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = _create_temp_file(directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        mode = file_mode(path)
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+class JsonWriter:
+    """
+    Serializes and atomically writes JSON files, keeping track of the time spent serializing
+    and the number of bytes written.
+    """
+
+    def __init__(self, output_format: str = "pretty"):
+        if output_format not in formats:
+            raise ValueError(f"Unknown output format: {output_format}")
+
+        self.output_format = output_format
+        self.serialization_time = 0.0
+        self.bytes_written = 0
+        self.files_written = 0
+
+    @property
+    def backend(self) -> str:
+        return "orjson" if self.output_format == "compact" and orjson is not None else "json"
+
+    def dumps(self, obj) -> bytes:
+        started_at = time.perf_counter()
+        data = dumps(obj, self.output_format)
+        self.serialization_time += time.perf_counter() - started_at
+        return data
+
+    def write(self, path: str, obj):
+        data = self.dumps(obj)
+        write_atomically(path, data)
+        self.count_written(data)
+
+    def count_written(self, data: bytes):
+        # for data serialized with dumps and written elsewhere, e.g. by the I/O threads of the pipeline
+        self.bytes_written += len(data)
+        self.files_written += 1
+
+    def report(self) -> str:
+        return (
+            f"{self.files_written} file(s), {self.bytes_written:,} bytes written, "
+            f"serialized in {self.serialization_time:.3f}s ({self.output_format}, {self.backend})"
+        )
@@ -0,0 +1,313 @@
+# serves group and teacher schedules over HTTP from memory:
+#
+#   GET /groups            names of all groups (JSON list)
+#   GET /groups/<name>     the schedule of a group, as saved by parse_schedules
+#   GET /teachers          names of all teachers
+#   GET /teachers/<name>   the schedule of a teacher
+#
+# every response has a strong ETag, so clients revalidate with If-None-Match and get an empty 304
+# while the schedule hasn't changed. Bodies are gzipped once, when loaded, for clients that accept it.
+# Files rewritten by the parser are picked up without a restart
+#
+# python -m ParseSchedules.serve [-s output_json] [-t teachers_output_json] [--host 127.0.0.1] [-p 8000]
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import unquote, urlsplit
+
+from ParseSchedules.bundle import GROUPS, TEACHERS
+from ParseSchedules.watchers import make_watcher
+
+DEFAULT_PORT = 8000
+
+
+class CachedResponse:
+    """
+    A response body kept in memory, as is and gzipped, with the ETag of each.
+    """
+
+    __slots__ = ("body", "gzip_body", "etag", "gzip_etag")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        # mtime=0 keeps the gzipped body, and so its ETag, the same between reloads
+        self.gzip_body = gzip.compress(body, compresslevel=6, mtime=0)
+
+        digest = hashlib.sha256(body).hexdigest()
+        # the two encodings are different representations and need different strong ETags
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+
+
+class ScheduleStore:
+    """
+    Schedules of one or more directories (kind -> directory), loaded into memory.
+    refresh() reloads only the files whose modification time or size changed. Lookups don't lock:
+    a refresh builds new dicts and swaps them in, so a request sees either the old or the new schedules.
+
+    Args:
+        directories (dict[str, str]): Kind (e.g. "groups") -> directory with .json schedules.
+    """
+
+    def __init__(self, directories: "dict[str, str]"):
+        self.directories = directories
+        # kind -> name -> response
+        self.entries: "dict[str, dict[str, CachedResponse]]" = {kind: {} for kind in directories}
+        # kind -> names of the schedules, as a response
+        self.listings: "dict[str, CachedResponse]" = {kind: CachedResponse(b"[]") for kind in directories}
+        # kind -> name -> (path, mtime_ns, size) the entry was loaded from
+        self.stats: "dict[str, dict[str, tuple]]" = {kind: {} for kind in directories}
+        self._refresh_lock = threading.Lock()
+
+        for kind in directories:
+            self.refresh(kind)
+
+    def get(self, kind: str, name: Optional[str] = None) -> Optional[CachedResponse]:
+        """
+        Returns:
+            CachedResponse: The schedule, or the listing of the kind without a name. None if there is no such schedule.
+        """
+        if kind not in self.entries:
+            return None
+        if name is None:
+            return self.listings[kind]
+        return self.entries[kind].get(name)
+
+    def refresh(self, kind: str) -> int:
+        """
+        Reloads changed, new and removed schedules of a kind.
+
+        Returns:
+            int: The number of schedules reloaded or removed.
+        """
+        with self._refresh_lock:
+            stats = {}
+            for root, dirs, files in os.walk(self.directories[kind]):
+                dirs.sort()
+                for file in sorted(files):
+                    # the parser writes to hidden temporary files and renames them, those are skipped
+                    if file.endswith(".json") and not file.startswith("."):
+                        path = os.path.join(root, file)
+                        try:
+                            stat = os.stat(path)
+                        except FileNotFoundError:
+                            continue
+                        stats[os.path.splitext(file)[0]] = (path, stat.st_mtime_ns, stat.st_size)
+
+            previous = self.stats[kind]
+            entries = dict(self.entries[kind])
+            changed = 0
+
+            for name, stat in stats.items():
+                if previous.get(name) == stat and name in entries:
+                    continue
+
+                try:
+                    with open(stat[0], "rb") as f:
+                        entries[name] = CachedResponse(f.read())
+                except FileNotFoundError:
+                    # removed since it was listed, the next refresh drops it
+                    continue
+                changed += 1
+
+            for name in entries.keys() - stats.keys():
+                del entries[name]
+                changed += 1
+
+            if changed or not previous:
+                self.entries[kind] = entries
+                names = json.dumps(sorted(entries), ensure_ascii=False).encode("utf-8")
+                self.listings[kind] = CachedResponse(names)
+
+            self.stats[kind] = stats
+            return changed
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self.entries.values())
+
+
+def reload_forever(store: ScheduleStore, kind: str, interval: float, verbose: bool = False):
+    """
+    Refreshes a kind of schedules whenever its directory changes. Subdirectories
+    aren't watched, so the directory is also rescanned every interval seconds.
+    """
+    directory = store.directories[kind]
+    os.makedirs(directory, exist_ok=True)
+
+    watcher = make_watcher(directory)
+    try:
+        while True:
+            watcher.changes(interval)
+            changed = store.refresh(kind)
+            if changed and verbose:
+                print(f"[INFO] {changed} {kind} schedule(s) reloaded")
+    finally:
+        watcher.close()
+
+
+def _coding_qualities(accept_encoding: str) -> "dict[str, float]":
+    # "gzip;q=0.5, *;q=0" -> {"gzip": 0.5, "*": 0.0}. A coding without q has 1, one with a broken q is ignored
+    qualities = {}
+    for coding in accept_encoding.split(","):
+        name, *parameters = [part.strip() for part in coding.split(";")]
+        if not name:
+            continue
+
+        quality = 1.0
+        for parameter in parameters:
+            key, _, value = parameter.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.lower()] = quality
+    return qualities
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    qualities = _coding_qualities(accept_encoding)
+    # gzip by name wins over "*", in whichever order they come: "*;q=0, gzip" accepts gzip, "gzip;q=0, *" doesn't
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        # If-None-Match uses the weak comparison: W/"x" matches "x"
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+class ScheduleRequestHandler(BaseHTTPRequestHandler):
+    # keeps connections open between requests, clients polling for changes reuse them
+    protocol_version = "HTTP/1.1"
+    server_version = "ParseSchedules"
+    # headers and body are sent separately, with Nagle's algorithm the body waits for the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+
+    # set by make_server
+    store: ScheduleStore
+    verbose = False
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def respond(self, send_body: bool):
+        parts = [unquote(part) for part in urlsplit(self.path).path.split("/") if part]
+
+        response = None
+        if 1 <= len(parts) <= 2:
+            response = self.store.get(parts[0], parts[1] if len(parts) == 2 else None)
+
+        if response is None:
+            body = json.dumps({"error": f"Not found: {self.path}"}, ensure_ascii=False).encode("utf-8")
+            self.send_response(HTTPStatus.NOT_FOUND)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+            return
+
+        use_gzip = _accepts_gzip(self.headers.get("Accept-Encoding", ""))
+        body, etag = (response.gzip_body, response.gzip_etag) if use_gzip else (response.body, response.etag)
+
+        if _etag_matches(self.headers.get("If-None-Match", ""), etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        # may be cached, but has to be revalidated with the ETag before it is used
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(
+    store: ScheduleStore, host: str = "127.0.0.1", port: int = DEFAULT_PORT, verbose: bool = False
+) -> ThreadingHTTPServer:
+    """
+    Creates a server for the schedules of the store. Port 0 picks a free port, see server.server_address.
+    """
+    handler = type("Handler", (ScheduleRequestHandler,), {"store": store, "verbose": verbose})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument(
+        "-s",
+        "--student_schedules",
+        default="./output_json",
+        help="Path to group schedules produced by parse_schedules",
+    )
+    ap.add_argument(
+        "-t",
+        "--teacher_schedules",
+        default="./teachers_output_json",
+        help="Path to teacher schedules produced by extract_teacher_schedules",
+    )
+    ap.add_argument("--host", default="127.0.0.1", help="Address to listen on. Default is 127.0.0.1")
+    ap.add_argument("-p", "--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on. Default is {DEFAULT_PORT}")
+    ap.add_argument(
+        "--reload-interval",
+        dest="reload_interval",
+        type=float,
+        default=1.0,
+        help="Seconds between rescans of the schedule directories, on top of reloading on changes. Default is 1",
+    )
+    ap.add_argument("-v", "--verbose", action="store_true", help="Log every request and reload")
+    args = vars(ap.parse_args())
+
+    store = ScheduleStore({GROUPS: args["student_schedules"], TEACHERS: args["teacher_schedules"]})
+    for kind in store.directories:
+        threading.Thread(
+            target=reload_forever, args=(store, kind, args["reload_interval"], args["verbose"]), daemon=True
+        ).start()
+
+    server = make_server(store, args["host"], args["port"], args["verbose"])
+    host, port = server.server_address[:2]
+    print(f"[INFO] Serving {len(store.entries[GROUPS])} group and {len(store.entries[TEACHERS])} teacher schedule(s) on http://{host}:{port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("[INFO] Stopped serving")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# parses documents one at a time (ParseSchedules.core.iter_schedules) and hands every group schedule to a sink:
+# NDJSON on stdout for piping into another program, or group files like parse_schedules writes them.
+# Documents are paths, directories with .docx files, or "-" for one document on stdin:
+#
+# python -m ParseSchedules.stream word_schedules > schedules.ndjson
+# cat schedule.docx | python -m ParseSchedules.stream - --lessons | jq -c 'select(.room == "а.375а")'
+# python -m ParseSchedules.stream word_schedules -o output_json
+
+import argparse
+import os
+import sys
+import time
+from typing import BinaryIO, Iterable, Iterator, Optional, Tuple
+
+from ParseSchedules.core import DEFAULT_OUTPUT_DIRECTORY, find_doc_schedules, iter_schedules, save_schedule, schedule_lessons
+from ParseSchedules.models import WeeklySchedule
+from ParseSchedules.serialization import JsonWriter, dumps
+
+
+class FileSink:
+    """
+    Saves every schedule to directory/<group>.json, the files parse_schedules writes.
+
+    Args:
+        directory (str): Where the files are saved. Created if it doesn't exist.
+        writer (JsonWriter, optional): Serializes and writes the files. Pretty JSON by default.
+    """
+
+    def __init__(self, directory: str = DEFAULT_OUTPUT_DIRECTORY, writer: Optional[JsonWriter] = None):
+        self.directory = directory
+        self.writer = writer or JsonWriter()
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, group: str, schedule: WeeklySchedule):
+        save_schedule(group, schedule, self.writer, self.directory)
+
+    def close(self):
+        pass
+
+
+class NdjsonSink:
+    """
+    Writes one JSON object per line: {"group": ..., "schedule": {...}} for every schedule or, with lessons,
+    {"group": ..., "day": ..., "index": ..., "name": ...} for every lesson. Lines are flushed schedule by schedule,
+    so a reader at the other end of a pipe gets them as documents are parsed.
+
+    Args:
+        stream (BinaryIO, optional): Where the lines go. The binary stdout by default.
+        lessons (bool): One line per lesson instead of per schedule.
+    """
+
+    def __init__(self, stream: Optional[BinaryIO] = None, lessons: bool = False):
+        self.stream = stream or sys.stdout.buffer
+        self.lessons = lessons
+        self.lines_written = 0
+
+    def write(self, group: str, schedule: WeeklySchedule):
+        if self.lessons:
+            records = [{"group": group, "day": day, **lesson.to_dict()} for day, lesson in schedule_lessons(schedule)]
+        else:
+            records = [{"group": group, "schedule": schedule}]
+
+        self.stream.write(b"".join(dumps(record, "compact") + b"\n" for record in records))
+        self.stream.flush()
+        self.lines_written += len(records)
+
+    def close(self):
+        self.stream.flush()
+
+
+def drain(schedules: "Iterable[Tuple[str, WeeklySchedule]]", sink) -> int:
+    """
+    Hands every schedule to the sink, as they come.
+
+    Returns:
+        int: The number of schedules.
+    """
+    count = 0
+    try:
+        for group, schedule in schedules:
+            sink.write(group, schedule)
+            count += 1
+    finally:
+        sink.close()
+    return count
+
+
+def iter_documents_arguments(documents: "Iterable[str]") -> "Iterator":
+    # directories are expanded to their .docx files, "-" is the document on stdin
+    for document in documents:
+        if document == "-":
+            yield sys.stdin.buffer
+        elif os.path.isdir(document):
+            yield from find_doc_schedules(document)
+        else:
+            yield document
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("documents", nargs="+", help=".docx files, directories with them, or - for a document on stdin")
+    ap.add_argument(
+        "-r",
+        "--reader",
+        choices=["native", "pydocx"],
+        default="native",
+        help="How tables are read from .docx files. Default is native",
+    )
+    ap.add_argument("--lessons", action="store_true", help="One NDJSON line per lesson instead of per group schedule")
+    ap.add_argument(
+        "-o",
+        "--output",
+        help="Save group files into this directory instead of writing NDJSON to stdout",
+    )
+    ap.add_argument(
+        "--format",
+        choices=["pretty", "compact"],
+        default="pretty",
+        help="JSON format of the group files saved with -o. Default is pretty",
+    )
+    args = vars(ap.parse_args())
+    if args["output"] and args["lessons"]:
+        ap.error("--lessons is a format of the NDJSON output, it can't be combined with -o")
+
+    if args["output"]:
+        sink = FileSink(args["output"], JsonWriter(args["format"]))
+    else:
+        sink = NdjsonSink(lessons=args["lessons"])
+
+    started_at = time.perf_counter()
+    try:
+        count = drain(iter_schedules(iter_documents_arguments(args["documents"]), args["reader"]), sink)
+    except BrokenPipeError:
+        # the other end of the pipe stopped reading, e.g. head. Python would complain again when flushing stdout on exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+
+    # stdout is for the NDJSON
+    print(f"[INFO] {count} group schedule(s) streamed in {time.perf_counter() - started_at:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+# teachers are keyed by the name as written in the documents, so "Піх", "Піх І." and "Пих І." end up as
+# three teacher schedules. This stage finds such variants among all teacher names and saves an alias map
+# (variant -> canonical name) that extract_teacher_schedules applies when it builds the teacher schedules.
+#
+# comparing every name with every other one is quadratic, so only distinct surnames are compared, and only
+# within blocks that share a key: the first letters of the surname or its consonant skeleton, both after
+# folding letters that are easily mixed up (і/и/ї/й, е/є, г/ґ/х...). The similarity of a pair is cached
+#
+# python -m ParseSchedules.teacher_names [-s output_json] [-o teachers_output_json.aliases.json] [--threshold 85]
+
+import argparse
+import json
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+from itertools import combinations, product
+from typing import Iterable, List, Tuple
+
+from fuzzywuzzy import fuzz
+
+try:
+    from rapidfuzz import fuzz as rapidfuzz_fuzz
+except ImportError:  # optional, fuzzywuzzy is used instead
+    rapidfuzz_fuzz = None
+
+from ParseSchedules.extract_teacher_schedules import day_classes, iter_group_files
+from ParseSchedules.serialization import write_atomically
+from ParseSchedules.utilities import days_eng_lower, normalize_apostrophes
+
+DEFAULT_THRESHOLD = 85
+
+# shorter surnames are only merged when they are spelled the same, a letter off is too often another person
+MIN_FUZZY_LENGTH = 4
+
+PREFIX_LENGTH = 5
+SKELETON_LENGTH = 5
+
+# letters folded together for blocking: typos and spellings that are easy to mix up
+_FOLD = str.maketrans({"і": "и", "ї": "и", "й": "и", "ы": "и", "є": "е", "э": "е", "ґ": "г", "х": "г", "’": None, "ь": None})
+# latin letters typed instead of the cyrillic ones they look like, "Шепiта"
+_FOLD.update(str.maketrans("aceiopxykmthb", "асеиоргукмтнв"))
+_VOWELS = set("аеиоуюя")
+# consonants that sound alike
+_CONSONANT_CLASSES = str.maketrans({"д": "т", "з": "с", "б": "п", "ф": "в", "щ": "ш", "ж": "ш", "ц": "ч"})
+
+_INITIAL_RE = re.compile(r"([^\W\d_])\.")
+
+
+def split_name(name: str) -> "Tuple[str, str]":
+    """
+    Splits a teacher name as captured by the tokenizer, e.g. "Гнатюк О. В.", into the surname and the initials ("ОВ").
+    """
+    surname, _, rest = name.strip().partition(" ")
+    return surname, "".join(_INITIAL_RE.findall(rest))
+
+
+def join_name(surname: str, initials: str) -> str:
+    # the way the documents write them: "Гнатюк О. В."
+    return " ".join([surname] + [f"{initial}." for initial in initials])
+
+
+def fold(surname: str) -> str:
+    return normalize_apostrophes(surname).lower().translate(_FOLD)
+
+
+def skeleton(surname: str) -> str:
+    """
+    The consonants of a folded surname, alike sounding ones merged and repeated ones collapsed.
+    """
+    consonants = [letter for letter in fold(surname).translate(_CONSONANT_CLASSES) if letter not in _VOWELS]
+    return "".join(letter for i, letter in enumerate(consonants) if i == 0 or letter != consonants[i - 1])
+
+
+def blocking_keys(surname: str) -> "Tuple[str, str]":
+    """
+    The blocks a surname is compared within. A typo has to change both keys for a variant to be missed.
+    """
+    return "p:" + fold(surname)[:PREFIX_LENGTH], "s:" + skeleton(surname)[:SKELETON_LENGTH]
+
+
+def _compatible(initials: str, other: str) -> bool:
+    # "" and "О" can be "ОВ", "О" and "І" can't be the same person
+    return initials.startswith(other) or other.startswith(initials)
+
+
+class _DisjointSet:
+    def __init__(self, items: "Iterable[str]"):
+        self.parent = {item: item for item in items}
+
+    def find(self, item: str) -> str:
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        # path compression
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a: str, b: str):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            self.parent[max(a, b)] = min(a, b)
+
+
+class NameCanonicalizer:
+    """
+    Groups spellings of the same teacher's name and picks the canonical one of every group.
+
+    Two names are the same teacher when their surnames are spelled the same after folding, or are at least
+    threshold similar (both at least MIN_FUZZY_LENGTH letters long), and their initials don't contradict:
+    "Піх", "Піх І." and "Пих І." are one teacher, "Піх І." and "Піх О." are two. A name with fewer initials
+    ("Піх") only joins a name with more of them when that is the only such teacher.
+
+    The canonical name is one of the names as written, never a combination of them: of the names with the most
+    common spelling of the surname, the one with the most initials.
+
+    Args:
+        threshold (int): Similarity (0 to 100) from which two surnames are considered the same.
+        cache_size (int): Size of the cache of compared pairs.
+    """
+
+    def __init__(self, threshold: int = DEFAULT_THRESHOLD, cache_size: int = 1 << 16):
+        self.threshold = threshold
+        self._similarity = lru_cache(maxsize=cache_size)(self._ratio)
+        self.blocks = 0
+
+    @staticmethod
+    def _ratio(a: str, b: str) -> float:
+        if rapidfuzz_fuzz is not None:
+            return rapidfuzz_fuzz.ratio(a, b)
+        return fuzz.ratio(a, b)
+
+    def similarity(self, a: str, b: str) -> float:
+        # the cache is symmetric
+        return self._similarity(a, b) if a <= b else self._similarity(b, a)
+
+    def same_surname(self, a: str, b: str) -> bool:
+        if a == b:
+            return True
+        shorter, total = min(len(a), len(b)), len(a) + len(b)
+        # the ratio is at most 2 * shorter / total, as if all of the shorter one matched
+        if shorter < MIN_FUZZY_LENGTH or 200 * shorter < self.threshold * total:
+            return False
+        return self.similarity(a, b) >= self.threshold
+
+    @property
+    def stats(self) -> "dict[str, int]":
+        cache_info = self._similarity.cache_info()
+        # every miss is a similarity computed
+        return {"blocks": self.blocks, "cache_hits": cache_info.hits, "cache_misses": cache_info.misses}
+
+    def canonicalize(self, counts: "dict[str, int]") -> "dict[str, str]":
+        """
+        Args:
+            counts (dict[str, int]): Every teacher name and the number of lessons it appears in. The counts decide
+                which spelling of a surname is the canonical one.
+
+        Returns:
+            dict[str, str]: Variant -> canonical name, for the names that aren't canonical.
+        """
+        names = sorted(counts)
+        parts = {name: split_name(name) for name in names}
+
+        # names are compared through their surnames, each distinct (folded) surname once
+        by_surname: "dict[str, List[str]]" = {}
+        for name in names:
+            by_surname.setdefault(fold(parts[name][0]), []).append(name)
+
+        blocks: "dict[str, List[str]]" = {}
+        for surname in by_surname:
+            for key in blocking_keys(surname):
+                blocks.setdefault(key, []).append(surname)
+        self.blocks += len(blocks)
+
+        # a pair sharing both keys is in two blocks, the second time its similarity comes from the cache
+        similar = {(surname, surname) for surname in by_surname}
+        for block in blocks.values():
+            for pair in combinations(block, 2):
+                if self.same_surname(*pair):
+                    similar.add(pair)
+
+        # first the spellings of the same name (same initials), then names with fewer initials are attached
+        teachers = _DisjointSet(names)
+        candidates: "dict[str, set]" = {name: set() for name in names}
+        for a, b in similar:
+            for name, other in product(by_surname[a], by_surname[b]):
+                if name == other or not _compatible(parts[name][1], parts[other][1]):
+                    continue
+
+                candidates[name].add(other)
+                candidates[other].add(name)
+                if parts[name][1] == parts[other][1]:
+                    teachers.union(name, other)
+
+        # fewest initials last, so "Гнатюк" sees "Гнатюк О." already joined with "Гнатюк О. В."
+        for name in sorted(names, key=lambda name: (-len(parts[name][1]), name)):
+            initials = parts[name][1]
+            fuller = {teachers.find(other) for other in candidates[name] if len(parts[other][1]) > len(initials)}
+            if len(fuller) == 1:
+                teachers.union(name, fuller.pop())
+
+        members: "dict[str, List[str]]" = {}
+        for name in names:
+            members.setdefault(teachers.find(name), []).append(name)
+
+        aliases = {}
+        for group in members.values():
+            if len(group) == 1:
+                continue
+
+            surnames = Counter()
+            for name in group:
+                surnames[parts[name][0]] += counts[name]
+            # then the most lessons, and alphabetical for a stable choice
+            canonical = min(
+                group,
+                key=lambda name: (-surnames[parts[name][0]], -len(parts[name][1]), -counts[name], name),
+            )
+            for name in group:
+                if name != canonical:
+                    aliases[name] = canonical
+
+        return aliases
+
+
+def collect_teacher_names(path_to_student_schedules: str) -> "Counter[str]":
+    """
+    Counts the lessons of every teacher name in the group files.
+    """
+    counts = Counter()
+    for _, path in iter_group_files(path_to_student_schedules):
+        with open(path, "rb") as f:
+            schedule = json.loads(f.read())
+
+        for day in days_eng_lower:
+            for lesson in day_classes(schedule, day):
+                if lesson.get("teacher") is not None:
+                    counts.update(lesson["teacher"].split("|"))
+    return counts
+
+
+def default_alias_path(path_to_teacher_schedules: str) -> str:
+    # next to the directory, like the index of the teacher schedules
+    return os.path.normpath(path_to_teacher_schedules) + ".aliases.json"
+
+
+class TeacherAliases:
+    """
+    The alias map, kept in a JSON file. "aliases" are found by NameCanonicalizer and replaced on every run,
+    "overrides" are edited by hand and take precedence: {"Ковальчик": "Ковальчик"} keeps a name from being
+    merged, {"Шепіта": "Шепіта Н."} merges what wasn't found.
+
+    Args:
+        path (str): The file. Nothing is aliased while it doesn't exist.
+    """
+
+    version = 1
+
+    def __init__(self, path: str):
+        self.path = path
+        self.aliases: "dict[str, str]" = {}
+        self.overrides: "dict[str, str]" = {}
+
+        if not os.path.exists(path):
+            return
+
+        with open(path, "r", encoding="utf8") as f:
+            data = json.load(f)
+        if data.get("version") == self.version:
+            self.aliases = data.get("aliases", {})
+            self.overrides = data.get("overrides", {})
+
+    @property
+    def mapping(self) -> "dict[str, str]":
+        return {**self.aliases, **self.overrides}
+
+    def save(self):
+        data = {"version": self.version, "aliases": dict(sorted(self.aliases.items())), "overrides": self.overrides}
+        write_atomically(self.path, json.dumps(data, ensure_ascii=False, indent=4).encode("utf-8"))
+
+
+def update_aliases(path_to_student_schedules: str, path: str, threshold: int = DEFAULT_THRESHOLD) -> TeacherAliases:
+    """
+    Finds the variants of every teacher name in the group files and saves them into the alias map,
+    keeping the overrides.
+
+    Returns:
+        TeacherAliases: The updated map.
+    """
+    counts = collect_teacher_names(path_to_student_schedules)
+    canonicalizer = NameCanonicalizer(threshold)
+
+    aliases = TeacherAliases(path)
+    aliases.aliases = canonicalizer.canonicalize(counts)
+    aliases.save()
+
+    print(
+        f"[INFO] {len(counts)} teacher name(s), {len(aliases.aliases)} variant(s) of {len(set(aliases.aliases.values()))} teacher(s) "
+        f"aliased; {canonicalizer.stats['cache_misses']} similarities computed in {canonicalizer.stats['blocks']} block(s). Saved to {path}"
+    )
+    return aliases
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument(
+        "-s",
+        "--student_schedules",
+        default="./output_json",
+        help="Path to group schedules produced by parse_schedules",
+    )
+    ap.add_argument(
+        "-o",
+        "--output",
+        default=default_alias_path("teachers_output_json"),
+        help="Path of the alias map. Default is teachers_output_json.aliases.json, where extract_teacher_schedules looks for it",
+    )
+    ap.add_argument(
+        "--threshold",
+        type=int,
+        default=DEFAULT_THRESHOLD,
+        help=f"Similarity (0-100) from which two surnames are the same. Default is {DEFAULT_THRESHOLD}",
+    )
+    args = vars(ap.parse_args())
+
+    aliases = update_aliases(args["student_schedules"], args["output"], args["threshold"])
+    for variant, canonical in sorted(aliases.mapping.items(), key=lambda item: (item[1], item[0])):
+        if variant != canonical:
+            print(f"[INFO]   {variant} -> {canonical}")
+
+
+if __name__ == "__main__":
+    main()
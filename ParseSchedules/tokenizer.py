@@ -0,0 +1,98 @@
+import re
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from ParseSchedules.utilities import qualifications
+
+# assumption: room number is always in the beginning of class description. May end with a slash and a number
+ROOM_RE = r"\b\w\. ?\d{1,5}\w{0,5}(?:/\d)*\b"
+
+QUALIFICATION_RE = "(?:" + "|".join(qualifications) + ")"
+
+# teacher name is their qualification, followed by a space, followed by their name, first letter capitalized.
+# then, optionally, a space and single uppercase letter (for name)
+# warning: [А-Я] doesn't include some of ukrainian letters
+TEACHER_NAME_RE = r"[А-ЩЬЮЯҐЄІЇ][а-щьюяґєії]+(?: [А-ЩЬЮЯҐЄІЇ]\.)*"
+
+# a single pass over a lesson cell finds rooms, teachers (with their qualification) and standalone qualifications
+TOKEN_RE = re.compile(
+    rf"(?P<room>{ROOM_RE})"
+    rf"|(?P<qualification>{QUALIFICATION_RE})(?: (?P<teacher>{TEACHER_NAME_RE}))?"
+)
+
+_RE_WHITESPACE = re.compile(r"\s+")
+_RE_SPACE_BEFORE_PUNCTUATION = re.compile(r"\s+([,.])")
+
+
+class LessonTokens(NamedTuple):
+    room: Optional[str]
+    qualification: Optional[str]
+    teacher: Optional[str]
+    name: str
+
+
+def _join(values: "list[str]") -> Optional[str]:
+    return "|".join(values) if values else None
+
+
+def tokenize_lesson(text: str) -> LessonTokens:
+    """
+    Splits a lesson cell into rooms, teacher qualifications, teacher names and the lesson name.
+    Several rooms, qualifications or teachers are joined with a pipe.
+
+    Args:
+        text (str): Text of a lesson cell, e.g. "а.311а Системи керування контентом проф. Піх".
+
+    Returns:
+        LessonTokens: The room, qualification, teacher and the name with all of them cut out.
+    """
+    rooms = []
+    qualifications_ = []
+    teachers = []
+    name_parts = []
+
+    position = 0
+    for match in TOKEN_RE.finditer(text):
+        name_parts.append(text[position:match.start()])
+        position = match.end()
+
+        room = match.group("room")
+        if room is not None:
+            rooms.append(room)
+            continue
+
+        qualifications_.append(match.group("qualification"))
+
+        teacher = match.group("teacher")
+        if teacher is not None:
+            teachers.append(teacher)
+    name_parts.append(text[position:])
+
+    # collapse whitespace left by the cut out tokens and remove spaces before commas and dots
+    name = _RE_WHITESPACE.sub(" ", "".join(name_parts)).strip()
+    name = _RE_SPACE_BEFORE_PUNCTUATION.sub(r"\1", name)
+
+    return LessonTokens(_join(rooms), _join(qualifications_), _join(teachers), name)
+
+
+def tokenize_lessons(lessons: pd.Series) -> pd.DataFrame:
+    """
+    Tokenizes every cell of a column of lesson descriptions.
+
+    Args:
+        lessons (pandas.Series): Lesson cells. Empty cells are NaN.
+
+    Returns:
+        pandas.DataFrame: Columns room, qualification, teacher and name, with the index of lessons.
+        Values that weren't found are NaN.
+    """
+    rows = [
+        tokenize_lesson(text) if isinstance(text, str) else (np.nan, np.nan, np.nan, np.nan)
+        for text in lessons.tolist()
+    ]
+
+    tokens = pd.DataFrame(rows, index=lessons.index, columns=list(LessonTokens._fields), dtype=object)
+
+    return tokens.fillna(np.nan)
@@ -1,8 +1,16 @@
+import numbers
 import re
-from typing import List
+from functools import lru_cache
+from typing import List, Optional
 from pandas import DataFrame, Series
 from fuzzywuzzy import process
 
+try:
+    from rapidfuzz import process as rapidfuzz_process
+    from rapidfuzz.utils import default_process as rapidfuzz_default_process
+except ImportError:  # optional, fuzzywuzzy is used instead
+    rapidfuzz_process = None
+
 from ParseSchedules.models import DaySchedule
 
 
@@ -186,6 +194,128 @@ def correct_spelling(word, correct_words):
     else:
         return word
 
+# apostrophe look-alikes people type instead of the ukrainian apostrophe used in days_ukr
+_apostrophes = str.maketrans({"'": "’", "ʼ": "’", "`": "’", "´": "’", "‘": "’", "′": "’"})
+
+
+def normalize_apostrophes(word: str) -> str:
+    return word.translate(_apostrophes)
+
+
+def pair_number(index) -> Optional[int]:
+    """
+    The pair of a lesson as a number. The parser keeps the index as it was in the table: an int, a float when
+    the column had an empty pair cell (2.0), or a string ("2", or "1-2" for a lesson over two pairs).
+
+    Returns:
+        Optional[int]: The pair, or None if the index isn't a whole number.
+    """
+    if index is None or isinstance(index, bool):
+        return None
+    if isinstance(index, numbers.Integral):
+        return int(index)
+    if isinstance(index, numbers.Real):
+        return int(index) if float(index).is_integer() else None
+    if isinstance(index, str):
+        try:
+            return int(index.strip())
+        except ValueError:
+            return None
+    return None
+
+
+class SpellingCorrector:
+    """
+    Corrects misspelled words to the closest word of a known vocabulary (days, group names, teacher names...).
+
+    Words are looked up in an exact index first (after normalizing apostrophes), then fuzzy matched.
+    Fuzzy results are kept in an LRU cache, so repeated misspellings are matched once.
+    Uses rapidfuzz for fuzzy matching when it's installed, fuzzywuzzy otherwise.
+    """
+
+    def __init__(self, correct_words: "List[str]", threshold: int = 80, cache_size: int = 1024):
+        self.threshold = threshold
+        self.correct_words: "List[str]" = []
+        self.exact_index: "dict[str, str]" = {}
+        self._fuzzy_match = lru_cache(maxsize=cache_size)(self._extract_one)
+        self.add(correct_words)
+        self.reset_stats()
+
+    def add(self, correct_words: "List[str]"):
+        """
+        Extends the vocabulary. Drops cached fuzzy matches, since they may have a better match now.
+        """
+        for word in correct_words:
+            if word not in self.exact_index:
+                self.correct_words.append(word)
+            self.exact_index[word] = word
+            self.exact_index.setdefault(normalize_apostrophes(word), word)
+        self._fuzzy_match.cache_clear()
+
+    def reset_stats(self):
+        # the cached matches stay valid, only the counters start over
+        self.exact_hits = 0
+        self.fuzzy_calls = 0
+        self.fuzzy_matches = 0
+        self.corrected = 0
+
+    @property
+    def stats(self) -> "dict[str, int]":
+        return {
+            "exact_hits": self.exact_hits,
+            "fuzzy_cache_hits": self.fuzzy_calls - self.fuzzy_matches,
+            "fuzzy_cache_misses": self.fuzzy_matches,
+            "corrected": self.corrected,
+            "uncorrected": self.fuzzy_calls - self.corrected,
+        }
+
+    def take_stats(self) -> "dict[str, int]":
+        """
+        Returns the stats and resets them, e.g. to send the stats of a worker process to the main one.
+        """
+        stats = self.stats
+        self.reset_stats()
+        return stats
+
+    def merge_stats(self, stats: "dict[str, int]"):
+        """
+        Adds stats taken from another corrector (see take_stats).
+        """
+        self.exact_hits += stats["exact_hits"]
+        self.fuzzy_calls += stats["fuzzy_cache_hits"] + stats["fuzzy_cache_misses"]
+        self.fuzzy_matches += stats["fuzzy_cache_misses"]
+        self.corrected += stats["corrected"]
+
+    def _extract_one(self, word: str) -> str:
+        # only called on a cache miss
+        self.fuzzy_matches += 1
+        if rapidfuzz_process is not None:
+            closest_match = rapidfuzz_process.extractOne(word, self.correct_words, processor=rapidfuzz_default_process)
+        else:
+            closest_match = process.extractOne(word, self.correct_words)
+
+        # If the match is close enough, return it. Otherwise, return the original word.
+        if closest_match is not None and closest_match[1] > self.threshold:
+            return closest_match[0]
+        return word
+
+    def correct(self, word: str) -> str:
+        exact_match = self.exact_index.get(word)
+        if exact_match is None:
+            exact_match = self.exact_index.get(normalize_apostrophes(word))
+        if exact_match is not None:
+            self.exact_hits += 1
+            return exact_match
+
+        self.fuzzy_calls += 1
+        corrected = self._fuzzy_match(word)
+        if corrected != word:
+            self.corrected += 1
+        return corrected
+
+    __call__ = correct
+
+
 # merges classes with same signature which is (index, name, week). The group fields are combined into final merge
 def merge_classes(classes: "list[Series]"):
     """
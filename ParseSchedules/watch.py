@@ -0,0 +1,109 @@
+# watches the directory with .docx schedules and re-parses documents as they are saved,
+# then updates the teacher schedules the changed groups affect
+
+import time
+from typing import Iterator, List, Optional
+
+from ParseSchedules.cache import DEFAULT_CACHE_PATH
+from ParseSchedules.core import extract_all_schedules, find_doc_schedules
+from ParseSchedules.database import sync_database
+from ParseSchedules.extract_teacher_schedules import sync_teacher_schedules
+from ParseSchedules.serialization import JsonWriter
+from ParseSchedules.teacher_names import TeacherAliases, default_alias_path
+from ParseSchedules.watchers import make_watcher
+
+
+def is_doc_schedule(name: str) -> bool:
+    # Word keeps a "~$name.docx" lock file next to an opened document
+    return name.endswith(".docx") and not name.startswith("~$")
+
+
+def iter_changed_documents(directory: str, debounce: float = 0.2) -> "Iterator[List[str]]":
+    """
+    Yields batches of .docx files that changed. A batch is yielded once the directory
+    has been quiet for debounce seconds, since Word saves a document in several writes.
+    The first batch is empty and is yielded as soon as the directory is being watched,
+    so changes made before that can be picked up.
+    """
+    watcher = make_watcher(directory)
+    print(f"[INFO] Watching {directory} ({type(watcher).__name__})")
+    try:
+        yield []
+
+        while True:
+            names = {name for name in watcher.changes(None) if is_doc_schedule(name)}
+            if not names:
+                continue
+
+            while True:
+                more = watcher.changes(debounce)
+                if not more:
+                    break
+                names.update(name for name in more if is_doc_schedule(name))
+
+            yield sorted(names)
+    finally:
+        watcher.close()
+
+
+def watch_schedules(
+    path_to_doc_schedules: str,
+    path_to_teacher_schedules: str,
+    reader: str = "native",
+    output_format: str = "pretty",
+    path_to_student_schedules: str = "output_json",
+    path_to_database: Optional[str] = None,
+    jobs: int = 1,
+    io_concurrency: int = 0,
+):
+    """
+    Re-parses documents as they change and updates the teacher schedules of the groups they produce.
+    Unchanged documents are skipped through the rebuild cache, unchanged teachers through
+    the group index of sync_teacher_schedules. Runs until interrupted.
+    With path_to_database, the lesson database (see ParseSchedules.database) is kept up to date too.
+    Documents are parsed with jobs and io_concurrency, the same way as by extract_all_schedules.
+    The alias map of teacher names next to the teacher schedules (see ParseSchedules.teacher_names) is applied if it exists.
+    """
+    writer = JsonWriter(output_format)
+    path_to_aliases = default_alias_path(path_to_teacher_schedules)
+
+    def sync_teachers() -> int:
+        # re-read, so hand edits of the overrides are picked up without a restart
+        aliases = TeacherAliases(path_to_aliases).mapping
+        return sync_teacher_schedules(path_to_student_schedules, path_to_teacher_schedules, writer, aliases=aliases)
+
+    sync_teachers()
+    if path_to_database:
+        sync_database(path_to_student_schedules, path_to_database)
+
+    try:
+        for changed_documents in iter_changed_documents(path_to_doc_schedules):
+            started_at = time.perf_counter()
+            if changed_documents:
+                print("[INFO] Changed:", changed_documents)
+
+            try:
+                updated_groups = extract_all_schedules(
+                    find_doc_schedules(path_to_doc_schedules),
+                    reader,
+                    jobs,
+                    DEFAULT_CACHE_PATH,
+                    False,
+                    output_format,
+                    io_concurrency,
+                )
+            except Exception as e:
+                # e.g. a document that is still being written. The next save triggers another try
+                print(f"[ERROR] Failed to parse schedules: {e!r}")
+                continue
+
+            teachers_count = sync_teachers()
+            if path_to_database:
+                sync_database(path_to_student_schedules, path_to_database)
+
+            print(
+                f"[INFO] {len(updated_groups)} group(s) and {teachers_count} teacher(s) updated "
+                f"in {time.perf_counter() - started_at:.2f}s"
+            )
+    except KeyboardInterrupt:
+        print("[INFO] Stopped watching")
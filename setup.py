@@ -15,4 +15,18 @@ setup(
     description="Extracts .json representations of schedules from .docx files",
     packages=packages,
     install_requires=requirements,
+    entry_points={
+        "console_scripts": [
+            "parse-schedules=ParseSchedules.parse_schedules:main",
+            "extract-teacher-schedules=ParseSchedules.extract_teacher_schedules:main",
+            "bundle-schedules=ParseSchedules.bundle:main",
+            "schedule-database=ParseSchedules.database:main",
+            "serve-schedules=ParseSchedules.serve:main",
+            "publish-schedules=ParseSchedules.publish:main",
+            "export-lessons=ParseSchedules.export:main",
+            "check-schedules=ParseSchedules.occupancy:main",
+            "canonicalize-teachers=ParseSchedules.teacher_names:main",
+            "stream-schedules=ParseSchedules.stream:main",
+        ],
+    },
 )
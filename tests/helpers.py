@@ -0,0 +1,9 @@
+# shared helpers of the tests
+
+
+def schedule(*lessons, day="monday") -> dict:
+    """
+    Builds a group schedule, as saved to output_json/, with the given lessons on one day. Fields a lesson
+    doesn't set are None.
+    """
+    return {day: {"classes": [{"week": None, "teacher": None, "room": None, **lesson} for lesson in lessons]}}
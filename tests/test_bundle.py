@@ -0,0 +1,109 @@
+import gzip
+import json
+import os
+import struct
+import tempfile
+import unittest
+
+from ParseSchedules.bundle import GROUPS, MAGIC, TEACHERS, build_bundle, load_schedule, read_index, write_bundle, zstandard
+from tests.helpers import schedule
+
+
+def encode(data: dict) -> bytes:
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+class BundleTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "schedules.bundle")
+        self.schedules = {
+            GROUPS: {
+                "ІСТ-1": encode(schedule({"index": 1, "name": "Фізика", "teacher": "Піх"})),
+                "ІСТ-2": encode(schedule({"index": 2, "name": "Хімія", "teacher": "Сабат"}, day="friday")),
+            },
+            TEACHERS: {"Піх": encode(schedule({"index": 1, "name": "Фізика", "group": "ІСТ-1"}))},
+        }
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def test_header_and_index(self):
+        size = write_bundle(self.path, self.schedules)
+        data = self.read()
+
+        self.assertEqual(size, len(data))
+        magic, index_size = struct.unpack_from("<8sI", data)
+        self.assertEqual(magic, MAGIC)
+
+        index = read_index(data)
+        self.assertEqual(index["codec"], "gzip")
+        self.assertEqual(list(index["entries"]), ["groups/ІСТ-1", "groups/ІСТ-2", "teachers/Піх"])
+
+        # entries follow the index back to back, up to the end of the file
+        offset = struct.calcsize("<8sI") + index_size
+        for offset_and_length in index["entries"].values():
+            self.assertEqual(offset_and_length[0], offset)
+            offset += offset_and_length[1]
+        self.assertEqual(offset, len(data))
+
+    def test_every_entry_is_compressed_on_its_own(self):
+        write_bundle(self.path, self.schedules)
+        data = self.read()
+
+        for key, (offset, length) in read_index(data)["entries"].items():
+            kind, name = key.split("/")
+            self.assertEqual(gzip.decompress(data[offset:offset + length]), self.schedules[kind][name])
+
+    def test_load_schedule(self):
+        write_bundle(self.path, self.schedules)
+
+        self.assertEqual(load_schedule(self.path, "ІСТ-2"), json.loads(self.schedules[GROUPS]["ІСТ-2"]))
+        self.assertEqual(load_schedule(self.path, "Піх", TEACHERS), json.loads(self.schedules[TEACHERS]["Піх"]))
+        with self.assertRaises(KeyError):
+            load_schedule(self.path, "Піх")
+
+    def test_index_that_needs_more_digits_for_its_offsets(self):
+        schedules = {GROUPS: {f"ГР-{i}": encode(schedule({"index": 1, "name": f"Предмет {i}"})) for i in range(500)}}
+        write_bundle(self.path, schedules)
+
+        for name in ["ГР-0", "ГР-250", "ГР-499"]:
+            self.assertEqual(load_schedule(self.path, name), json.loads(schedules[GROUPS][name]))
+
+    def test_same_schedules_give_the_same_bundle(self):
+        write_bundle(self.path, self.schedules)
+        first = self.read()
+        write_bundle(self.path, self.schedules)
+
+        self.assertEqual(self.read(), first)
+
+    def test_not_a_bundle(self):
+        with open(self.path, "wb") as f:
+            f.write(b"NOTABNDL" + bytes(8))
+
+        with self.assertRaises(ValueError):
+            load_schedule(self.path, "ІСТ-1")
+
+    def test_build_bundle_from_directories(self):
+        groups = os.path.join(self.tmp.name, "output_json")
+        os.makedirs(os.path.join(groups, "1 курс"))
+        with open(os.path.join(groups, "1 курс", "ІСТ-1.json"), "wb") as f:
+            f.write(self.schedules[GROUPS]["ІСТ-1"])
+        with open(os.path.join(groups, "notes.txt"), "w") as f:
+            f.write("not a schedule")
+
+        build_bundle(self.path, groups, os.path.join(self.tmp.name, "no_teachers"))
+
+        self.assertEqual(list(read_index(self.read())["entries"]), ["groups/ІСТ-1"])
+        self.assertEqual(load_schedule(self.path, "ІСТ-1"), json.loads(self.schedules[GROUPS]["ІСТ-1"]))
+
+    @unittest.skipIf(zstandard is None, "zstandard is not installed")
+    def test_zstd(self):
+        write_bundle(self.path, self.schedules, codec="zstd")
+
+        self.assertEqual(read_index(self.read())["codec"], "zstd")
+        self.assertEqual(load_schedule(self.path, "ІСТ-1"), json.loads(self.schedules[GROUPS]["ІСТ-1"]))
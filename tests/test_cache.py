@@ -0,0 +1,92 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from ParseSchedules.benchmarks.docx_generator import generate_corpus
+from ParseSchedules.cache import ScheduleCache
+from ParseSchedules.core import extract_all_schedules
+
+
+class PruneTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.tmp.name, "output_json")
+        os.mkdir(self.output_dir)
+        self.cache_path = os.path.join(self.tmp.name, "cache.json")
+
+        # the first run: two documents sharing a group
+        cache = self.cache()
+        cache.update("first.docx", "1", "fingerprint", ["ІСТ-11", "ІСТ-12"])
+        cache.update("second.docx", "2", "fingerprint", ["ІСТ-12", "ІСТ-21"])
+        for group in ["ІСТ-11", "ІСТ-12", "ІСТ-21"]:
+            self.write_output(group)
+        cache.save()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def cache(self) -> ScheduleCache:
+        return ScheduleCache(self.cache_path, self.output_dir)
+
+    def write_output(self, group: str):
+        with open(os.path.join(self.output_dir, f"{group}.json"), "w", encoding="utf-8") as f:
+            f.write("{}")
+
+    def outputs(self):
+        return sorted(os.path.splitext(file)[0] for file in os.listdir(self.output_dir))
+
+    def test_removed_document_is_forgotten_with_its_outputs(self):
+        # the second run, after first.docx was deleted
+        cache = self.cache()
+        removed_groups = cache.prune(["second.docx"])
+        cache.save()
+
+        self.assertEqual(removed_groups, ["ІСТ-11"])
+        self.assertEqual(self.outputs(), ["ІСТ-12", "ІСТ-21"])
+        self.assertEqual(list(self.cache().entries), [ScheduleCache.key("second.docx")])
+
+    def test_document_sharing_a_group_with_a_removed_one_is_parsed_again(self):
+        cache = self.cache()
+        cache.prune(["second.docx"])
+
+        # ІСТ-12.json may be the schedule of first.docx
+        self.assertFalse(cache.is_fresh("second.docx", "2", "fingerprint"))
+        self.assertEqual(cache.groups_of("second.docx"), ["ІСТ-12", "ІСТ-21"])
+
+    def test_nothing_is_pruned_while_all_documents_are_there(self):
+        cache = self.cache()
+
+        self.assertEqual(cache.prune(["second.docx", "first.docx"]), [])
+        self.assertTrue(cache.is_fresh("first.docx", "1", "fingerprint"))
+        self.assertEqual(self.outputs(), ["ІСТ-11", "ІСТ-12", "ІСТ-21"])
+
+
+class RemovedDocumentTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        os.mkdir("output_json")
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def run_parser(self, documents):
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            return extract_all_schedules(documents, cache_path="cache.json")
+
+    def test_outputs_of_a_removed_document_are_removed_on_the_next_run(self):
+        documents = generate_corpus("word_schedules", 2, n_groups=2)
+        first_groups = self.run_parser(documents)
+        self.assertEqual(len(os.listdir("output_json")), len(first_groups))
+
+        os.remove(documents[0])
+        removed_groups = self.run_parser(documents[1:])
+
+        remaining = sorted(os.path.splitext(file)[0] for file in os.listdir("output_json"))
+        self.assertEqual(remaining, sorted(ScheduleCache("cache.json").groups_of(documents[1])))
+        self.assertEqual(sorted(removed_groups), sorted(set(first_groups) - set(remaining)))
+        self.assertTrue(removed_groups)
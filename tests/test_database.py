@@ -0,0 +1,32 @@
+import unittest
+
+from ParseSchedules.database import ScheduleDatabase
+from tests.helpers import schedule
+
+
+class MultiRoomTest(unittest.TestCase):
+    def setUp(self):
+        self.database = ScheduleDatabase(":memory:")
+        self.database.replace_group("ІСТ-1", schedule({"index": 1, "name": "Фізика", "room": "а.101|а.102", "teacher": "Піх"}))
+        self.database.replace_group("ІСТ-2", schedule({"index": 1, "name": "Хімія", "room": "а.101", "teacher": "Сабат"}))
+        self.database.replace_group("ІСТ-3", schedule({"index": 2, "name": "Хімія", "room": "а.103", "teacher": "Сабат"}))
+
+    def tearDown(self):
+        self.database.close()
+
+    def test_rooms_are_split(self):
+        self.assertEqual(self.database.rooms(), ["а.101", "а.102", "а.103"])
+        self.assertEqual([lesson["group"] for lesson in self.database.lessons(room="а.102")], ["ІСТ-1"])
+
+    def test_lesson_in_several_rooms_conflicts_in_the_shared_one(self):
+        conflicts = self.database.room_conflicts()
+        self.assertEqual([(conflict["room"], conflict["index"]) for conflict in conflicts], [("а.101", 1)])
+        self.assertEqual([lesson["group"] for lesson in conflicts[0]["lessons"]], ["ІСТ-1", "ІСТ-2"])
+
+    def test_lesson_in_several_rooms_takes_each_of_them(self):
+        self.assertEqual(self.database.free_rooms("monday", 1), ["а.103"])
+        self.assertEqual(self.database.free_rooms("monday", 2), ["а.101", "а.102"])
+
+    def test_removing_a_group_frees_its_rooms(self):
+        self.database.remove_group("ІСТ-1")
+        self.assertEqual(self.database.rooms(), ["а.101", "а.103"])
@@ -0,0 +1,83 @@
+import collections
+import io
+import unittest
+
+import pandas as pd
+
+from ParseSchedules.benchmarks.docx_generator import _cell, _paragraphs, document_xml, write_docx
+from ParseSchedules.docx_reader import read_table_native, read_table_pydocx, read_tables_native
+
+
+def pydocx_works() -> bool:
+    # PyDocX 0.9.10 takes the ABCs from collections, where they are gone since Python 3.10
+    try:
+        import pydocx  # noqa: F401
+    except ImportError:
+        return False
+    return hasattr(collections, "Hashable")
+
+
+def table(*rows: str) -> str:
+    width = max(row.count("<w:tc>") for row in rows)
+    return f'<w:tbl><w:tblGrid>{"<w:gridCol/>" * width}</w:tblGrid>{"".join(rows)}</w:tbl>'
+
+
+def row(*cells: str) -> str:
+    return "<w:tr>" + "".join(cells) + "</w:tr>"
+
+
+def docx(*tables: str) -> io.BytesIO:
+    buffer = io.BytesIO()
+    write_docx(buffer, document_xml(list(tables)))
+    buffer.seek(0)
+    return buffer
+
+
+NESTED = table(row(_cell("Фізика\nа.101"), _cell(None)), row(_cell("Піх"), _cell("Сабат")))
+
+SCHEDULE = table(
+    row(_cell("День"), _cell("Пара"), _cell("ІСТ-1"), _cell("ІСТ-2"), _cell("ІСТ-3")),
+    row(_cell("Понеділок", merge="restart"), _cell("1"), _cell("Хімія\nСабат", span=2), _cell(None)),
+    row(
+        _cell(None, merge="continue"),
+        _cell("2"),
+        "<w:tc><w:tcPr/>" + _paragraphs("Практика") + NESTED + _paragraphs("а.202") + "</w:tc>",
+        _cell("Історія", merge="restart"),
+        _cell(None),
+    ),
+    row(_cell(None, merge="continue"), _cell("3"), _cell("Фізика"), _cell(None, merge="continue"), _cell("Хімія")),
+)
+
+
+class NativeReaderTest(unittest.TestCase):
+    def read(self, reader) -> pd.DataFrame:
+        return reader(docx(SCHEDULE))
+
+    def test_merged_cells_are_repeated(self):
+        df = self.read(read_table_native)
+
+        self.assertEqual(list(df.columns), ["День", "Пара", "ІСТ-1", "ІСТ-2", "ІСТ-3"])
+        self.assertEqual(list(df["День"]), ["Понеділок"] * 3)
+        self.assertEqual(list(df.iloc[0, 2:4]), ["Хімія Сабат", "Хімія Сабат"])
+        self.assertEqual(list(df["ІСТ-2"][1:]), ["Історія", "Історія"])
+
+    def test_empty_cells_are_missing_values(self):
+        df = self.read(read_table_native)
+
+        self.assertTrue(pd.isna(df["ІСТ-3"][0]))
+        self.assertTrue(pd.isna(df["ІСТ-3"][1]))
+
+    def test_nested_table_is_glued_to_the_cell_text(self):
+        df = self.read(read_table_native)
+
+        self.assertEqual(df["ІСТ-1"][1], "ПрактикаФізика а.101ПіхСабата.202")
+
+    def test_tables_without_groups_are_left_out(self):
+        frames = read_tables_native(docx(table(row(_cell("Примітка"), _cell(None))), SCHEDULE))
+
+        self.assertEqual(len(frames), 1)
+        pd.testing.assert_frame_equal(frames[0], self.read(read_table_native))
+
+    @unittest.skipUnless(pydocx_works(), "PyDocX can't run on this Python")
+    def test_same_as_pydocx(self):
+        pd.testing.assert_frame_equal(self.read(read_table_native), self.read(read_table_pydocx))
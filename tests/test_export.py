@@ -0,0 +1,72 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import pytest
+
+pyarrow = pytest.importorskip("pyarrow")
+
+from ParseSchedules.export import biweekly_balance, export_lessons, lessons_table, load_lessons, room_utilization, teacher_hours
+from tests.helpers import schedule
+
+
+class LessonsTableTest(unittest.TestCase):
+    def test_pairs_that_arent_numbers_are_null(self):
+        table = lessons_table(
+            [
+                ("ІСТ-1", schedule({"index": 1, "name": "Фізика"}, {"index": "2", "name": "Хімія"}, {"index": 3.0, "name": "Історія"})),
+                ("ІСТ-2", schedule({"index": "1-2", "name": "Практика"}, {"index": float("nan"), "name": "Фізика"}, {"index": None, "name": "Хімія"})),
+            ]
+        )
+
+        self.assertEqual(table["pair"].to_pylist(), [1, 2, 3, None, None, None])
+        self.assertEqual(table["pair"].type, pyarrow.int8())
+
+    def test_teachers_are_split(self):
+        table = lessons_table([("ІСТ-1", schedule({"index": 1, "name": "Фізика", "teacher": "Піх|Сабат"}))])
+
+        self.assertEqual(table["teachers"].to_pylist(), [["Піх", "Сабат"]])
+        self.assertEqual(table["group"].to_pylist(), ["ІСТ-1"])
+
+
+class ExportTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.groups = os.path.join(self.tmp.name, "output_json")
+        os.mkdir(self.groups)
+        self.dataset = os.path.join(self.tmp.name, "lessons_parquet")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_group(self, group: str, schedule: dict):
+        with open(os.path.join(self.groups, f"{group}.json"), "w", encoding="utf8") as f:
+            json.dump(schedule, f, ensure_ascii=False)
+
+    def export(self, semester: str) -> int:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return export_lessons(self.groups, self.dataset, semester)
+
+    def test_group_files_with_pairs_that_arent_numbers_are_exported(self):
+        self.write_group("ІСТ-1", schedule({"index": "1-2", "name": "Практика", "room": "а.101", "teacher": "Піх"}))
+        self.write_group("ІСТ-2", schedule({"index": "3", "name": "Фізика", "room": "а.101", "teacher": "Піх", "week": 1}))
+
+        self.assertEqual(self.export("2023-2024-1"), 2)
+
+        table = load_lessons(self.dataset, "2023-2024-1")
+        self.assertEqual(sorted(table["pair"].to_pylist(), key=str), [3, None])
+        self.assertEqual(teacher_hours(table).to_pylist(), [{"teacher": "Піх", "pairs": 1.5, "hours": 3.0}])
+        self.assertEqual(room_utilization(table)["room"].to_pylist(), ["а.101"])
+        self.assertEqual(biweekly_balance(table).to_pylist()[0], {"group": "ІСТ-2", "week_1": 1, "week_2": 0, "difference": 1})
+
+    def test_exporting_a_semester_keeps_the_others(self):
+        self.write_group("ІСТ-1", schedule({"index": 1, "name": "Фізика"}))
+        self.export("2023-2024-1")
+        self.write_group("ІСТ-2", schedule({"index": 1, "name": "Фізика"}))
+        self.export("2023-2024-2")
+
+        self.assertEqual(len(load_lessons(self.dataset, "2023-2024-1")), 1)
+        self.assertEqual(len(load_lessons(self.dataset, "2023-2024-2")), 2)
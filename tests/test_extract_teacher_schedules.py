@@ -0,0 +1,66 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from ParseSchedules.extract_teacher_schedules import build_teacher_schedules, sync_teacher_schedules
+from tests.helpers import schedule
+
+
+class SyncTeacherSchedulesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.groups = os.path.join(self.tmp.name, "output_json")
+        self.teachers = os.path.join(self.tmp.name, "teachers_output_json")
+        os.mkdir(self.groups)
+        for group in range(1, 7):
+            self.write_group(f"ІСТ-{group}", f"Викладач {group}")
+        self.sync()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_group(self, group: str, teacher: str, name: str = "Фізика"):
+        with open(os.path.join(self.groups, group + ".json"), "w", encoding="utf8") as f:
+            json.dump(schedule({"index": 1, "name": name, "teacher": teacher}), f, ensure_ascii=False)
+
+    def sync(self) -> str:
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.rewritten = sync_teacher_schedules(self.groups, self.teachers)
+        return output.getvalue()
+
+    def assert_same_as_full_build(self):
+        full = os.path.join(self.tmp.name, "full")
+        build_teacher_schedules(self.groups, full)
+        self.assertEqual(sorted(os.listdir(self.teachers)), sorted(os.listdir(full)))
+        for file in os.listdir(full):
+            with open(os.path.join(self.teachers, file), "rb") as a, open(os.path.join(full, file), "rb") as b:
+                self.assertEqual(a.read(), b.read(), file)
+
+    def test_few_changes_rewrite_only_the_touched_teachers(self):
+        self.write_group("ІСТ-1", "Викладач 1", name="Хімія")
+
+        output = self.sync()
+
+        self.assertEqual(self.rewritten, 1)
+        self.assertNotIn("rebuilding", output)
+        self.assert_same_as_full_build()
+
+    def test_many_changes_rebuild_everything(self):
+        for group in range(1, 5):
+            self.write_group(f"ІСТ-{group}", "Викладач 7")
+
+        output = self.sync()
+
+        self.assertIn("rebuilding all of them", output)
+        self.assertIn("Викладач 1: no classes left, removed", output)
+        self.assertEqual(self.rewritten, 3)
+        self.assert_same_as_full_build()
+
+        # the index describes the new files, so nothing is left to do
+        output = self.sync()
+        self.assertEqual(self.rewritten, 0)
+        self.assertIn("0 changed and 0 removed of 6 group(s)", output)
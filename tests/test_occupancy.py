@@ -0,0 +1,50 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from ParseSchedules.occupancy import ROOMS, OccupancyIndex, check_conflicts
+from tests.helpers import schedule
+
+
+class OccupancyIndexTest(unittest.TestCase):
+    def test_lesson_in_several_rooms_takes_each_of_them(self):
+        index = OccupancyIndex(
+            [
+                ("ІСТ-1", schedule({"index": 1, "name": "Фізика", "room": "а.101|а.102", "teacher": "Піх"})),
+                ("ІСТ-2", schedule({"index": 1, "name": "Хімія", "room": "а.101", "teacher": "Сабат"})),
+            ]
+        )
+
+        conflicts = index.conflicts(ROOMS)
+        self.assertEqual([(conflict["name"], conflict["index"]) for conflict in conflicts], [("а.101", 1)])
+        self.assertEqual([lesson["group"] for lesson in conflicts[0]["lessons"]], ["ІСТ-1", "ІСТ-2"])
+        self.assertEqual(index.free_rooms("monday", 1), [])
+        self.assertEqual(index.free_rooms("monday", 2), ["а.101", "а.102"])
+
+    def test_lessons_with_a_pair_that_isnt_a_number_are_skipped(self):
+        index = OccupancyIndex(
+            [
+                ("ІСТ-1", schedule({"index": "1-2", "name": "Практика", "room": "а.101"}, {"index": "3", "name": "Фізика", "room": "а.101"})),
+                ("ІСТ-2", schedule({"index": 3, "name": "Хімія", "room": "а.102"})),
+            ]
+        )
+
+        self.assertEqual([lesson["index"] for lesson in index.skipped], ["1-2"])
+        self.assertEqual(len(index.lessons), 2)
+        self.assertEqual(index.conflicts(), [])
+        self.assertEqual(index.free_rooms("monday", 3), [])
+
+    def test_check_conflicts_reports_skipped_lessons(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "ІСТ-1.json"), "w", encoding="utf8") as f:
+                json.dump(schedule({"index": "1-2", "name": "Практика", "room": "а.101"}), f)
+
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                conflicts = check_conflicts(tmp)
+
+        self.assertEqual(conflicts, [])
+        self.assertIn("[WARNING] Skipped ІСТ-1, monday pair '1-2'", output.getvalue())
@@ -0,0 +1,22 @@
+import contextlib
+import io
+import unittest
+
+from ParseSchedules.parse_schedules import build_argument_parser
+
+
+class JobsArgumentTest(unittest.TestCase):
+    def parse_jobs(self, value: str) -> int:
+        return vars(build_argument_parser().parse_args(["--jobs", value]))["jobs"]
+
+    def test_zero_and_positive_jobs_are_accepted(self):
+        self.assertEqual(self.parse_jobs("0"), 0)
+        self.assertEqual(self.parse_jobs("4"), 4)
+
+    def test_negative_jobs_are_a_usage_error(self):
+        errors = io.StringIO()
+        with contextlib.redirect_stderr(errors), self.assertRaises(SystemExit) as exit:
+            self.parse_jobs("-1")
+
+        self.assertEqual(exit.exception.code, 2)
+        self.assertIn("--jobs: must be 0 or more", errors.getvalue())
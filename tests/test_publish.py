@@ -0,0 +1,167 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from ParseSchedules.bundle import GROUPS
+from ParseSchedules.mock_cms import MockCMS, make_mock_server
+from ParseSchedules.publish import PublishError, Publisher, main, publish_schedules
+
+
+class MockCMSTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.groups = os.path.join(self.tmp.name, "output_json")
+        os.mkdir(self.groups)
+        self.state_path = os.path.join(self.tmp.name, "state.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @contextlib.contextmanager
+    def serve(self, cms: MockCMS):
+        server = make_mock_server(cms, port=0)
+        thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+        thread.start()
+        try:
+            host, port = server.server_address[:2]
+            yield f"http://{host}:{port}"
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def write_groups(self, *names: str, day: str = "monday"):
+        for name in names:
+            with open(os.path.join(self.groups, f"{name}.json"), "w", encoding="utf8") as f:
+                json.dump({day: {"classes": []}}, f)
+
+    def publish(self, url: str, **kwargs) -> int:
+        kwargs.setdefault("backoff", 0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return publish_schedules(url, {GROUPS: self.groups}, self.state_path, **kwargs)
+
+    def published_state(self) -> "dict[str, str]":
+        with open(self.state_path, encoding="utf8") as f:
+            return next(iter(json.load(f)["targets"].values()))
+
+
+class PublishSchedulesTest(MockCMSTestCase):
+    def test_entries_are_sent_in_batches(self):
+        self.write_groups(*(f"ІСТ-{i}" for i in range(45)))
+        cms = MockCMS(max_batch=20)
+        with self.serve(cms) as url:
+            self.assertEqual(self.publish(url, batch_size=20), 45)
+
+        self.assertEqual(cms.stats["batches"], 3)
+        self.assertEqual(len(cms.entries), 45)
+        self.assertEqual(len(self.published_state()), 45)
+
+    def test_unchanged_schedules_are_skipped(self):
+        self.write_groups("ІСТ-1", "ІСТ-2")
+        cms = MockCMS()
+        with self.serve(cms) as url:
+            self.publish(url)
+            self.assertEqual(self.publish(url), 0)
+
+            self.write_groups("ІСТ-2", day="tuesday")
+            self.assertEqual(self.publish(url), 1)
+
+        self.assertEqual(cms.stats["requests"], 2)
+        self.assertIn("tuesday", cms.entries["groups/ІСТ-2"]["content"])
+
+    def test_removed_schedules_are_deleted(self):
+        self.write_groups("ІСТ-1", "ІСТ-2")
+        cms = MockCMS()
+        with self.serve(cms) as url:
+            self.publish(url)
+            os.remove(os.path.join(self.groups, "ІСТ-1.json"))
+            self.publish(url)
+
+        self.assertEqual(list(cms.entries), ["groups/ІСТ-2"])
+        self.assertEqual(list(self.published_state()), ["groups/ІСТ-2"])
+
+    def test_failed_batches_are_retried(self):
+        self.write_groups(*(f"ІСТ-{i}" for i in range(10)))
+        cms = MockCMS(fail_rate=0.5, seed=1)
+        with self.serve(cms) as url:
+            self.assertEqual(self.publish(url, batch_size=2, retries=20), 10)
+
+        self.assertGreater(cms.stats["failures"], 0)
+        self.assertEqual(cms.stats["requests"], cms.stats["batches"] + cms.stats["failures"])
+        self.assertEqual(len(cms.entries), 10)
+
+    def test_batch_failing_every_retry_is_not_recorded(self):
+        self.write_groups("ІСТ-1")
+        cms = MockCMS(fail_rate=1.0)
+        with self.serve(cms) as url, self.assertRaises(PublishError):
+            self.publish(url, retries=2)
+
+        self.assertEqual(cms.stats["requests"], 3)
+        self.assertFalse(os.path.exists(self.state_path))
+
+    def test_rejected_batch_is_not_retried(self):
+        self.write_groups("ІСТ-1", "ІСТ-2")
+        cms = MockCMS(max_batch=1)
+        with self.serve(cms) as url, self.assertRaises(PublishError):
+            self.publish(url, batch_size=2, retries=5)
+
+        self.assertEqual(cms.stats["requests"], 1)
+        self.assertFalse(os.path.exists(self.state_path))
+
+
+class PublisherTest(MockCMSTestCase):
+    def test_negative_retries_still_send_the_batch_once(self):
+        cms = MockCMS()
+        with self.serve(cms) as url:
+            publisher = Publisher(url, retries=-1, backoff=0)
+            try:
+                publisher.send_batch([{"kind": GROUPS, "name": "A", "sha256": "0", "content": {}}])
+            finally:
+                publisher.close()
+
+        self.assertEqual(list(cms.entries), ["groups/A"])
+
+    def test_negative_retries_still_fail_a_failed_batch(self):
+        cms = MockCMS(fail_rate=1.0)
+        with self.serve(cms) as url:
+            publisher = Publisher(url, retries=-1, backoff=0)
+            try:
+                with self.assertRaises(PublishError):
+                    publisher.send_batch([{"kind": GROUPS, "name": "A", "sha256": "0", "content": {}}])
+            finally:
+                publisher.close()
+
+        self.assertEqual(cms.stats["requests"], 1)
+
+    def test_backoff_doubles_and_honours_retry_after(self):
+        publisher = Publisher("http://127.0.0.1:9", backoff=1)
+        with mock.patch("random.uniform", return_value=1.0):
+            self.assertEqual([publisher.delay(attempt) for attempt in range(3)], [1, 2, 4])
+        self.assertEqual(publisher.delay(3, "7"), 7)
+
+
+class MainTest(MockCMSTestCase):
+    def run_main(self, *argv: str) -> str:
+        output = io.StringIO()
+        with mock.patch.object(sys, "argv", ["publish", *argv]), contextlib.redirect_stdout(output):
+            main()
+        return output.getvalue()
+
+    def test_failed_publish_exits_with_1(self):
+        self.write_groups("ІСТ-1")
+        cms = MockCMS(fail_rate=1.0)
+        with self.serve(cms) as url, self.assertRaises(SystemExit) as exit:
+            self.run_main(url, "-s", self.groups, "--state", self.state_path, "--retries", "0")
+
+        self.assertEqual(exit.exception.code, 1)
+
+    def test_negative_retries_are_a_usage_error(self):
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as exit:
+            self.run_main("http://127.0.0.1:9", "--retries", "-1")
+
+        self.assertEqual(exit.exception.code, 2)
@@ -0,0 +1,57 @@
+import os
+import stat
+import tempfile
+import unittest
+from unittest import mock
+
+from ParseSchedules.serialization import JsonWriter, write_atomically
+
+
+def mode_of(path: str) -> int:
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+@unittest.skipIf(os.name == "nt", "POSIX permissions")
+class WriteAtomicallyTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "ІСТ-1.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_new_file_gets_the_mode_open_gives(self):
+        write_atomically(self.path, b"{}")
+
+        # not the 0o600 of mkstemp
+        reference = os.path.join(self.tmp.name, "reference")
+        with open(reference, "wb"):
+            pass
+        self.assertEqual(mode_of(self.path), mode_of(reference))
+
+    def test_new_file_follows_the_current_umask(self):
+        umask = os.umask(0o027)
+        try:
+            # the umask is left to the OS, changing it in a writer thread would race with the others
+            with mock.patch.object(os, "umask", side_effect=AssertionError("os.umask called")):
+                write_atomically(self.path, b"{}")
+        finally:
+            os.umask(umask)
+
+        self.assertEqual(mode_of(self.path), 0o640)
+        self.assertEqual(os.listdir(self.tmp.name), ["ІСТ-1.json"])
+
+    def test_replaced_file_keeps_its_mode(self):
+        with open(self.path, "wb") as f:
+            f.write(b"old")
+        os.chmod(self.path, 0o640)
+
+        JsonWriter().write(self.path, {"monday": []})
+
+        self.assertEqual(mode_of(self.path), 0o640)
+        with open(self.path, "rb") as f:
+            self.assertIn(b"monday", f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import contextlib
+import gzip
+import http.client
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from ParseSchedules.bundle import GROUPS
+from ParseSchedules.serve import ScheduleStore, _accepts_gzip, make_server, reload_forever
+
+
+class AcceptsGzipTest(unittest.TestCase):
+    def test_accept_encoding_values(self):
+        cases = {
+            "": False,
+            "gzip": True,
+            "deflate, gzip;q=0.5": True,
+            "gzip;q=0": False,
+            "gzip; q=0.000": False,
+            "*": True,
+            "*;q=0": False,
+            "*;q=0, gzip": True,
+            "gzip;q=0, *": False,
+            "identity, *;q=0.1": True,
+            "GZIP;Q=1.0": True,
+            "gzip;q=oops": False,
+        }
+        for accept_encoding, expected in cases.items():
+            with self.subTest(accept_encoding=accept_encoding):
+                self.assertEqual(_accepts_gzip(accept_encoding), expected)
+
+
+class ServerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.groups = os.path.join(self.tmp.name, "output_json")
+        os.mkdir(self.groups)
+        self.write_group("ІСТ-1", {"monday": []})
+        self.store = ScheduleStore({GROUPS: self.groups})
+
+        self.server = make_server(self.store, port=0)
+        threading.Thread(target=self.server.serve_forever, args=(0.01,), daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def write_group(self, group: str, schedule: dict):
+        with open(os.path.join(self.groups, f"{group}.json"), "w", encoding="utf8") as f:
+            json.dump(schedule, f)
+
+    def get(self, path: str, **headers) -> "tuple[http.client.HTTPResponse, bytes]":
+        host, port = self.server.server_address[:2]
+        connection = http.client.HTTPConnection(host, port, timeout=5)
+        with contextlib.closing(connection):
+            connection.request("GET", path, headers={name.replace("_", "-"): value for name, value in headers.items()})
+            response = connection.getresponse()
+            return response, response.read()
+
+    def test_schedule_and_listing(self):
+        response, body = self.get("/groups/%D0%86%D0%A1%D0%A2-1")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(json.loads(body), {"monday": []})
+
+        response, body = self.get("/groups")
+        self.assertEqual(json.loads(body), ["ІСТ-1"])
+
+        response, _ = self.get("/groups/missing")
+        self.assertEqual(response.status, 404)
+
+    def test_unchanged_schedule_is_not_modified(self):
+        response, _ = self.get("/groups")
+        etag = response.getheader("ETag")
+
+        response, body = self.get("/groups", If_None_Match=etag)
+        self.assertEqual(response.status, 304)
+        self.assertEqual(body, b"")
+
+        response, _ = self.get("/groups", If_None_Match=f'W/{etag}, "other"')
+        self.assertEqual(response.status, 304)
+
+        response, _ = self.get("/groups", If_None_Match='"other"')
+        self.assertEqual(response.status, 200)
+
+    def test_gzip_is_negotiated(self):
+        response, body = self.get("/groups", Accept_Encoding="gzip")
+        self.assertEqual(response.getheader("Content-Encoding"), "gzip")
+        self.assertEqual(json.loads(gzip.decompress(body)), ["ІСТ-1"])
+        gzip_etag = response.getheader("ETag")
+
+        response, body = self.get("/groups", Accept_Encoding="*;q=0, identity")
+        self.assertIsNone(response.getheader("Content-Encoding"))
+        self.assertEqual(json.loads(body), ["ІСТ-1"])
+        self.assertNotEqual(response.getheader("ETag"), gzip_etag)
+
+        # the gzipped representation's ETag doesn't revalidate the plain one
+        response, _ = self.get("/groups", If_None_Match=gzip_etag)
+        self.assertEqual(response.status, 200)
+
+    def test_changed_files_are_reloaded(self):
+        response, _ = self.get("/groups")
+        etag = response.getheader("ETag")
+
+        self.write_group("ІСТ-2", {"monday": []})
+        self.write_group("ІСТ-1", {"tuesday": []})
+        self.assertEqual(self.store.refresh(GROUPS), 2)
+        self.assertEqual(self.store.refresh(GROUPS), 0)
+
+        response, body = self.get("/groups", If_None_Match=etag)
+        self.assertEqual(response.status, 200)
+        self.assertEqual(json.loads(body), ["ІСТ-1", "ІСТ-2"])
+        self.assertEqual(json.loads(self.get("/groups/%D0%86%D0%A1%D0%A2-1")[1]), {"tuesday": []})
+
+        os.remove(os.path.join(self.groups, "ІСТ-2.json"))
+        self.assertEqual(self.store.refresh(GROUPS), 1)
+        self.assertEqual(self.get("/groups/%D0%86%D0%A1%D0%A2-2")[0].status, 404)
+
+    def test_reload_thread_picks_up_new_files(self):
+        threading.Thread(target=reload_forever, args=(self.store, GROUPS, 0.05), daemon=True).start()
+        self.write_group("ІСТ-3", {"monday": []})
+
+        deadline = time.monotonic() + 5
+        while self.store.get(GROUPS, "ІСТ-3") is None and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertIsNotNone(self.store.get(GROUPS, "ІСТ-3"))
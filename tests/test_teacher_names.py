@@ -0,0 +1,89 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from ParseSchedules.teacher_names import NameCanonicalizer, TeacherAliases, blocking_keys, skeleton, split_name, update_aliases
+from tests.helpers import schedule
+
+
+class BlockingTest(unittest.TestCase):
+    def test_split_name(self):
+        self.assertEqual(split_name("Гнатюк О. В."), ("Гнатюк", "ОВ"))
+        self.assertEqual(split_name("Піх"), ("Піх", ""))
+
+    def test_variants_share_a_block(self):
+        for a, b in [("Шепіта", "Шепiта"), ("Шепіта", "Шипіта"), ("Ґудзь", "Гудзь"), ("Бабич", "Папич")]:
+            with self.subTest(a=a, b=b):
+                self.assertTrue(set(blocking_keys(a)) & set(blocking_keys(b)))
+
+    def test_skeleton_merges_alike_consonants(self):
+        self.assertEqual(skeleton("Дзюба"), skeleton("Тсюпа"))
+        self.assertEqual(skeleton("Касс"), "кс")
+
+    def test_different_surnames_are_in_different_blocks(self):
+        self.assertFalse(set(blocking_keys("Шепіта")) & set(blocking_keys("Ковальчук")))
+
+
+class CanonicalizeTest(unittest.TestCase):
+    def canonicalize(self, counts: "dict[str, int]") -> "dict[str, str]":
+        aliases = NameCanonicalizer().canonicalize(counts)
+        # the canonical names are names from the data, not combinations of them
+        self.assertLessEqual(set(aliases.values()), set(counts))
+        return aliases
+
+    def test_variants_of_one_teacher_are_merged(self):
+        aliases = self.canonicalize({"Піх І. В.": 10, "Піх І.": 3, "Піх": 2, "Пих І. В.": 1})
+
+        self.assertEqual(aliases, {"Піх І.": "Піх І. В.", "Піх": "Піх І. В.", "Пих І. В.": "Піх І. В."})
+
+    def test_contradicting_initials_are_two_teachers(self):
+        self.assertEqual(self.canonicalize({"Піх І.": 5, "Піх О.": 5}), {})
+
+    def test_surname_alone_is_not_merged_with_one_of_several_teachers(self):
+        aliases = self.canonicalize({"Піх І.": 5, "Піх О.": 5, "Піх": 1})
+
+        self.assertEqual(aliases, {})
+
+    def test_short_surnames_are_only_merged_when_spelled_the_same(self):
+        self.assertEqual(self.canonicalize({"Кох А.": 5, "Кух А.": 1}), {})
+        self.assertEqual(self.canonicalize({"Кох А.": 5, "Кох": 1}), {"Кох": "Кох А."})
+
+    def test_canonical_name_is_written_in_the_data(self):
+        # the common spelling has fewer initials than the typo, "Шепіта Н. О." is nowhere in the documents
+        aliases = self.canonicalize({"Шепіта Н.": 20, "Шепiта Н. О.": 1})
+
+        self.assertEqual(aliases, {"Шепiта Н. О.": "Шепіта Н."})
+
+    def test_similarities_are_cached(self):
+        canonicalizer = NameCanonicalizer()
+        counts = {"Ковальчук А.": 5, "Ковальчюк А.": 1, "Ковальчук Б.": 5}
+        canonicalizer.canonicalize(counts)
+        misses = canonicalizer.stats["cache_misses"]
+        canonicalizer.canonicalize(counts)
+
+        self.assertEqual(canonicalizer.stats["cache_misses"], misses)
+
+
+class TeacherAliasesTest(unittest.TestCase):
+    def test_overrides_take_precedence_and_are_kept(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            groups = os.path.join(tmp, "output_json")
+            os.mkdir(groups)
+            with open(os.path.join(groups, "ІСТ-1.json"), "w", encoding="utf8") as f:
+                lessons = [{"index": i, "name": "Фізика", "teacher": teacher} for i, teacher in enumerate(["Піх І.", "Піх І.", "Піх", "Шепіта"], 1)]
+                json.dump(schedule(*lessons), f, ensure_ascii=False)
+
+            path = os.path.join(tmp, "aliases.json")
+            aliases = TeacherAliases(path)
+            aliases.overrides = {"Піх": "Піх", "Шепіта": "Шепіта Н."}
+            aliases.save()
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                update_aliases(groups, path)
+
+            aliases = TeacherAliases(path)
+            self.assertEqual(aliases.aliases, {"Піх": "Піх І."})
+            self.assertEqual(aliases.mapping, {"Піх": "Піх", "Шепіта": "Шепіта Н."})
@@ -0,0 +1,38 @@
+import unittest
+
+from ParseSchedules.utilities import SpellingCorrector, days_ukr
+
+
+class SpellingCorrectorStatsTest(unittest.TestCase):
+    def setUp(self):
+        self.corrector = SpellingCorrector(days_ukr)
+
+    def correct(self, *words: str):
+        for word in words:
+            self.corrector(word)
+
+    def test_reset_starts_the_counters_over(self):
+        self.correct(days_ukr[0], days_ukr[0][:-1] + "x")
+        self.corrector.reset_stats()
+        self.correct(days_ukr[0][:-1] + "x")
+
+        # the fuzzy match is still cached
+        self.assertEqual(
+            self.corrector.stats,
+            {"exact_hits": 0, "fuzzy_cache_hits": 1, "fuzzy_cache_misses": 0, "corrected": 1, "uncorrected": 0},
+        )
+
+    def test_stats_taken_from_workers_add_up(self):
+        worker = SpellingCorrector(days_ukr)
+        worker.correct(days_ukr[1])
+        worker.correct(days_ukr[1][:-1] + "x")
+        taken = worker.take_stats()
+
+        self.correct(days_ukr[0])
+        self.corrector.merge_stats(taken)
+
+        self.assertEqual(worker.stats["exact_hits"], 0)
+        self.assertEqual(
+            self.corrector.stats,
+            {"exact_hits": 2, "fuzzy_cache_hits": 0, "fuzzy_cache_misses": 1, "corrected": 1, "uncorrected": 0},
+        )
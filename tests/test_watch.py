@@ -0,0 +1,30 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from ParseSchedules import core, parse_schedules, watch
+
+
+class WatchSchedulesTest(unittest.TestCase):
+    def test_documents_are_parsed_with_jobs_and_io_concurrency(self):
+        with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()), mock.patch.object(
+            watch, "iter_changed_documents", return_value=iter([["ІСТ.docx"]])
+        ), mock.patch.object(watch, "extract_all_schedules", return_value=[]) as extract_all_schedules, mock.patch.object(
+            watch, "sync_teacher_schedules", return_value=0
+        ):
+            watch.watch_schedules(tmp, os.path.join(tmp, "teachers_output_json"), jobs=3, io_concurrency=2)
+
+        _, reader, jobs, _, _, _, io_concurrency = extract_all_schedules.call_args.args
+        self.assertEqual((reader, jobs, io_concurrency), ("native", 3, 2))
+
+    def test_main_passes_jobs_and_io_concurrency_to_watch(self):
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(core, "extract_all_schedules"), mock.patch.object(
+            watch, "watch_schedules"
+        ) as watch_schedules:
+            parse_schedules.main(["-w", tmp, "--watch", "--jobs", "3", "--io-concurrency", "2"])
+
+        self.assertEqual(watch_schedules.call_args.kwargs["jobs"], 3)
+        self.assertEqual(watch_schedules.call_args.kwargs["io_concurrency"], 2)